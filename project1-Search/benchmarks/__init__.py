@@ -0,0 +1,58 @@
+# benchmarks/__init__.py
+# ----------------------
+# Helpers shared by the search benchmarks.  Run the benchmarks from the
+# project1-Search directory so the project modules and layouts are found, e.g.
+#
+# > python -m benchmarks.searchEngine
+
+import time
+import tracemalloc
+
+import layout
+import pacman
+
+
+def loadGameState(layoutName):
+    """
+    Returns the starting GameState (with no ghosts) for a shipped layout name.
+    """
+    lay = layout.getLayout(layoutName)
+    if lay == None:
+        raise Exception("The layout " + layoutName + " cannot be found")
+    state = pacman.GameState()
+    state.initialize(lay, 0)
+    return state
+
+
+def timeCall(function, *args):
+    """
+    Calls function(*args) and returns (result, elapsed seconds).
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def peakMemory(function, *args):
+    """
+    Calls function(*args) under tracemalloc and returns (result, peak bytes).
+    """
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def printTable(header, rows):
+    """
+    Prints rows (lists of values) as left aligned columns under header.
+    """
+    rows = [[str(value) for value in row] for row in rows]
+    widths = [max(len(str(h)), *[len(row[i]) for row in rows]) if rows else len(str(h))
+              for i, h in enumerate(header)]
+    print('  '.join(str(h).ljust(w) for h, w in zip(header, widths)))
+    for row in rows:
+        print('  '.join(value.ljust(w) for value, w in zip(row, widths)))
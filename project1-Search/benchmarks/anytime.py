@@ -0,0 +1,95 @@
+# benchmarks/anytime.py
+# ---------------------
+# Shows how anytimeAStar improves its path over time: for every round it
+# prints when the round ended, the path cost and the suboptimality bound,
+# next to the cost and time of a plain aStarSearch.
+#
+# First it checks that tiny budgets, down to zero, still give a path that
+# reaches the goal on every problem, with its heuristic and with none.
+#
+# > python -m benchmarks.anytime
+# > python -m benchmarks.anytime --weight 5 --budget 1
+
+import sys
+import time
+from optparse import OptionParser
+
+import search
+import searchAgents
+from benchmarks import loadGameState, timeCall, printTable
+
+# (layout, problem class, heuristic)
+PROBLEMS = [
+    ('bigMaze', lambda state: searchAgents.PositionSearchProblem(state, warn=False, visualize=False),
+     searchAgents.manhattanHeuristic),
+    ('mediumCorners', searchAgents.CornersProblem, searchAgents.cornersHeuristic),
+    ('trickySearch', searchAgents.FoodSearchProblem, searchAgents.foodHeuristic),
+]
+
+# budgets too small for a first round to finish
+TINY_BUDGETS = [0, 1e-4]
+
+
+def reachesGoal(problem, actions):
+    """
+    Returns whether following actions from the start state stays on legal
+    moves and ends in a goal state.
+    """
+    state = problem.getStartState()
+    for action in actions:
+        successors = dict((successorAction, successorState)
+                          for successorState, successorAction, cost in problem.getSuccessors(state))
+        if action not in successors:
+            return False
+        state = successors[action]
+    return problem.isGoalState(state)
+
+
+def checkTinyBudgets(weight, weightStep):
+    """
+    Raises an Exception if anytimeAStar with a tiny budget does not return a
+    path to the goal.
+    """
+    problems = PROBLEMS + [('mediumMaze', PROBLEMS[0][1], PROBLEMS[0][2])]
+    for layoutName, problemClass, heuristic in problems:
+        gameState = loadGameState(layoutName)
+        for budget in TINY_BUDGETS:
+            for checkedHeuristic in (heuristic, search.nullHeuristic):
+                problem = problemClass(gameState)
+                actions = search.anytimeAStar(problem, checkedHeuristic, budget, weight, weightStep)
+                if not actions or not reachesGoal(problemClass(gameState), actions):
+                    raise Exception('anytimeAStar with %s and a budget of %s seconds returned no path on %s' %
+                                    (checkedHeuristic.__name__, budget, layoutName))
+    print('Budgets of %s seconds return a path to the goal on every problem' %
+          ' and '.join(str(budget) for budget in TINY_BUDGETS))
+
+
+def runBenchmark(budget, weight, weightStep):
+    rows = []
+    for layoutName, problemClass, heuristic in PROBLEMS:
+        gameState = loadGameState(layoutName)
+        problem = problemClass(gameState)
+        actions, seconds = timeCall(search.aStarSearch, problem, heuristic)
+        rows.append([layoutName, 'astar', '%.4f' % seconds, problem.getCostOfActions(actions), '1.00',
+                     problem._expanded])
+
+        problem = problemClass(gameState)
+        start = time.perf_counter()
+        report = lambda actions, cost, bound: rows.append(
+            [layoutName, 'anytimeAStar', '%.4f' % (time.perf_counter() - start), cost, '%.2f' % bound,
+             problem._expanded])
+        search.anytimeAStar(problem, heuristic, budget, weight, weightStep, report)
+    printTable(['layout', 'fn', 'seconds', 'cost', 'bound', 'expanded'], rows)
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.anytime [options]')
+    parser.add_option('--budget', dest='budget', type='float', default=None,
+                      help='Time budget of anytimeAStar in seconds [Default: none]')
+    parser.add_option('--weight', dest='weight', type='float', default=3.0,
+                      help='Initial heuristic weight [Default: %default]')
+    parser.add_option('--weightStep', dest='weightStep', type='float', default=0.5,
+                      help='How much the weight drops after each round [Default: %default]')
+    options, _ = parser.parse_args(sys.argv[1:])
+    checkTinyBudgets(options.weight, options.weightStep)
+    runBenchmark(options.budget, options.weight, options.weightStep)
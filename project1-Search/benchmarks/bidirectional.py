@@ -0,0 +1,79 @@
+# benchmarks/bidirectional.py
+# ---------------------------
+# Compares the bidirectional searches with their unidirectional versions on
+# the maze layouts and on random eight puzzles.
+#
+# > python -m benchmarks.bidirectional
+# > python -m benchmarks.bidirectional --puzzles 20 --moves 60 bigMaze
+
+import random
+import sys
+from optparse import OptionParser
+
+import eightpuzzle
+import search
+import searchAgents
+from benchmarks import loadGameState, timeCall, printTable
+
+LAYOUTS = ['mediumMaze', 'bigMaze', 'contoursMaze', 'openMaze']
+
+# (name, unidirectional, bidirectional); the A* pairs use manhattanHeuristic
+MAZE_ALGORITHMS = [
+    ('bfs', search.breadthFirstSearch, search.bidirectionalSearch),
+    ('astar', lambda problem: search.aStarSearch(problem, searchAgents.manhattanHeuristic),
+     lambda problem: search.bidirectionalAStarSearch(problem, searchAgents.manhattanHeuristic)),
+]
+
+PUZZLE_ALGORITHMS = [
+    ('bfs', search.breadthFirstSearch, search.bidirectionalSearch),
+    ('ucs', search.uniformCostSearch, search.bidirectionalAStarSearch),
+]
+
+
+def measure(makeProblem, function):
+    """
+    Returns (path cost, expanded, seconds) for one search on a fresh problem.
+    """
+    problem = makeProblem()
+    actions, seconds = timeCall(function, problem)
+    return problem.getCostOfActions(actions), problem._expanded, seconds
+
+
+def compare(rows, name, algorithm, makeProblem, unidirectional, bidirectional):
+    cost, expanded, seconds = measure(makeProblem, unidirectional)
+    biCost, biExpanded, biSeconds = measure(makeProblem, bidirectional)
+    rows.append([name, algorithm, cost, biCost, expanded, biExpanded,
+                 '%.1fx' % (expanded / float(max(biExpanded, 1))),
+                 '%.4f' % seconds, '%.4f' % biSeconds])
+
+
+def runBenchmark(layoutNames, puzzles, moves, seed):
+    rows = []
+    for layoutName in layoutNames:
+        gameState = loadGameState(layoutName)
+        makeProblem = lambda: searchAgents.PositionSearchProblem(gameState, warn=False, visualize=False)
+        for algorithm, unidirectional, bidirectional in MAZE_ALGORITHMS:
+            compare(rows, layoutName, algorithm, makeProblem, unidirectional, bidirectional)
+
+    rand = random.Random(seed)
+    for i in range(puzzles):
+        random.seed(rand.random())
+        puzzle = eightpuzzle.createRandomEightPuzzle(moves)
+        makeProblem = lambda: eightpuzzle.EightPuzzleSearchProblem(puzzle)
+        for algorithm, unidirectional, bidirectional in PUZZLE_ALGORITHMS:
+            compare(rows, 'eightPuzzle%d' % i, algorithm, makeProblem, unidirectional, bidirectional)
+
+    printTable(['problem', 'fn', 'cost', 'cost(bi)', 'expanded', 'expanded(bi)', 'reduction',
+                'seconds', 'seconds(bi)'], rows)
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.bidirectional [options] [layouts]')
+    parser.add_option('--puzzles', dest='puzzles', type='int', default=5,
+                      help='Number of random eight puzzles [Default: %default]')
+    parser.add_option('--moves', dest='moves', type='int', default=40,
+                      help='Random moves used to scramble each puzzle [Default: %default]')
+    parser.add_option('--seed', dest='seed', type='int', default=0,
+                      help='Seed for the random puzzles [Default: %default]')
+    options, layoutNames = parser.parse_args(sys.argv[1:])
+    runBenchmark(layoutNames or LAYOUTS, options.puzzles, options.moves, options.seed)
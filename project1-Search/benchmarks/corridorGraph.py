@@ -0,0 +1,60 @@
+# benchmarks/corridorGraph.py
+# ---------------------------
+# Compares searches on PositionSearchProblem with the same searches on the
+# corridor-compressed CompressedPositionSearchProblem.
+#
+# > python -m benchmarks.corridorGraph
+# > python -m benchmarks.corridorGraph --repeat 5 bigMaze
+
+import sys
+from optparse import OptionParser
+
+import search
+import searchAgents
+from benchmarks import loadGameState, timeCall, printTable
+
+LAYOUTS = ['mediumMaze', 'bigMaze', 'contoursMaze', 'openMaze']
+
+ALGORITHMS = [
+    ('bfs', search.breadthFirstSearch),
+    ('ucs', search.uniformCostSearch),
+    ('astar', lambda problem: search.aStarSearch(problem, searchAgents.manhattanHeuristic)),
+]
+
+
+def measure(problemClass, function, gameState, repeat):
+    """
+    Returns (path cost, expanded, best seconds) for one problem class.
+    """
+    best = None
+    for _ in range(repeat):
+        problem = problemClass(gameState, warn=False, visualize=False)
+        actions, elapsed = timeCall(function, problem)
+        best = elapsed if best == None else min(best, elapsed)
+    return problem.getCostOfActions(actions), problem._expanded, best
+
+
+def runBenchmark(layoutNames, repeat):
+    rows = []
+    for layoutName in layoutNames:
+        gameState = loadGameState(layoutName)
+        graph = gameState.data.layout.getCorridorGraph()
+        table = gameState.data.layout.getSuccessorTable()
+        for name, function in ALGORITHMS:
+            cost, expanded, seconds = measure(searchAgents.PositionSearchProblem, function, gameState, repeat)
+            compressedCost, compressedExpanded, compressedSeconds = measure(
+                searchAgents.CompressedPositionSearchProblem, function, gameState, repeat)
+            rows.append([layoutName, '%d/%d' % (len(graph.nodes), table.numCells), name,
+                         cost, compressedCost, expanded, compressedExpanded,
+                         '%.1fx' % (expanded / float(compressedExpanded)),
+                         '%.4f' % seconds, '%.4f' % compressedSeconds])
+    printTable(['layout', 'nodes/cells', 'fn', 'cost', 'cost(compressed)', 'expanded',
+                'expanded(compressed)', 'reduction', 'seconds', 'seconds(compressed)'], rows)
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.corridorGraph [options] [layouts]')
+    parser.add_option('--repeat', dest='repeat', type='int', default=3,
+                      help='Timed runs per measurement; the fastest is kept [Default: %default]')
+    options, layoutNames = parser.parse_args(sys.argv[1:])
+    runBenchmark(layoutNames or LAYOUTS, options.repeat)
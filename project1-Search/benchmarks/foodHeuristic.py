@@ -0,0 +1,76 @@
+# benchmarks/foodHeuristic.py
+# ---------------------------
+# Compares the spanning tree food heuristic (foodHeuristics.py) with the
+# previous farthest pellet heuristic on FoodSearchProblem, and reports the
+# hit rate of the spanning tree cache.
+#
+# Optimal A* is only practical on trickySearch; mediumSearch and bigSearch
+# use anytimeAStar with a time budget and report the best path found.
+#
+# > python -m benchmarks.foodHeuristic
+# > python -m benchmarks.foodHeuristic --budget 30 bigSearch
+
+import sys
+from optparse import OptionParser
+
+import search
+import searchAgents
+from benchmarks import loadGameState, timeCall, printTable
+
+# layout -> run plain A* (True) or anytimeAStar with the budget (False)
+LAYOUTS = [('trickySearch', True), ('mediumSearch', False), ('bigSearch', False)]
+
+
+def farthestPelletHeuristic(state, problem):
+    """
+    The previous foodHeuristic: the maze distance to the farthest pellet.
+    """
+    position, foodGrid = state
+    return max([searchAgents.mazeDistance(position, pellet, problem.startingGameState)
+                for pellet in foodGrid.asList()] + [0])
+
+
+def measure(gameState, heuristic, optimal, budget):
+    """
+    Returns (cost, bound, expanded, seconds, heuristicInfo) for one search.
+    """
+    problem = searchAgents.FoodSearchProblem(gameState)
+    bounds = [1.0]
+    if optimal:
+        actions, seconds = timeCall(search.aStarSearch, problem, heuristic)
+    else:
+        report = lambda actions, cost, bound: bounds.append(bound)
+        actions, seconds = timeCall(search.anytimeAStar, problem, heuristic, budget, 3.0, 0.5, report)
+    return problem.getCostOfActions(actions), bounds[-1], problem._expanded, seconds, problem.heuristicInfo
+
+
+def runBenchmark(layouts, budget):
+    rows = []
+    for layoutName, optimal in layouts:
+        gameState = loadGameState(layoutName)
+        heuristics = [('mst', searchAgents.mstFoodHeuristic)]
+        # the farthest pellet heuristic finds no path on the larger layouts
+        if optimal:
+            heuristics.insert(0, ('farthest', farthestPelletHeuristic))
+        for heuristicName, heuristic in heuristics:
+            cost, bound, expanded, seconds, info = measure(gameState, heuristic, optimal, budget)
+            hits, misses = info.get('mstCacheHits', 0), info.get('mstCacheMisses', 0)
+            hitRate = '-'
+            if hits + misses:
+                hitRate = '%.1f%%' % (100.0 * hits / (hits + misses))
+            rows.append([layoutName, heuristicName, 'astar' if optimal else 'anytimeAStar', cost, '%.2f' % bound,
+                         expanded, '%.3f' % seconds, hits, misses, hitRate])
+    printTable(['layout', 'heuristic', 'fn', 'cost', 'bound', 'expanded', 'seconds',
+                'cache hits', 'cache misses', 'hit rate'], rows)
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.foodHeuristic [options] [layouts]')
+    parser.add_option('--budget', dest='budget', type='float', default=10.0,
+                      help='Seconds given to anytimeAStar on the larger layouts [Default: %default]')
+    options, layoutNames = parser.parse_args(sys.argv[1:])
+    layouts = LAYOUTS
+    if layoutNames:
+        optimalLayouts = dict(LAYOUTS)
+        layouts = [(name, optimalLayouts.get(name, False)) for name in layoutNames]
+    runBenchmark(layouts, options.budget)
@@ -0,0 +1,89 @@
+# benchmarks/iterativeDeepening.py
+# --------------------------------
+# Compares aStarSearch with iterativeDeepeningAStar, with and without a
+# transposition table, on random eight puzzles and on CornersProblem.  Peak
+# memory is measured with tracemalloc.
+#
+# > python -m benchmarks.iterativeDeepening
+# > python -m benchmarks.iterativeDeepening --iterations --tableSizes 0,1000 mediumCorners
+
+import random
+import sys
+from optparse import OptionParser
+
+import eightpuzzle
+import search
+import searchAgents
+from benchmarks import loadGameState, timeCall, peakMemory, printTable
+
+LAYOUTS = ['tinyCorners']
+
+
+def measure(makeProblem, heuristic, tableSize, repeat):
+    """
+    Runs aStarSearch when tableSize is None and iterativeDeepeningAStar
+    otherwise.  Returns (path cost, expanded, best seconds, peak bytes,
+    (threshold, expanded) of every IDA* iteration).
+    """
+    def run(problem):
+        iterations = []
+        if tableSize is None:
+            actions = search.aStarSearch(problem, heuristic)
+        else:
+            actions = search.iterativeDeepeningAStar(problem, heuristic, tableSize,
+                                                     lambda *report: iterations.append(report))
+        return actions, iterations
+
+    best = None
+    for _ in range(repeat):
+        problem = makeProblem()
+        (actions, iterations), seconds = timeCall(run, problem)
+        best = seconds if best == None else min(best, seconds)
+    _, peak = peakMemory(run, makeProblem())
+    return problem.getCostOfActions(actions), problem._expanded, best, peak, iterations
+
+
+def runBenchmark(problems, tableSizes, repeat, showIterations):
+    rows = []
+    for name, makeProblem, heuristic in problems:
+        for tableSize in [None] + tableSizes:
+            functionName = 'astar' if tableSize is None else 'idastar(table=%d)' % tableSize
+            cost, expanded, seconds, peak, iterations = measure(makeProblem, heuristic, tableSize, repeat)
+            rows.append([name, functionName, cost, expanded, '%.4f' % seconds, '%.1f' % (peak / 1024.0),
+                         len(iterations) if tableSize is not None else '-'])
+            if showIterations:
+                for threshold, iterationExpanded in iterations:
+                    print('%s %s: threshold %s, expanded %d' % (name, functionName, threshold, iterationExpanded))
+    printTable(['problem', 'fn', 'cost', 'expanded', 'seconds', 'peak KiB', 'iterations'], rows)
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.iterativeDeepening [options] [corners layouts]')
+    parser.add_option('--puzzles', dest='puzzles', type='int', default=5,
+                      help='Number of random eight puzzles [Default: %default]')
+    parser.add_option('--moves', dest='moves', type='int', default=60,
+                      help='Random moves used to scramble each puzzle [Default: %default]')
+    parser.add_option('--seed', dest='seed', type='int', default=0,
+                      help='Seed for the random puzzles [Default: %default]')
+    parser.add_option('--tableSizes', dest='tableSizes', default='0,100000',
+                      help='Comma separated transposition table sizes, 0 for none [Default: %default]')
+    parser.add_option('--repeat', dest='repeat', type='int', default=1,
+                      help='Timed runs per measurement; the fastest is kept [Default: %default]')
+    parser.add_option('--iterations', dest='iterations', action='store_true', default=False,
+                      help='Print the threshold and expansions of every IDA* iteration')
+    options, layoutNames = parser.parse_args(sys.argv[1:])
+
+    problems = []
+    rand = random.Random(options.seed)
+    for i in range(options.puzzles):
+        random.seed(rand.random())
+        puzzle = eightpuzzle.createRandomEightPuzzle(options.moves)
+        problems.append(('eightPuzzle%d' % i, lambda puzzle=puzzle: eightpuzzle.EightPuzzleSearchProblem(puzzle),
+                         eightpuzzle.eightPuzzleHeuristic))
+    for layoutName in layoutNames or LAYOUTS:
+        gameState = loadGameState(layoutName)
+        problems.append((layoutName, lambda gameState=gameState: searchAgents.CornersProblem(gameState),
+                         searchAgents.cornersHeuristic))
+
+    tableSizes = [int(size) for size in options.tableSizes.split(',')]
+    runBenchmark(problems, tableSizes, options.repeat, options.iterations)
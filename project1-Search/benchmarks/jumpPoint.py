@@ -0,0 +1,81 @@
+# benchmarks/jumpPoint.py
+# -----------------------
+# Compares aStarSearch with jumpPointSearch on unit cost position problems:
+# the shipped mazes plus large generated open layouts with scattered walls.
+#
+# > python -m benchmarks.jumpPoint
+# > python -m benchmarks.jumpPoint --repeat 5 --size 200 bigMaze
+
+import random
+import sys
+from optparse import OptionParser
+
+import layout
+import pacman
+import search
+import searchAgents
+from benchmarks import loadGameState, timeCall, printTable
+
+LAYOUTS = ['bigMaze', 'openMaze']
+
+# (name, wall density) of the generated open layouts
+OPEN_LAYOUTS = [('open', 0.0), ('scattered', 0.05), ('cluttered', 0.2)]
+
+
+def openLayoutState(size, density, seed=0):
+    """
+    Returns a GameState for a size x size room with randomly placed walls,
+    Pacman in the top right corner and the goal (1, 1) kept open.
+    """
+    rand = random.Random(seed)
+    rows = []
+    for y in range(size):
+        row = []
+        for x in range(size):
+            border = x in (0, size - 1) or y in (0, size - 1)
+            row.append('%' if border or rand.random() < density else ' ')
+        rows.append(row)
+    rows[1][size - 2] = 'P'
+    rows[size - 2][1] = ' '
+    state = pacman.GameState()
+    state.initialize(layout.Layout([''.join(row) for row in rows]), 0)
+    return state
+
+
+def measure(function, gameState, repeat):
+    """
+    Returns (path cost, expanded, best seconds) for one search function.
+    """
+    best = None
+    for _ in range(repeat):
+        problem = searchAgents.PositionSearchProblem(gameState, warn=False, visualize=False)
+        actions, elapsed = timeCall(function, problem, searchAgents.manhattanHeuristic)
+        best = elapsed if best == None else min(best, elapsed)
+    return problem.getCostOfActions(actions), problem._expanded, best
+
+
+def runBenchmark(gameStates, repeat):
+    rows = []
+    for name, gameState in gameStates:
+        cost, expanded, seconds = measure(search.aStarSearch, gameState, repeat)
+        jumpCost, jumpExpanded, jumpSeconds = measure(search.jumpPointSearch, gameState, repeat)
+        rows.append([name, cost, jumpCost, expanded, jumpExpanded,
+                     '%.1fx' % (expanded / float(max(jumpExpanded, 1))),
+                     '%.4f' % seconds, '%.4f' % jumpSeconds,
+                     '%.1fx' % (seconds / jumpSeconds)])
+    printTable(['layout', 'cost', 'cost(jps)', 'expanded', 'expanded(jps)', 'reduction',
+                'seconds', 'seconds(jps)', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.jumpPoint [options] [layouts]')
+    parser.add_option('--repeat', dest='repeat', type='int', default=3,
+                      help='Timed runs per measurement; the fastest is kept [Default: %default]')
+    parser.add_option('--size', dest='size', type='int', default=120,
+                      help='Side of the generated open layouts [Default: %default]')
+    options, layoutNames = parser.parse_args(sys.argv[1:])
+    gameStates = [(name, loadGameState(name)) for name in layoutNames or LAYOUTS]
+    if not layoutNames:
+        gameStates += [('%s%d' % (name, options.size), openLayoutState(options.size, density))
+                       for name, density in OPEN_LAYOUTS]
+    runBenchmark(gameStates, options.repeat)
@@ -0,0 +1,55 @@
+# benchmarks/landmarks.py
+# -----------------------
+# Compares the ALT landmark heuristic (landmarks.py) with the Manhattan
+# distance for aStarSearch on PositionSearchProblem, on shipped mazes and on
+# generated mazes, braided mazes and rooms (layoutGenerator.py).  Building
+# the landmark table is timed separately; it is shared by every later query
+# on the same map.
+#
+# > python -m benchmarks.landmarks
+# > python -m benchmarks.landmarks --landmarks 16 --size 501
+
+import sys
+from optparse import OptionParser
+
+import landmarks
+import layoutGenerator
+import pacman
+import search
+import searchAgents
+from benchmarks import loadGameState, timeCall, printTable
+
+SHIPPED_LAYOUTS = ['mediumMaze', 'bigMaze', 'openMaze', 'contoursMaze']
+GENERATED_KINDS = ['maze', 'braided', 'room']
+
+
+def generatedState(kind, size):
+    state = pacman.GameState()
+    state.initialize(layoutGenerator.generateLayout(kind, size, size, seed=1), 0)
+    return state
+
+
+def runBenchmark(size, k):
+    states = [(name, loadGameState(name)) for name in SHIPPED_LAYOUTS]
+    states += [('%s%d' % (kind, size), generatedState(kind, size)) for kind in GENERATED_KINDS]
+    rows = []
+    for name, gameState in states:
+        table, buildSeconds = timeCall(landmarks.getLandmarkTable, gameState.data.layout, k)
+        landmarkHeuristic = lambda position, problem: landmarks.landmarkHeuristic(position, problem, k)
+        for heuristicName, heuristic in [('manhattan', searchAgents.manhattanHeuristic),
+                                         ('landmarks', landmarkHeuristic)]:
+            problem = searchAgents.PositionSearchProblem(gameState, warn=False, visualize=False)
+            actions, seconds = timeCall(search.aStarSearch, problem, heuristic)
+            rows.append([name, heuristicName, problem.getCostOfActions(actions), problem._expanded,
+                         '%.4f' % seconds, '%.4f' % buildSeconds if heuristicName == 'landmarks' else '-'])
+    printTable(['layout', 'heuristic', 'cost', 'expanded', 'search s', 'table s'], rows)
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.landmarks [options]')
+    parser.add_option('--size', dest='size', type='int', default=301,
+                      help='Width and height of the generated layouts [Default: %default]')
+    parser.add_option('--landmarks', dest='landmarks', type='int', default=landmarks.LANDMARK_COUNT,
+                      help='Number of landmarks [Default: %default]')
+    options, _ = parser.parse_args(sys.argv[1:])
+    runBenchmark(options.size, options.landmarks)
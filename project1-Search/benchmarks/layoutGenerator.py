@@ -0,0 +1,99 @@
+# benchmarks/layoutGenerator.py
+# -----------------------------
+# Sweeps the size of generated layouts (layoutGenerator.py): for every kind
+# and size it prints the time to generate the text and to build the Layout,
+# and how long breadthFirstSearch takes from Pacman to (1, 1).
+#
+# First it generates every kind from many seeds at a small size, with ghosts
+# and capsules, and checks that each layout is playable: more than one open
+# cell, Pacman, every ghost and capsule placed, food, and a path from Pacman
+# to (1, 1).
+#
+# > python -m benchmarks.layoutGenerator
+# > python -m benchmarks.layoutGenerator --sizes 101,1001 --kinds maze,braided
+# > python -m benchmarks.layoutGenerator --checkSeeds 1000 --sizes 101
+
+import sys
+from optparse import OptionParser
+
+import layout
+import layoutGenerator
+import pacman
+import search
+import searchAgents
+from benchmarks import timeCall, printTable
+
+
+# layouts checked by checkSeeds
+CHECK_WIDTH, CHECK_HEIGHT = 40, 30
+CHECK_GHOSTS, CHECK_CAPSULES = 2, 2
+
+
+def checkLayout(kind, seed):
+    """
+    Returns what makes one generated layout unplayable, or None.
+    """
+    try:
+        lay = layoutGenerator.generateLayout(kind, CHECK_WIDTH, CHECK_HEIGHT, seed, capsules=CHECK_CAPSULES,
+                                             ghosts=CHECK_GHOSTS)
+    except ValueError as e:
+        return str(e)
+    openCells = lay.width * lay.height - lay.walls.count()
+    if openCells <= 1:
+        return 'only %d open cells' % openCells
+    if lay.food.count() == 0:
+        return 'no food'
+    if len(lay.capsules) != CHECK_CAPSULES or lay.getNumGhosts() != CHECK_GHOSTS:
+        return 'missing ghosts or capsules'
+    state = pacman.GameState()
+    state.initialize(lay, CHECK_GHOSTS)
+    problem = searchAgents.PositionSearchProblem(state, warn=False, visualize=False)
+    if state.getPacmanPosition() != (1, 1) and not search.breadthFirstSearch(problem):
+        return 'no path from Pacman to (1, 1)'
+    return None
+
+
+def checkSeeds(kinds, seeds):
+    """
+    Raises an Exception naming the kinds and seeds that give an unplayable
+    layout.
+    """
+    failures = []
+    for kind in kinds:
+        for seed in range(seeds):
+            problem = checkLayout(kind, seed)
+            if problem is not None:
+                failures.append('%s seed %d: %s' % (kind, seed, problem))
+    if failures:
+        raise Exception('Unplayable layouts:\n' + '\n'.join(failures))
+    print('%d seeds of %s at %dx%d are playable' % (seeds, ', '.join(kinds), CHECK_WIDTH, CHECK_HEIGHT))
+
+
+def runBenchmark(kinds, sizes, seed):
+    rows = []
+    for kind in kinds:
+        for size in sizes:
+            text, generateSeconds = timeCall(layoutGenerator.generateLayoutText, kind, size, size, seed)
+            lay, layoutSeconds = timeCall(layout.Layout, text)
+            state = pacman.GameState()
+            state.initialize(lay, 0)
+            problem = searchAgents.PositionSearchProblem(state, warn=False, visualize=False)
+            actions, searchSeconds = timeCall(search.breadthFirstSearch, problem)
+            rows.append([kind, '%dx%d' % (size, size), '%.3f' % generateSeconds, '%.3f' % layoutSeconds,
+                         len(actions), problem._expanded, '%.3f' % searchSeconds])
+    printTable(['kind', 'size', 'generate s', 'Layout s', 'path', 'bfs expanded', 'bfs s'], rows)
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.layoutGenerator [options]')
+    parser.add_option('--kinds', dest='kinds', default=','.join(sorted(layoutGenerator.KINDS)),
+                      help='Comma separated layout kinds [Default: %default]')
+    parser.add_option('--sizes', dest='sizes', default='101,301,1001',
+                      help='Comma separated widths (= heights) [Default: %default]')
+    parser.add_option('--seed', dest='seed', type='int', default=0,
+                      help='Random seed [Default: %default]')
+    parser.add_option('--checkSeeds', dest='checkSeeds', type='int', default=200,
+                      help='Seeds checked for playable layouts per kind [Default: %default]')
+    options, _ = parser.parse_args(sys.argv[1:])
+    checkSeeds(options.kinds.split(','), options.checkSeeds)
+    runBenchmark(options.kinds.split(','), [int(size) for size in options.sizes.split(',')], options.seed)
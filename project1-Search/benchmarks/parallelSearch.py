@@ -0,0 +1,86 @@
+# benchmarks/parallelSearch.py
+# ----------------------------
+# Speedup of parallelSearch.parallelAStarSearch over aStarSearch for 1, 2, 4
+# and 8 worker processes.  Speedups above 1 need at least as many cores as
+# workers; the number of cores is printed first.
+#
+# First it checks that a search whose heuristic raises in the workers raises
+# too, instead of waiting forever for the dead workers.
+#
+# > python -m benchmarks.parallelSearch
+# > python -m benchmarks.parallelSearch --workers 1,2,4 --batchSize 256 trickySearch
+
+import os
+import random
+import sys
+from optparse import OptionParser
+
+import parallelSearch
+import eightpuzzle
+import search
+import searchAgents
+from benchmarks import loadGameState, timeCall, printTable
+
+# layout -> (problem class, heuristic); the null heuristic keeps the searches
+# large enough for the worker processes to pay off
+PROBLEMS = {
+    'trickySearch': (searchAgents.FoodSearchProblem, search.nullHeuristic),
+    'mediumCorners': (searchAgents.CornersProblem, search.nullHeuristic),
+    'bigCorners': (searchAgents.CornersProblem, search.nullHeuristic),
+}
+
+
+# Heuristic calls a worker makes before the heuristic of checkFailingWorker raises
+FAILING_CALLS = 50
+
+
+def checkFailingWorker(workers=2):
+    """
+    Raises an Exception unless parallelAStarSearch raises when its workers die.
+    """
+    random.seed(0)
+    problem = eightpuzzle.EightPuzzleSearchProblem(eightpuzzle.createRandomEightPuzzle(30))
+    calls = [0]
+
+    def failingHeuristic(state, problem):
+        calls[0] += 1
+        if calls[0] > FAILING_CALLS:
+            raise ValueError('failingHeuristic called %d times' % calls[0])
+        return 0
+
+    try:
+        parallelSearch.parallelAStarSearch(problem, failingHeuristic, workers)
+    except Exception as error:
+        print('A failing heuristic stops the search: %s' % error)
+        return
+    raise Exception('parallelAStarSearch finished although its heuristic raised')
+
+
+def runBenchmark(layoutNames, workerCounts, batchSize):
+    print('%d cores' % os.cpu_count())
+    rows = []
+    for layoutName in layoutNames:
+        problemClass, heuristic = PROBLEMS[layoutName]
+        gameState = loadGameState(layoutName)
+        problem = problemClass(gameState)
+        actions, serialSeconds = timeCall(search.aStarSearch, problem, heuristic)
+        rows.append([layoutName, 'astar', problem.getCostOfActions(actions), problem._expanded,
+                     '%.3f' % serialSeconds, '1.00x'])
+        for workers in workerCounts:
+            problem = problemClass(gameState)
+            actions, seconds = timeCall(parallelSearch.parallelAStarSearch, problem, heuristic, workers, batchSize)
+            rows.append([layoutName, 'parallel(%d)' % workers, problem.getCostOfActions(actions),
+                         problem._expanded, '%.3f' % seconds, '%.2fx' % (serialSeconds / seconds)])
+    printTable(['layout', 'fn', 'cost', 'expanded', 'seconds', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.parallelSearch [options] [layouts]')
+    parser.add_option('--workers', dest='workers', default='1,2,4,8',
+                      help='Comma separated worker counts [Default: %default]')
+    parser.add_option('--batchSize', dest='batchSize', type='int', default=64,
+                      help='Nodes per message between workers [Default: %default]')
+    options, layoutNames = parser.parse_args(sys.argv[1:])
+    workerCounts = [int(workers) for workers in options.workers.split(',')]
+    checkFailingWorker()
+    runBenchmark(layoutNames or sorted(PROBLEMS), workerCounts, options.batchSize)
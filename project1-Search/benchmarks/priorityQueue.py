@@ -0,0 +1,77 @@
+# benchmarks/priorityQueue.py
+# ---------------------------
+# Micro-benchmarks for util.IndexedPriorityQueue against util.PriorityQueue.
+#
+# > python -m benchmarks.priorityQueue
+# > python -m benchmarks.priorityQueue --sizes 1000,10000 --repeat 5
+
+import random
+import sys
+from optparse import OptionParser
+
+import util
+from benchmarks import timeCall, printTable
+
+
+def pushPop(queueClass, items, priorities, updates):
+    queue = queueClass()
+    for item, priority in zip(items, priorities):
+        queue.push(item, priority)
+    while not queue.isEmpty():
+        queue.pop()
+
+
+def pushUpdatePop(queueClass, items, priorities, updates):
+    queue = queueClass()
+    for item, priority in zip(items, priorities):
+        queue.push(item, priority)
+    for item, priority in updates:
+        queue.update(item, priority)
+    while not queue.isEmpty():
+        queue.pop()
+
+
+def bulkBuild(queueClass, items, priorities, updates):
+    if queueClass is util.IndexedPriorityQueue:
+        queueClass(zip(items, priorities))
+    else:
+        queue = queueClass()
+        for item, priority in zip(items, priorities):
+            queue.push(item, priority)
+
+
+WORKLOADS = [
+    ('push+pop', pushPop),
+    ('push+update+pop', pushUpdatePop),
+    ('build', bulkBuild),
+]
+
+
+def runBenchmark(sizes, repeat, seed):
+    rows = []
+    for size in sizes:
+        rand = random.Random(seed)
+        items = list(range(size))
+        priorities = [rand.random() for _ in items]
+        # every update lowers the priority of a random queued item
+        updates = [(rand.randrange(size), -rand.random()) for _ in items]
+        for name, workload in WORKLOADS:
+            times = []
+            for queueClass in (util.PriorityQueue, util.IndexedPriorityQueue):
+                best = min(timeCall(workload, queueClass, items, priorities, updates)[1]
+                           for _ in range(repeat))
+                times.append(best)
+            rows.append([size, name, '%.4f' % times[0], '%.4f' % times[1], '%.1fx' % (times[0] / times[1])])
+    printTable(['n', 'workload', 'PriorityQueue(s)', 'IndexedPriorityQueue(s)', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.priorityQueue [options]')
+    parser.add_option('--sizes', dest='sizes', default='1000,5000',
+                      help='Comma separated queue sizes [Default: %default]')
+    parser.add_option('--repeat', dest='repeat', type='int', default=3,
+                      help='Timed runs per measurement; the fastest is kept [Default: %default]')
+    parser.add_option('--seed', dest='seed', type='int', default=188,
+                      help='Random seed for priorities and updates [Default: %default]')
+    options, _ = parser.parse_args(sys.argv[1:])
+    runBenchmark([int(size) for size in options.sizes.split(',')], options.repeat, options.seed)
@@ -0,0 +1,151 @@
+# benchmarks/searchEngine.py
+# --------------------------
+# Compares the parent-pointer search engine in search.py with the original
+# implementations that copied the action list for every generated successor.
+#
+# > python -m benchmarks.searchEngine
+# > python -m benchmarks.searchEngine --repeat 5 bigMaze openMaze
+
+import sys
+from optparse import OptionParser
+
+import search
+import searchAgents
+import util
+from benchmarks import loadGameState, timeCall, peakMemory, printTable
+
+POSITION_LAYOUTS = ['tinyMaze', 'smallMaze', 'mediumMaze', 'bigMaze', 'openMaze', 'contoursMaze']
+CORNERS_LAYOUTS = ['tinyCorners', 'mediumCorners', 'bigCorners']
+
+
+##########################################################
+# The list-copying implementations the engine replaced   #
+##########################################################
+
+def legacyDepthFirstSearch(problem):
+    fringe = util.Stack()
+    visitedNodes = []
+    fringe.push((problem.getStartState(), []))
+    actions = []
+    while not fringe.isEmpty():
+        state, actions = fringe.pop()
+        if state not in visitedNodes:
+            visitedNodes.append(state)
+            if problem.isGoalState(state):
+                return actions
+            for successorState, successorAction, successorCost in problem.getSuccessors(state):
+                fringe.push((successorState, actions + [successorAction]))
+    return actions
+
+
+def legacyBreadthFirstSearch(problem):
+    fringe = util.Queue()
+    visitedNodes = []
+    fringe.push((problem.getStartState(), [], 0))
+    actions = []
+    while not fringe.isEmpty():
+        state, actions, cost = fringe.pop()
+        if state not in visitedNodes:
+            visitedNodes.append(state)
+            if problem.isGoalState(state):
+                return actions
+            for successorState, successorAction, successorCost in problem.getSuccessors(state):
+                fringe.push((successorState, actions + [successorAction], cost + successorCost))
+    return actions
+
+
+def legacyUniformCostSearch(problem):
+    fringe = util.PriorityQueue()
+    visitedNodes = {}
+    fringe.push((problem.getStartState(), [], 0), 0)
+    actions = []
+    while not fringe.isEmpty():
+        state, actions, cost = fringe.pop()
+        if (state not in visitedNodes) or (cost < visitedNodes[state]):
+            visitedNodes[state] = cost
+            if problem.isGoalState(state):
+                return actions
+            for successorState, successorAction, successorCost in problem.getSuccessors(state):
+                newCost = cost + successorCost
+                fringe.update((successorState, actions + [successorAction], newCost), newCost)
+    return actions
+
+
+def legacyAStarSearch(problem, heuristic=search.nullHeuristic):
+    fringe = util.PriorityQueue()
+    visitedNodes = []
+    fringe.push((problem.getStartState(), [], 0), 0)
+    actions = []
+    while not fringe.isEmpty():
+        location, actions, cost = fringe.pop()
+        visitedNodes.append((location, cost))
+        if problem.isGoalState(location):
+            return actions
+        for successorLocation, successorAction, successorCost in problem.getSuccessors(location):
+            newAction = actions + [successorAction]
+            newCost = problem.getCostOfActions(newAction)
+            prevVisited = False
+            for prevLocation, prevCost in visitedNodes:
+                if (successorLocation == prevLocation) and (newCost >= prevCost):
+                    prevVisited = True
+            if not prevVisited:
+                fringe.push((successorLocation, newAction, newCost), newCost + heuristic(successorLocation, problem))
+                visitedNodes.append((successorLocation, newCost))
+    return actions
+
+
+def manhattanAStar(function):
+    return lambda problem: function(problem, searchAgents.manhattanHeuristic)
+
+
+ALGORITHMS = [
+    ('dfs', legacyDepthFirstSearch, search.depthFirstSearch),
+    ('bfs', legacyBreadthFirstSearch, search.breadthFirstSearch),
+    ('ucs', legacyUniformCostSearch, search.uniformCostSearch),
+    ('astar', manhattanAStar(legacyAStarSearch), manhattanAStar(search.aStarSearch)),
+]
+
+
+def makeProblem(problemType, gameState):
+    if problemType == 'position':
+        return searchAgents.PositionSearchProblem(gameState, warn=False, visualize=False)
+    return searchAgents.CornersProblem(gameState)
+
+
+def measure(function, problemType, gameState, repeat):
+    """
+    Returns (actions, expanded, peak bytes, nodes/sec) for one search function.
+    """
+    actions, peak = peakMemory(function, makeProblem(problemType, gameState))
+    best = None
+    for _ in range(repeat):
+        problem = makeProblem(problemType, gameState)
+        _, elapsed = timeCall(function, problem)
+        best = elapsed if best == None else min(best, elapsed)
+    return actions, problem._expanded, peak, problem._expanded / max(best, 1e-9)
+
+
+def runBenchmark(layoutNames, repeat):
+    rows = []
+    for layoutName in layoutNames:
+        problemType = 'corners' if layoutName in CORNERS_LAYOUTS else 'position'
+        gameState = loadGameState(layoutName)
+        for name, before, after in ALGORITHMS:
+            if problemType == 'corners' and name == 'astar':
+                continue
+            oldActions, oldExpanded, oldPeak, oldRate = measure(before, problemType, gameState, repeat)
+            newActions, newExpanded, newPeak, newRate = measure(after, problemType, gameState, repeat)
+            same = 'yes' if (oldActions, oldExpanded) == (newActions, newExpanded) else 'NO'
+            rows.append([layoutName, name, newExpanded, same,
+                         '%.1f' % (oldPeak / 1024.0), '%.1f' % (newPeak / 1024.0),
+                         '%.0f' % oldRate, '%.0f' % newRate, '%.2fx' % (newRate / oldRate)])
+    printTable(['layout', 'fn', 'expanded', 'same', 'peakKiB(before)', 'peakKiB(after)',
+                'nodes/s(before)', 'nodes/s(after)', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.searchEngine [options] [layouts]')
+    parser.add_option('--repeat', dest='repeat', type='int', default=3,
+                      help='Timed runs per measurement; the fastest is kept [Default: %default]')
+    options, layoutNames = parser.parse_args(sys.argv[1:])
+    runBenchmark(layoutNames or POSITION_LAYOUTS + CORNERS_LAYOUTS, options.repeat)
@@ -0,0 +1,300 @@
+# benchmarks/suite.py
+# -------------------
+# Regression benchmark over every search function / problem / heuristic
+# combination we care about:
+#
+#   position     PositionSearchProblem on every shipped layout where (1, 1)
+#                can be reached, and on generated open rooms of GENERATED_SIZES
+#   corners      CornersProblem on every layout where the corners can be reached
+#   food         FoodSearchProblem on layouts with at most FOOD_LIMIT pellets
+#   eightpuzzle  random eight puzzles from fixed seeds
+#
+# Each case runs in its own process (so its peak RSS is its own), repeat
+# times with random seeded the same way and the garbage collector off, and
+# keeps the fastest wall time.
+# The results are compared with a baseline JSON and a case is flagged when
+# its time, expansions or peak RSS grew by more than the threshold, or its
+# path got more expensive.  The exit status is 1 when something was flagged.
+#
+# The stored baseline was recorded on one machine; record your own with
+# --save before comparing timings.  Expansions and costs do not depend on
+# the machine.
+#
+# > python -m benchmarks.suite
+# > python -m benchmarks.suite --save
+# > python -m benchmarks.suite --families corners,food --threshold 0.2 trickySearch
+
+import contextlib
+import gc
+import io
+import json
+import multiprocessing
+import os
+import random
+import sys
+from optparse import OptionParser
+
+import eightpuzzle
+import layout
+import search
+import searchAgents
+from benchmarks import loadGameState, timeCall, printTable
+from benchmarks.jumpPoint import openLayoutState
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+LAYOUT_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'layouts')
+
+# (search function, heuristic) pairs run on every instance of a family
+SEARCHES = {
+    'position': [('bfs', None), ('astar', 'manhattanHeuristic'), ('jps', 'manhattanHeuristic'),
+                 ('biastar', 'manhattanHeuristic')],
+    'corners': [('bfs', None), ('astar', 'cornersHeuristic')],
+    'food': [('astar', 'foodHeuristic')],
+    'eightpuzzle': [('bfs', None), ('astar', 'eightPuzzleHeuristic'), ('idastar', 'eightPuzzleHeuristic')],
+}
+FAMILIES = ['position', 'corners', 'food', 'eightpuzzle']
+
+GENERATED_SIZES = [50, 100, 200]
+GENERATED_DENSITY = 0.2
+FOOD_LIMIT = 13
+EIGHT_PUZZLE_SEEDS = [0, 1, 2, 3]
+EIGHT_PUZZLE_MOVES = 40
+
+# timings below this many seconds are too noisy to flag
+MIN_SECONDS = 0.005
+
+
+class Case:
+    """
+    One search function on one problem instance; makeProblem builds a fresh
+    problem for every repetition.
+    """
+
+    def __init__(self, family, instance, fn, heuristic, makeProblem):
+        self.family = family
+        self.instance = instance
+        self.fn = fn
+        self.heuristic = heuristic
+        self.makeProblem = makeProblem
+
+    def key(self):
+        return '%s:%s:%s' % (self.family, self.instance, self.fn)
+
+
+def shippedLayouts():
+    return sorted(name[:-4] for name in os.listdir(LAYOUT_DIRECTORY) if name.endswith('.lay'))
+
+
+def reachableCells(lay):
+    """
+    Returns the set of cells Pacman can reach from its start on a layout.
+    """
+    walls = lay.walls
+    start = [position for isPacman, position in lay.agentPositions if isPacman][0]
+    reached, stack = set([start]), [start]
+    while stack:
+        x, y = stack.pop()
+        for nextCell in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if nextCell not in reached and not walls[nextCell[0]][nextCell[1]]:
+                reached.add(nextCell)
+                stack.append(nextCell)
+    return reached
+
+
+def positionProblem(gameState):
+    return lambda: searchAgents.PositionSearchProblem(gameState, warn=False, visualize=False)
+
+
+def eightPuzzleProblem(seed):
+    def makeProblem():
+        random.seed(seed)
+        return eightpuzzle.EightPuzzleSearchProblem(eightpuzzle.createRandomEightPuzzle(EIGHT_PUZZLE_MOVES))
+    return makeProblem
+
+
+def instances(family):
+    """
+    Returns (instance name, makeProblem) pairs for a family.
+    """
+    if family == 'eightpuzzle':
+        return [('seed%d' % seed, eightPuzzleProblem(seed)) for seed in EIGHT_PUZZLE_SEEDS]
+
+    # only layouts where every goal can be reached, so each case is a real
+    # solution rather than an exhausted search
+    pairs = []
+    for layoutName in shippedLayouts():
+        lay = layout.getLayout(layoutName)
+        walls, reachable = lay.walls, reachableCells(lay)
+        corners = [(1, 1), (1, walls.height - 2), (walls.width - 2, 1), (walls.width - 2, walls.height - 2)]
+        if family == 'position' and (1, 1) in reachable:
+            pairs.append((layoutName, positionProblem(loadGameState(layoutName))))
+        elif family == 'corners' and reachable.issuperset(corners):
+            pairs.append((layoutName, lambda gameState=loadGameState(layoutName): searchAgents.CornersProblem(gameState)))
+        elif family == 'food' and 0 < lay.food.count() <= FOOD_LIMIT and reachable.issuperset(lay.food.asList()):
+            pairs.append((layoutName, lambda gameState=loadGameState(layoutName): searchAgents.FoodSearchProblem(gameState)))
+    if family == 'position':
+        for size in GENERATED_SIZES:
+            pairs.append(('open%d' % size, positionProblem(openLayoutState(size, GENERATED_DENSITY))))
+    return pairs
+
+
+def buildCases(families, filters):
+    cases = []
+    for family in families:
+        for instance, makeProblem in instances(family):
+            if filters and not any(name in instance for name in filters):
+                continue
+            for fn, heuristic in SEARCHES[family]:
+                cases.append(Case(family, instance, fn, heuristic, makeProblem))
+    return cases
+
+
+def getHeuristic(name):
+    for module in (searchAgents, eightpuzzle, search):
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise AttributeError(name + ' is not a heuristic')
+
+
+def peakRSS():
+    """
+    Returns the peak resident set size of this process in KB, or None.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def runCase(case, repeat):
+    """
+    Runs a case repeat times and returns its result dictionary.
+    """
+    function = getattr(search, case.fn)
+    args = (getHeuristic(case.heuristic),) if case.heuristic else ()
+    best = None
+    for _ in range(repeat):
+        random.seed(0)
+        # CornersProblem warns about corners without food
+        with contextlib.redirect_stdout(io.StringIO()):
+            problem = case.makeProblem()
+        gc.collect()
+        gc.disable()
+        try:
+            actions, seconds = timeCall(function, problem, *args)
+        finally:
+            gc.enable()
+        best = seconds if best is None else min(best, seconds)
+    return {'cost': problem.getCostOfActions(actions), 'expanded': problem._expanded,
+            'seconds': best, 'peakRSS': peakRSS()}
+
+
+def reportCase(case, repeat, connection):
+    "Process target for runIsolated."
+    try:
+        connection.send(runCase(case, repeat))
+    except Exception as e:
+        connection.send({'error': '%s: %s' % (type(e).__name__, e)})
+    connection.close()
+
+
+def runIsolated(case, repeat):
+    """
+    Runs a case in a forked process, so the peak RSS only covers this case;
+    without fork it runs here and the peak RSS is that of the whole run.
+    """
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return runCase(case, repeat)
+    context = multiprocessing.get_context('fork')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=reportCase, args=(case, repeat, sender))
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = {'error': 'exit code %s' % process.exitcode}
+    process.join()
+    return result
+
+
+def regressions(result, baseline, threshold):
+    """
+    Returns the names of the metrics that got worse than baseline by more
+    than threshold (a fraction), plus 'cost' when the path got longer.
+    """
+    flags = []
+    if result['cost'] > baseline['cost']:
+        flags.append('cost')
+    for metric in ('seconds', 'expanded', 'peakRSS'):
+        old, new = baseline.get(metric), result.get(metric)
+        if not old or new is None:
+            continue
+        if metric == 'seconds' and max(old, new) < MIN_SECONDS:
+            continue
+        if new > old * (1 + threshold):
+            flags.append(metric)
+    return flags
+
+
+def change(result, baseline, metric):
+    if not baseline or not baseline.get(metric) or result.get(metric) is None:
+        return '-'
+    return '%+.1f%%' % (100.0 * (result[metric] - baseline[metric]) / baseline[metric])
+
+
+def runSuite(cases, repeat, baselinePath, threshold, save):
+    baselines = {}
+    if os.path.exists(baselinePath):
+        with open(baselinePath) as f:
+            baselines = json.load(f)['cases']
+
+    results, rows, flagged = {}, [], 0
+    for case in cases:
+        result = runIsolated(case, repeat)
+        if 'error' in result:
+            rows.append([case.family, case.instance, case.fn, '-', '-', '-', '-', '-', '-', result['error']])
+            flagged += 1
+            continue
+        results[case.key()] = result
+        baseline = baselines.get(case.key())
+        flags = regressions(result, baseline, threshold) if baseline else ['new']
+        if baseline and flags:
+            flagged += 1
+        rows.append([case.family, case.instance, case.fn, result['cost'], result['expanded'],
+                     '%.4f' % result['seconds'], result['peakRSS'], change(result, baseline, 'seconds'),
+                     change(result, baseline, 'expanded'), ' '.join(flags)])
+    printTable(['family', 'instance', 'fn', 'cost', 'expanded', 'seconds', 'rss KB', 'time',
+                'expansions', 'flags'], rows)
+
+    if save:
+        baselines.update(results)
+        with open(baselinePath, 'w') as f:
+            json.dump({'repeat': repeat, 'cases': baselines}, f, indent=1, sort_keys=True)
+            f.write('\n')
+        print('Saved %d results to %s' % (len(results), baselinePath))
+    print('%d of %d cases flagged (threshold %.0f%%)' % (flagged, len(cases), 100 * threshold))
+    return flagged
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.suite [options] [instance filters]')
+    parser.add_option('--families', dest='families', default=','.join(FAMILIES),
+                      help='Comma separated problem families [Default: %default]')
+    parser.add_option('--repeat', dest='repeat', type='int', default=5,
+                      help='Runs per case; the fastest is kept [Default: %default]')
+    parser.add_option('--baseline', dest='baseline', default=BASELINE_PATH,
+                      help='Baseline JSON to compare with [Default: benchmarks/baseline.json]')
+    parser.add_option('--threshold', dest='threshold', type='float', default=0.2,
+                      help='Relative growth flagged as a regression [Default: %default]')
+    parser.add_option('--save', dest='save', action='store_true', default=False,
+                      help='Store the results in the baseline JSON')
+    options, filters = parser.parse_args(sys.argv[1:])
+    cases = buildCases(options.families.split(','), filters)
+    flagged = runSuite(cases, options.repeat, options.baseline, options.threshold, options.save)
+    sys.exit(1 if flagged and not options.save else 0)
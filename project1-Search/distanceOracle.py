@@ -0,0 +1,154 @@
+# distanceOracle.py
+# -----------------
+# All-pairs maze distances for a Layout, computed once and cached on disk.
+
+
+"""
+A DistanceOracle answers maze distance queries between any two open cells of a
+layout in O(1).  It runs one breadth first search from every open cell and
+stores the results in a flat array indexed by cell id:
+
+    distances[cellId(p) * numCells + cellId(q)]
+
+Oracles are shared between every Layout with the same layoutText, and the
+distance table is written to CACHE_DIRECTORY keyed by a hash of the layout
+text so later runs map the file with mmap instead of rebuilding it.
+
+Example usage:
+    oracle = getDistanceOracle(gameState.data.layout)
+    oracle.distance((1, 1), (5, 6))
+"""
+
+import array
+import hashlib
+import mmap
+import os
+
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.distanceCache')
+
+# In-process oracles keyed by layout hash, like layout.VISIBILITY_MATRIX_CACHE
+DISTANCE_ORACLE_CACHE = {}
+
+
+def layoutHash(layout):
+    """
+    Returns a stable hex digest of the layout text, used as cache key.
+    """
+    return hashlib.sha1('\n'.join(layout.layoutText).encode('utf-8')).hexdigest()
+
+
+def getDistanceOracle(layout, useDiskCache=True):
+    """
+    Returns the DistanceOracle for a layout, building it at most once per
+    layout text and process.
+    """
+    oracle = getattr(layout, '_distanceOracle', None)
+    if oracle is None:
+        key = layoutHash(layout)
+        if key not in DISTANCE_ORACLE_CACHE:
+            DISTANCE_ORACLE_CACHE[key] = DistanceOracle(layout.getSuccessorTable(), key, useDiskCache)
+        oracle = DISTANCE_ORACLE_CACHE[key]
+        layout._distanceOracle = oracle
+    return oracle
+
+
+class DistanceOracle:
+    """
+    Exact maze distances between every pair of open cells of a layout.
+
+    successorTable: the layout's layout.SuccessorTable, which numbers the open
+                    cells and lists the moves out of each of them.
+
+    Unreachable pairs are stored as UNREACHABLE and reported as float('inf').
+    """
+
+    def __init__(self, successorTable, key=None, useDiskCache=True):
+        self.successorTable = successorTable
+        self.cellPositions = successorTable.cellPositions
+        self.cellIds = successorTable.cellIds
+        self.numCells = successorTable.numCells
+
+        # two bytes per pair is enough unless the maze has 65535 open cells
+        self.typecode = 'H' if self.numCells < 0xFFFF else 'I'
+        self.UNREACHABLE = 0xFFFF if self.typecode == 'H' else 0xFFFFFFFF
+
+        self.path = None
+        if key is not None and useDiskCache:
+            self.path = os.path.join(CACHE_DIRECTORY, '%s.%s.dist' % (key, self.typecode))
+
+        self.distances = self._load()
+        if self.distances is None:
+            self.distances = self._build()
+            self._save()
+
+    def distance(self, position1, position2):
+        """
+        Returns the maze distance between two open positions.
+        """
+        cellIds = self.cellIds
+        value = self.distances[cellIds[position1] * self.numCells + cellIds[position2]]
+        if value == self.UNREACHABLE:
+            return float('inf')
+        return value
+
+    def distancesFrom(self, position):
+        """
+        Returns the row of distances from position to every cell id.
+        """
+        start = self.cellIds[position] * self.numCells
+        return self.distances[start:start + self.numCells]
+
+    def _build(self):
+        """
+        Runs a breadth first search from every open cell.
+        """
+        numCells = self.numCells
+        table = self.successorTable
+        neighbors = [table.getNeighborCells(cell) for cell in range(numCells)]
+        distances = array.array(self.typecode, [self.UNREACHABLE]) * (numCells * numCells)
+
+        for source in range(numCells):
+            row = source * numCells
+            distances[row + source] = 0
+            frontier = [source]
+            depth = 0
+            while frontier:
+                depth += 1
+                nextFrontier = []
+                for cell in frontier:
+                    for neighbor in neighbors[cell]:
+                        if distances[row + neighbor] == self.UNREACHABLE:
+                            distances[row + neighbor] = depth
+                            nextFrontier.append(neighbor)
+                frontier = nextFrontier
+        return distances
+
+    def _load(self):
+        """
+        Maps a previously saved table, or returns None if there is none.
+        """
+        if self.path is None or self.numCells == 0 or not os.path.exists(self.path):
+            return None
+        itemSize = array.array(self.typecode).itemsize
+        with open(self.path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size != self.numCells * self.numCells * itemSize:
+                return None
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap).cast(self.typecode)
+
+    def _save(self):
+        """
+        Writes the table to the cache directory.  The cache is only an
+        optimization, so failing to write it is not an error.
+        """
+        if self.path is None or self.numCells == 0:
+            return
+        try:
+            if not os.path.isdir(CACHE_DIRECTORY):
+                os.makedirs(CACHE_DIRECTORY)
+            temporaryPath = '%s.%d.tmp' % (self.path, os.getpid())
+            with open(temporaryPath, 'wb') as f:
+                self.distances.tofile(f)
+            os.replace(temporaryPath, self.path)
+        except OSError:
+            pass
@@ -194,9 +194,12 @@ class EightPuzzleSearchProblem(search.SearchProblem):
     def __init__(self,puzzle):
         "Creates a new EightPuzzleSearchProblem which stores search information."
         self.puzzle = puzzle
+        # the solved puzzle, where bidirectional search starts its backward half
+        self.goal = EightPuzzleState([0, 1, 2, 3, 4, 5, 6, 7, 8])
+        self._expanded = 0
 
     def getStartState(self):
-        return puzzle
+        return self.puzzle
 
     def isGoalState(self,state):
         return state.isGoal()
@@ -210,6 +213,7 @@ class EightPuzzleSearchProblem(search.SearchProblem):
         succ = []
         for a in state.legalMoves():
             succ.append((state.result(a), a, 1))
+        self._expanded += 1
         return succ
 
     def getCostOfActions(self, actions):
@@ -221,6 +225,20 @@ class EightPuzzleSearchProblem(search.SearchProblem):
         """
         return len(actions)
 
+def eightPuzzleHeuristic(state, problem=None):
+    """
+      Returns the sum of the Manhattan distances of every tile from its
+    place in the solved puzzle.  Each move slides one tile by one cell, so
+    this never overestimates the number of moves left.
+    """
+    distance = 0
+    for row in range( 3 ):
+        for col in range( 3 ):
+            tile = state.cells[row][col]
+            if tile != 0:
+                distance += abs(row - tile // 3) + abs(col - tile % 3)
+    return distance
+
 EIGHT_PUZZLE_DATA = [[1, 0, 2, 3, 4, 5, 6, 7, 8],
                      [1, 7, 8, 2, 3, 4, 5, 6, 0],
                      [4, 3, 2, 7, 0, 5, 1, 6, 8],
@@ -0,0 +1,146 @@
+# foodHeuristics.py
+# -----------------
+# Heuristics for FoodSearchProblem built on exact maze distances.
+
+
+"""
+mstFoodHeuristic estimates the cost of eating every remaining pellet as
+
+    (maze distance to the nearest pellet) + (weight of a minimum spanning tree
+                                             over the pellets)
+
+where the spanning tree uses maze distances from the layout's
+distanceOracle.DistanceOracle.  Any path that eats every pellet first walks
+to some pellet and then links all of them, and linking them costs at least
+the spanning tree, so the heuristic is admissible.  It is also consistent:
+a step changes the nearest distance by at most one, and eating a pellet
+lowers the tree weight by at most the distance from that pellet to the rest.
+
+The spanning tree only depends on the remaining food, and many states share
+the same food set (every position Pacman can reach without eating), so the
+tree weights are memoized in problem.heuristicInfo keyed by the food bitmask
+with least recently used eviction.
+
+Example usage:
+    python pacman.py -l bigSearch -p SearchAgent -a fn=astar,prob=FoodSearchProblem,heuristic=mstFoodHeuristic
+"""
+
+import collections
+
+import distanceOracle
+
+# Most food sets whose spanning tree weight is kept per problem
+MST_CACHE_SIZE = 200000
+
+
+def mstFoodHeuristic(state, problem):
+    """
+    Nearest pellet distance plus the minimum spanning tree weight of the
+    remaining pellets.
+
+    state:   (pacmanPosition, food) where food is a FoodBitset or a game.Grid
+    problem: a FoodSearchProblem; its heuristicInfo holds the oracle and the
+             spanning tree cache, see getMSTCache
+    """
+    position, food = state
+    info = problem.heuristicInfo
+    if 'distanceOracle' not in info:
+        info['distanceOracle'] = distanceOracle.getDistanceOracle(problem.startingGameState.data.layout)
+    oracle = info['distanceOracle']
+
+    foodBits = getFoodBits(food, oracle.cellIds)
+    if foodBits == 0:
+        return 0
+    cells = bitsToCells(foodBits)
+
+    distances, numCells = oracle.distances, oracle.numCells
+    row = oracle.cellIds[position] * numCells
+    nearest = min(distances[row + cell] for cell in cells)
+    if nearest == oracle.UNREACHABLE:
+        return float('inf')
+    return nearest + spanningTreeWeight(foodBits, cells, oracle, problem)
+
+
+def getFoodBits(food, cellIds):
+    """
+    Returns the food as an int bitmask over cell ids.
+    """
+    if hasattr(food, 'bits'):
+        return food.bits
+    foodBits = 0
+    for position in food.asList():
+        foodBits |= 1 << cellIds[position]
+    return foodBits
+
+
+def bitsToCells(bits):
+    """
+    Returns the cell ids of the set bits, lowest first.
+    """
+    cells = []
+    while bits:
+        lowest = bits & -bits
+        cells.append(lowest.bit_length() - 1)
+        bits ^= lowest
+    return cells
+
+
+def getMSTCache(problem):
+    """
+    Returns the spanning tree cache stored in problem.heuristicInfo, creating
+    it on first use.  It is an OrderedDict from food bitmask to tree weight,
+    ordered from least to most recently used.  heuristicInfo also counts
+    'mstCacheHits' and 'mstCacheMisses'.
+    """
+    info = problem.heuristicInfo
+    if 'mstCache' not in info:
+        info['mstCache'] = collections.OrderedDict()
+        info['mstCacheHits'] = 0
+        info['mstCacheMisses'] = 0
+    return info['mstCache']
+
+
+def spanningTreeWeight(foodBits, cells, oracle, problem):
+    """
+    Returns the weight of a minimum spanning tree over cells (the set bits of
+    foodBits) under maze distance, memoized in the problem's cache.
+    """
+    cache = getMSTCache(problem)
+    info = problem.heuristicInfo
+    if foodBits in cache:
+        cache.move_to_end(foodBits)
+        info['mstCacheHits'] += 1
+        return cache[foodBits]
+    info['mstCacheMisses'] += 1
+
+    weight = primWeight(cells, oracle)
+    cache[foodBits] = weight
+    if len(cache) > MST_CACHE_SIZE:
+        cache.popitem(last=False)
+    return weight
+
+
+def primWeight(cells, oracle):
+    """
+    Prim's algorithm on the complete graph over cells, O(len(cells) ** 2).
+    """
+    distances, numCells, unreachable = oracle.distances, oracle.numCells, oracle.UNREACHABLE
+    remaining = cells[1:]
+    row = cells[0] * numCells
+    # cheapest known edge from the tree to every remaining cell
+    links = [distances[row + cell] for cell in remaining]
+    weight = 0
+    while remaining:
+        closest = min(range(len(links)), key=links.__getitem__)
+        if links[closest] == unreachable:
+            return float('inf')
+        weight += links[closest]
+        row = remaining[closest] * numCells
+        remaining[closest], links[closest] = remaining[-1], links[-1]
+        remaining.pop()
+        links.pop()
+        for i, cell in enumerate(remaining):
+            distance = distances[row + cell]
+            if distance < links[i]:
+                links[i] = distance
+    return weight
@@ -0,0 +1,152 @@
+# landmarks.py
+# ------------
+# ALT (A*, landmarks, triangle inequality) heuristics for position problems.
+
+
+"""
+A LandmarkTable holds the exact maze distances from k landmark cells to every
+open cell of a walls grid.  For any landmark L the triangle inequality gives
+
+    d(v, t) >= |d(L, t) - d(L, v)|
+
+so the largest of these differences over all landmarks is an admissible and
+consistent estimate of the maze distance from v to the goal t, and usually a
+much tighter one than the Manhattan distance in a maze.
+
+Landmarks are picked by farthest point selection: each new landmark is the
+cell farthest from all landmarks chosen so far (the first is the cell
+farthest from an arbitrary cell), which spreads them over the edges of the
+map where they bound the most paths.  A cell that cannot reach any landmark
+yet is infinitely far, so every separate region of the map gets a landmark
+before any region gets a second one.
+
+Distances are stored as one array per landmark, two bytes per cell unless
+the map has 65535 open cells.  Tables are built from the layout's shared
+SuccessorTable and kept in LANDMARK_TABLE_CACHE keyed by the layout text and
+k, like layout.SUCCESSOR_TABLE_CACHE, so every problem on the same map shares
+them.
+
+Example usage:
+    python pacman.py -l bigMaze -p SearchAgent -a fn=astar,heuristic=landmarkHeuristic -z .5
+"""
+
+import array
+
+# Landmarks per table when the caller does not say
+LANDMARK_COUNT = 8
+
+# In-process tables keyed by (layout text, k), like layout.SUCCESSOR_TABLE_CACHE
+LANDMARK_TABLE_CACHE = {}
+
+
+def getLandmarkTable(layout, k=LANDMARK_COUNT):
+    """
+    Returns the LandmarkTable with k landmarks for a layout, building it at
+    most once per layout text and process.
+    """
+    key = ('\n'.join(layout.layoutText), k)
+    if key not in LANDMARK_TABLE_CACHE:
+        LANDMARK_TABLE_CACHE[key] = LandmarkTable(layout.getSuccessorTable(), k)
+    return LANDMARK_TABLE_CACHE[key]
+
+
+class LandmarkTable:
+    """
+    Maze distances from k landmarks to every open cell.
+
+    successorTable: a layout.SuccessorTable, which numbers the open cells
+    k:              the number of landmarks (fewer if there are fewer cells)
+
+    landmarks[i] is the cell id of the i-th landmark and distances[i][c] the
+    distance from it to cell c, or UNREACHABLE.
+    """
+
+    def __init__(self, successorTable, k=LANDMARK_COUNT):
+        self.cellIds = successorTable.cellIds
+        self.cellPositions = successorTable.cellPositions
+        self.numCells = successorTable.numCells
+        self.typecode = 'H' if self.numCells < 0xFFFF else 'I'
+        self.UNREACHABLE = 0xFFFF if self.typecode == 'H' else 0xFFFFFFFF
+
+        neighbors = [successorTable.getNeighborCells(cell) for cell in range(self.numCells)]
+        self.landmarks, self.distances = [], []
+        if self.numCells == 0:
+            return
+        # distance from each cell to the closest landmark so far
+        closest = self._distancesFrom(neighbors, 0)
+        for _ in range(min(k, self.numCells)):
+            landmark = max(range(self.numCells), key=closest.__getitem__)
+            if self.landmarks and closest[landmark] == 0:
+                break  # every cell already is a landmark
+            row = self._distancesFrom(neighbors, landmark)
+            self.landmarks.append(landmark)
+            self.distances.append(row)
+            closest = array.array(self.typecode, map(min, closest, row))
+
+    def _distancesFrom(self, neighbors, source):
+        """
+        Breadth first search from the cell id source.
+        """
+        unreachable = self.UNREACHABLE
+        distances = array.array(self.typecode, [unreachable]) * self.numCells
+        distances[source] = 0
+        frontier = [source]
+        depth = 0
+        while frontier:
+            depth += 1
+            nextFrontier = []
+            for cell in frontier:
+                for neighbor in neighbors[cell]:
+                    if distances[neighbor] == unreachable:
+                        distances[neighbor] = depth
+                        nextFrontier.append(neighbor)
+            frontier = nextFrontier
+        return distances
+
+    def goalDistances(self, goal):
+        """
+        Returns (distances row, distance to goal) pairs for the landmarks that
+        can reach goal; the others say nothing about paths to it.
+        """
+        goalCell = self.cellIds[goal]
+        return [(row, row[goalCell]) for row in self.distances if row[goalCell] != self.UNREACHABLE]
+
+    def lowerBound(self, position, goalDistances):
+        """
+        Returns the triangle inequality bound on the maze distance from
+        position to the goal of goalDistances, or inf if it cannot reach it.
+        """
+        cell = self.cellIds[position]
+        bound = 0
+        for row, goalDistance in goalDistances:
+            distance = row[cell]
+            if distance == self.UNREACHABLE:
+                return float('inf')
+            if distance > goalDistance:
+                distance, goalDistance = goalDistance, distance
+            if goalDistance - distance > bound:
+                bound = goalDistance - distance
+        return bound
+
+
+def landmarkHeuristic(position, problem, k=LANDMARK_COUNT):
+    """
+    ALT heuristic for PositionSearchProblem and any problem whose states are
+    positions and that has a layout and a single goal.
+
+    The bound counts moves; when problem has a costFn whose cheapest step
+    costs less than 1 the bound is scaled by that cost to stay admissible.
+    The table, goal distances and step cost are kept on the problem in
+    _landmarkInfo, keyed by the goal so a ReverseSearchProblem, which reads
+    attributes through to its problem, recomputes its own.
+    """
+    info = getattr(problem, '_landmarkInfo', None)
+    if info is None or info[0] != (problem.goal, k):
+        table = getLandmarkTable(problem.layout, k)
+        stepCost = 1
+        if hasattr(problem, 'costFn'):
+            stepCost = min([problem.costFn(cell) for cell in table.cellPositions] + [1])
+        info = ((problem.goal, k), table, table.goalDistances(problem.goal), stepCost)
+        problem._landmarkInfo = info
+    key, table, goalDistances, stepCost = info
+    return table.lowerBound(position, goalDistances) * stepCost
@@ -14,11 +14,15 @@
 
 from util import manhattanDistance
 from game import Grid
+from game import Directions
 import os
 import random
+import array
 from functools import reduce
 
 VISIBILITY_MATRIX_CACHE = {}
+SUCCESSOR_TABLE_CACHE = {}
+CORRIDOR_GRAPH_CACHE = {}
 
 class Layout:
     """
@@ -36,6 +40,8 @@ class Layout:
         self.processLayoutText(layoutText)
         self.layoutText = layoutText
         self.totalFood = len(self.food.asList())
+        self.successorTable = None
+        self.corridorGraph = None
         # self.initializeVisibilityMatrix()
 
     def getNumGhosts(self):
@@ -62,6 +68,30 @@ class Layout:
         else:
             self.visibility = VISIBILITY_MATRIX_CACHE[reduce(str.__add__, self.layoutText)]
 
+    def getSuccessorTable(self):
+        """
+        Returns the SuccessorTable of this layout's walls.  It is built the
+        first time it is needed and shared by every layout with the same text.
+        """
+        if getattr(self, 'successorTable', None) is None:
+            key = '\n'.join(self.layoutText)
+            if key not in SUCCESSOR_TABLE_CACHE:
+                SUCCESSOR_TABLE_CACHE[key] = SuccessorTable(self.walls)
+            self.successorTable = SUCCESSOR_TABLE_CACHE[key]
+        return self.successorTable
+
+    def getCorridorGraph(self):
+        """
+        Returns the CorridorGraph of this layout, built the first time it is
+        needed and shared by every layout with the same text.
+        """
+        if getattr(self, 'corridorGraph', None) is None:
+            key = '\n'.join(self.layoutText)
+            if key not in CORRIDOR_GRAPH_CACHE:
+                CORRIDOR_GRAPH_CACHE[key] = CorridorGraph(self.getSuccessorTable())
+            self.corridorGraph = CORRIDOR_GRAPH_CACHE[key]
+        return self.corridorGraph
+
     def isWall(self, pos):
         x, col = pos
         return self.walls[x][col]
@@ -129,6 +159,119 @@ class Layout:
         elif layoutChar in  ['1', '2', '3', '4']:
             self.agentPositions.append( (int(layoutChar), (x,y)))
             self.numGhosts += 1
+
+class SuccessorTable:
+    """
+    The legal moves out of every open cell of a walls Grid, computed once.
+
+    Open cells are numbered column by column (the x-major order Grid stores its
+    data in): cellPositions maps a cell id to its (x, y) position and cellIds
+    maps a position back to its id.  The moves are stored as flat arrays in
+    compressed-row form: the moves out of cell c are the entries
+    offsets[c] <= i < offsets[c + 1] of neighborCells (the id of the cell the
+    move leads to) and actionCodes (an index into ACTIONS).  Moves are listed in
+    the North, South, East, West order the search problems expand them in.
+
+    byPosition maps every open position to a tuple of (nextPosition, action)
+    pairs, which is what search problems need to answer getSuccessors.
+    """
+    ACTIONS = (Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST)
+    VECTORS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+    def __init__(self, walls):
+        width, height = walls.width, walls.height
+        self.cellPositions = [(x, y) for x in range(width) for y in range(height) if not walls[x][y]]
+        self.cellIds = dict((position, cellId) for cellId, position in enumerate(self.cellPositions))
+        self.numCells = len(self.cellPositions)
+
+        self.offsets = array.array('i', [0])
+        self.neighborCells = array.array('i')
+        self.actionCodes = array.array('b')
+        self.byPosition = {}
+        for x, y in self.cellPositions:
+            moves = []
+            for code, (dx, dy) in enumerate(self.VECTORS):
+                nextPosition = (x + dx, y + dy)
+                if nextPosition in self.cellIds:
+                    self.neighborCells.append(self.cellIds[nextPosition])
+                    self.actionCodes.append(code)
+                    moves.append((nextPosition, self.ACTIONS[code]))
+            self.offsets.append(len(self.neighborCells))
+            self.byPosition[(x, y)] = tuple(moves)
+
+    def getNeighborCells(self, cellId):
+        """
+        Returns the ids of the cells reachable in one move from cellId.
+        """
+        return self.neighborCells[self.offsets[cellId]:self.offsets[cellId + 1]]
+
+    def getMoves(self, cellId):
+        """
+        Returns a list of (neighborCell, action) pairs for cellId.
+        """
+        return [(self.neighborCells[i], self.ACTIONS[self.actionCodes[i]])
+                for i in range(self.offsets[cellId], self.offsets[cellId + 1])]
+
+
+class CorridorGraph:
+    """
+    The maze as a weighted graph whose vertices are its junctions and dead
+    ends, and whose edges are the one-wide corridor runs between them.
+
+    Every open cell with other than two neighbors is a node.  A loop made only
+    of corridor cells gets one of its cells as a node so it is not lost.
+
+    edges maps every node position to a list of (nextNode, actions, cells)
+    triples, one per move out of the node: actions is the tuple of primitive
+    moves along the corridor and cells the tuple of positions entered, ending
+    with nextNode.  Each corridor is listed once from each of its ends.
+    """
+
+    def __init__(self, successorTable):
+        self.successorTable = successorTable
+        moves = successorTable.byPosition
+        self.nodes = set(position for position in successorTable.cellPositions if len(moves[position]) != 2)
+        self.edges = {}
+
+        visited = set()
+        for node in list(self.nodes):
+            self._addEdges(node, visited)
+        # corridor cells not reached from any node form loops without junctions
+        for position in successorTable.cellPositions:
+            if position not in visited and position not in self.nodes:
+                self.nodes.add(position)
+                self._addEdges(position, visited)
+
+    def isNode(self, position):
+        return position in self.nodes
+
+    def walk(self, position, nextPosition, action, isStop):
+        """
+        Follows the corridor that starts with the move from position to
+        nextPosition until it reaches a node or a cell for which isStop is
+        True.  Returns (lastPosition, actions, cells).
+        """
+        moves = self.successorTable.byPosition
+        previous, current = position, nextPosition
+        actions, cells = [action], [nextPosition]
+        while current not in self.nodes and not isStop(current):
+            for following, followingAction in moves[current]:
+                if following != previous:
+                    break
+            previous, current = current, following
+            actions.append(followingAction)
+            cells.append(current)
+        return current, tuple(actions), tuple(cells)
+
+    def _addEdges(self, node, visited):
+        edges = []
+        for nextPosition, action in self.successorTable.byPosition[node]:
+            edge = self.walk(node, nextPosition, action, lambda position: False)
+            visited.update(edge[2])
+            edges.append(edge)
+        self.edges[node] = edges
+
+
 def getLayout(name, back = 2):
     if name.endswith('.lay'):
         layout = tryToLoad('layouts/' + name)
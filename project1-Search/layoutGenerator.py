@@ -0,0 +1,312 @@
+# layoutGenerator.py
+# ------------------
+# Procedurally generated layouts of any size, for scaling tests.
+
+
+"""
+Generates layouts of four kinds:
+
+    maze      a perfect maze (exactly one path between any two cells), carved
+              by a randomized depth first search on the odd coordinates
+    braided   a perfect maze where a fraction (braid) of the dead ends are
+              opened into a neighbouring corridor, which adds loops
+    room      an open room with randomly placed wall cells (density)
+    arena     a food-dense arena with pillars on a regular grid, random walls
+              mirrored left to right like the classic layouts, and by default
+              a pellet on every open cell
+
+Every open cell can be reached from (1, 1), which is always open, so
+PositionSearchProblem's default goal is valid on any generated layout.  When
+random walls cut (1, 1) off, a corridor is opened from it to the largest open
+region, and whatever is not connected to (1, 1) then becomes wall.
+Mazes put Pacman in the top right cell and, unless a number of pellets is
+given, a single pellet at (1, 1) like the shipped mazes; rooms and arenas put
+Pacman on a random cell.  Ghosts, capsules and pellets go on random open
+cells, all distinct.
+
+The grid is a bytearray indexed by y * width + x holding the layout
+characters themselves, so the .lay text is built by slicing rows out of it.
+The same seed always gives the same layout, and a 1000x1000 layout of any
+kind takes one to two seconds, plus under a second to build its Layout.
+
+Example usage:
+    lay = generateLayout('braided', 201, 101, seed=3, ghosts=2)
+    python layoutGenerator.py maze 1001 1001 --seed 7 > layouts/hugeMaze.lay
+    python pacman.py -l layouts/hugeMaze.lay -p SearchAgent -a fn=astar,heuristic=manhattanHeuristic -q
+"""
+
+import random
+import sys
+from optparse import OptionParser
+
+import layout
+
+WALL, EMPTY, FOOD, CAPSULE, PACMAN, GHOST = [ord(c) for c in '% .oPG']
+
+
+def perfectMaze(width, height, rng):
+    """
+    Carves a perfect maze with an iterative randomized depth first search.
+    Cells are the open squares at odd (x, y); carving a passage opens the
+    square between two cells.  Returns (grid, Pacman position).
+    """
+    grid = bytearray([WALL]) * (width * height)
+    cellsWide, cellsHigh = (width - 1) // 2, (height - 1) // 2
+    if cellsWide < 1 or cellsHigh < 1:
+        raise ValueError('A maze needs a width and height of at least 3')
+    visited = bytearray(cellsWide * cellsHigh)
+    # neighbour steps in cell coordinates, and the matching step in the grid
+    steps = [(1, 0, 1), (-1, 0, -1), (0, 1, width), (0, -1, -width)]
+
+    visited[0] = 1
+    grid[width + 1] = EMPTY
+    stack = [(0, 0)]
+    while stack:
+        cx, cy = stack[-1]
+        options = [(dx, dy, offset) for dx, dy, offset in steps
+                   if 0 <= cx + dx < cellsWide and 0 <= cy + dy < cellsHigh and
+                   not visited[(cy + dy) * cellsWide + cx + dx]]
+        if not options:
+            stack.pop()
+            continue
+        dx, dy, offset = options[int(rng.random() * len(options))]
+        nx, ny = cx + dx, cy + dy
+        visited[ny * cellsWide + nx] = 1
+        index = (2 * cy + 1) * width + 2 * cx + 1
+        grid[index + offset] = EMPTY
+        grid[index + 2 * offset] = EMPTY
+        stack.append((nx, ny))
+    return grid, (2 * cellsWide - 1, 2 * cellsHigh - 1)
+
+
+def braidedMaze(width, height, rng, braid=0.5):
+    """
+    A perfect maze where each dead end is, with probability braid, joined to
+    a neighbouring cell it has no passage to.  Returns (grid, Pacman position).
+    """
+    grid, pacman = perfectMaze(width, height, rng)
+    maxX, maxY = pacman
+    for y in range(1, maxY + 1, 2):
+        for x in range(1, maxX + 1, 2):
+            index = y * width + x
+            # passages towards the neighbouring cells that exist
+            offsets = [dy * width + dx for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                       if 1 <= x + 2 * dx <= maxX and 1 <= y + 2 * dy <= maxY]
+            closed = [offset for offset in offsets if grid[index + offset] == WALL]
+            if len(closed) == len(offsets) - 1 and closed and rng.random() < braid:
+                grid[index + closed[int(rng.random() * len(closed))]] = EMPTY
+    return grid, pacman
+
+
+def openRoom(width, height, rng, density=0.2):
+    """
+    A room with walls on the border and on a random density fraction of the
+    inner cells.  Returns (grid, None).
+    """
+    grid = bytearray([WALL]) * (width * height)
+    for y in range(1, height - 1):
+        row = y * width
+        for x in range(1, width - 1):
+            if rng.random() >= density:
+                grid[row + x] = EMPTY
+    return grid, None
+
+
+def arena(width, height, rng, density=0.05):
+    """
+    An arena with a pillar at every third cell in both directions and random
+    walls (density) mirrored between the left and right halves.  Returns
+    (grid, None).
+    """
+    grid = bytearray([WALL]) * (width * height)
+    for y in range(1, height - 1):
+        row = y * width
+        for x in range(1, (width + 1) // 2):
+            if (x % 3 == 0 and y % 3 == 0) or rng.random() < density:
+                continue
+            grid[row + x] = EMPTY
+            grid[row + width - 1 - x] = EMPTY
+    return grid, None
+
+
+# kind -> (builder, default food); None means a single pellet at (1, 1)
+KINDS = {
+    'maze': (perfectMaze, None),
+    'braided': (braidedMaze, None),
+    'room': (openRoom, None),
+    'arena': (arena, 'all'),
+}
+
+
+def floodFill(grid, width, start, reached):
+    """
+    Marks the open cells connected to start in reached and returns them.
+    """
+    reached[start] = 1
+    stack, cells = [start], []
+    while stack:
+        index = stack.pop()
+        cells.append(index)
+        for nextIndex in (index + 1, index - 1, index + width, index - width):
+            if not reached[nextIndex] and grid[nextIndex] != WALL:
+                reached[nextIndex] = 1
+                stack.append(nextIndex)
+    return cells
+
+
+def largestRegion(grid, width, height):
+    """
+    Returns the cells of the largest set of connected open cells.
+    """
+    reached = bytearray(width * height)
+    largest = []
+    for index in range(width * height):
+        if grid[index] != WALL and not reached[index]:
+            cells = floodFill(grid, width, index, reached)
+            if len(cells) > len(largest):
+                largest = cells
+    return largest
+
+
+def joinHome(grid, width, height, home):
+    """
+    Makes sure home lies in the largest open region, so that keepReachable
+    keeps most of the layout: when the cells around home are walls, the
+    shortest run of inner cells from home to that region is opened.
+    """
+    homeCells = floodFill(grid, width, home, bytearray(width * height))
+    openCount = width * height - grid.count(WALL)
+    if 2 * len(homeCells) >= openCount:
+        return  # no other region can be larger
+    region = set(largestRegion(grid, width, height))
+    if home in region:
+        return
+    # breadth first search from home through inner cells, walls or not
+    parents = {home: None}
+    frontier = [home]
+    while frontier:
+        nextFrontier = []
+        for index in frontier:
+            if index in region:
+                while index is not None:
+                    if grid[index] == WALL:
+                        grid[index] = EMPTY
+                    index = parents[index]
+                return
+            for nextIndex in (index + 1, index - 1, index + width, index - width):
+                x, y = nextIndex % width, nextIndex // width
+                if nextIndex not in parents and 0 < x < width - 1 and 0 < y < height - 1:
+                    parents[nextIndex] = index
+                    nextFrontier.append(nextIndex)
+        frontier = nextFrontier
+
+
+def keepReachable(grid, width, height, start):
+    """
+    Turns every open cell that cannot be reached from start into a wall and
+    returns the reachable cell indices.
+    """
+    reached = bytearray(width * height)
+    cells = floodFill(grid, width, start, reached)
+    for index in range(width * height):
+        if grid[index] != WALL and not reached[index]:
+            grid[index] = WALL
+    return cells
+
+
+def generateLayoutText(kind, width, height, seed=0, food=None, capsules=0, ghosts=0, **options):
+    """
+    Returns the .lay text, as a list of rows from top to bottom, of a
+    generated layout.
+
+    kind:     'maze', 'braided', 'room' or 'arena'
+    food:     number of pellets, 'all' for every free cell, or None for the
+              default of the kind
+    options:  passed to the builder, e.g. braid=0.3 or density=0.1
+    """
+    if kind not in KINDS:
+        raise ValueError('Unknown layout kind %s, expected one of %s' % (kind, ', '.join(sorted(KINDS))))
+    if width < 3 or height < 3:
+        raise ValueError('A layout needs a width and height of at least 3')
+    builder, defaultFood = KINDS[kind]
+    rng = random.Random(seed)
+    grid, pacman = builder(width, height, rng, **options)
+
+    home = width + 1  # (1, 1)
+    grid[home] = EMPTY
+    joinHome(grid, width, height, home)
+    cells = keepReachable(grid, width, height, home)
+
+    # cells with a fixed content: Pacman in a maze and the default pellet
+    fixed = {}
+    if pacman is not None:
+        fixed[pacman[1] * width + pacman[0]] = PACMAN
+    if food is None:
+        food = defaultFood
+    if food is None:
+        food = 0
+        fixed.setdefault(home, FOOD)
+
+    contents = [GHOST] * ghosts + [CAPSULE] * capsules
+    if pacman is None:
+        contents.insert(0, PACMAN)
+    free = [index for index in cells if index not in fixed]
+    if len(contents) > len(free):
+        raise ValueError('The layout has room for only %d agents and capsules' % len(free))
+    if food != 'all':
+        contents += [FOOD] * min(food, len(free) - len(contents))
+    for index, content in zip(rng.sample(free, len(contents)), contents):
+        grid[index] = content
+    for index, content in fixed.items():
+        grid[index] = content
+    if food == 'all':
+        for index in cells:
+            if grid[index] == EMPTY:
+                grid[index] = FOOD
+
+    return [grid[y * width:(y + 1) * width].decode('ascii') for y in range(height - 1, -1, -1)]
+
+
+def generateLayout(kind, width, height, seed=0, food=None, capsules=0, ghosts=0, **options):
+    """
+    Returns a generated layout.Layout; see generateLayoutText.
+    """
+    return layout.Layout(generateLayoutText(kind, width, height, seed, food, capsules, ghosts, **options))
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python layoutGenerator.py [options] KIND WIDTH HEIGHT\n'
+                          'KIND is one of: ' + ', '.join(sorted(KINDS)))
+    parser.add_option('--seed', dest='seed', type='int', default=0,
+                      help='Random seed [Default: %default]')
+    parser.add_option('--food', dest='food', default=None,
+                      help='Number of pellets or "all" [Default: depends on KIND]')
+    parser.add_option('--capsules', dest='capsules', type='int', default=0,
+                      help='Number of capsules [Default: %default]')
+    parser.add_option('--ghosts', dest='ghosts', type='int', default=0,
+                      help='Number of ghosts [Default: %default]')
+    parser.add_option('--braid', dest='braid', type='float', default=None,
+                      help='Fraction of dead ends opened in a braided maze')
+    parser.add_option('--density', dest='density', type='float', default=None,
+                      help='Fraction of random wall cells in a room or arena')
+    parser.add_option('-o', '--output', dest='output', default=None,
+                      help='File to write the layout to [Default: standard output]')
+    options, args = parser.parse_args(sys.argv[1:])
+    if len(args) != 3:
+        parser.error('expected KIND WIDTH HEIGHT')
+    kind, width, height = args[0], int(args[1]), int(args[2])
+    food = options.food
+    if food is not None and food != 'all':
+        food = int(food)
+    builderOptions = {}
+    if options.braid is not None:
+        builderOptions['braid'] = options.braid
+    if options.density is not None:
+        builderOptions['density'] = options.density
+    text = '\n'.join(generateLayoutText(kind, width, height, options.seed, food, options.capsules,
+                                        options.ghosts, **builderOptions)) + '\n'
+    if options.output is None:
+        sys.stdout.write(text)
+    else:
+        with open(options.output, 'w') as f:
+            f.write(text)
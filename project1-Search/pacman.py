@@ -523,6 +523,12 @@ def readCommand( argv ):
                       help='Turns on exception handling and timeouts during games', default=False)
     parser.add_option('--timeout', dest='timeout', type='int',
                       help=default('Maximum length of time an agent can spend computing in a single game'), default=30)
+    parser.add_option('--closestDotBatch', action='store_true', dest='closestDotBatch',
+                      help='Write the greedy closest dot tour of the layout and exit without playing', default=False)
+    parser.add_option('--searchStats', dest='searchStats', type='choice', choices=['text', 'json'],
+                      help='Write search statistics of every SearchAgent run as text or json', default=None)
+    parser.add_option('--searchStatsFile', dest='searchStatsFile',
+                      help='Append the search statistics to this file instead of printing them', default=None)
 
     options, otherjunk = parser.parse_args(argv)
     if len(otherjunk) != 0:
@@ -536,6 +542,16 @@ def readCommand( argv ):
     args['layout'] = layout.getLayout( options.layout )
     if args['layout'] == None: raise Exception("The layout " + options.layout + " cannot be found")
 
+    # Special case: the closest dot tour is planned without running a game
+    if options.closestDotBatch:
+        writeClosestDotTour(args['layout'])
+        sys.exit(0)
+
+    # Search statistics have to be enabled before the agent is created
+    if options.searchStats:
+        import searchStats
+        searchStats.enable(options.searchStats, options.searchStatsFile)
+
     # Choose a Pacman agent
     noKeyboard = options.gameToReplay == None and (options.textGraphics or options.quietGraphics)
     pacmanType = loadAgent(options.pacman, noKeyboard)
@@ -584,6 +600,20 @@ def readCommand( argv ):
 
     return args
 
+def writeClosestDotTour(layout):
+    """
+    Prints the actions of the greedy tour that ClosestDotSearchAgent follows
+    on layout, one per line, after a line with its length and planning time.
+    """
+    import searchAgents
+    state = GameState()
+    state.initialize(layout, 0)
+    startTime = time.time()
+    workspace = searchAgents.ClosestDotWorkspace(layout)
+    actions = workspace.greedyTour(state.getPacmanPosition(), workspace.getFoodBits(state.getFood()))
+    print('Path found with cost %d in %.4f seconds.' % (len(actions), time.time() - startTime))
+    print('\n'.join(actions))
+
 def loadAgent(pacman, nographics):
     # Looks through all pythonPath Directories for the right module,
     pythonPathStr = os.path.expandvars("$PYTHONPATH")
@@ -0,0 +1,467 @@
+# parallelSearch.py
+# -----------------
+# Hash distributed A* (HDA*) over a pool of worker processes.
+
+
+"""
+Two ways of using several processes for one search problem.
+
+parallelAStarSearch splits one A* search across several processes.  Every
+state has an owner, hash(state) % workers, and only its owner keeps the state
+in an open list, remembers its best path cost and expands it.  Successors are
+sent to their owners through multiprocessing queues in batches of batchSize.
+
+The main process coordinates the search:
+
+  * A worker that expands a goal reports its cost, and the lowest one (the
+    incumbent) is broadcast so every worker stops expanding states whose
+    f = g + h is not below it.
+  * The incumbent is optimal once every worker has no open state with f
+    below it and no batch is still in flight.  That is detected with status
+    rounds: each worker reports the lowest f in its open list and how many
+    nodes it has sent and received, and the search ends after two rounds in
+    a row that agree with each other and balance.
+  * The path is rebuilt by asking the owner of each state on it for the
+    state's parent.
+  * A worker that dies (the problem or the heuristic raised, say) would
+    leave the others waiting forever, so the main process then terminates
+    them all and raises.
+
+Workers are forked from the main process, so they share the problem, the
+heuristic and the hash seed without pickling them.  Only the nodes that
+cross processes are pickled; a problem can make them smaller by defining
+encodeState(state) and decodeState(data), like FoodSearchProblem does.
+
+runPortfolio (search.portfolioSearch) instead races whole search functions
+from search.py against each other, one process each, and keeps the first
+acceptable answer.  The number of wins of every strategy is saved per layout
+in PORTFOLIO_STATS_PATH, and strategies that won more often are started
+first.
+
+Example usage:
+    problem = searchAgents.FoodSearchProblem(gameState)
+    actions = parallelAStarSearch(problem, searchAgents.foodHeuristic, workers=4)
+    actions = search.portfolioSearch(problem, searchAgents.foodHeuristic, require_optimal=True)
+"""
+
+import hashlib
+import heapq
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import time
+
+import search
+
+# Seconds the main process waits for worker reports before it starts a new
+# status round, and that an idle worker blocks on its queue
+POLL_INTERVAL = 0.01
+
+# Expansions a busy worker makes between two looks at its queue
+CHECK_INTERVAL = 32
+
+# Search functions raced by runPortfolio when no strategies are given, and
+# the ones whose paths are optimal (given an admissible heuristic)
+PORTFOLIO_STRATEGIES = ['breadthFirstSearch', 'uniformCostSearch', 'aStarSearch', 'greedySearch']
+OPTIMAL_STRATEGIES = set(['uniformCostSearch', 'aStarSearch', 'bidirectionalAStarSearch',
+                          'iterativeDeepeningAStar'])
+
+PORTFOLIO_STATS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.portfolioStats.json')
+
+
+def parallelAStarSearch(problem, heuristic=search.nullHeuristic, workers=4, batchSize=64):
+    """
+    A* search distributed over workers processes; returns an optimal list of
+    actions (for an admissible heuristic), or [] when no goal can be reached.
+    problem._expanded, if present, is set to the expansions of all workers.
+
+    It needs the fork start method (the default on Linux) so that workers
+    share the problem and hash states the same way; elsewhere it runs
+    search.aStarSearch instead.
+    """
+    workers = int(workers)
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return search.aStarSearch(problem, heuristic)
+    context = multiprocessing.get_context('fork')
+
+    encode = getattr(problem, 'encodeState', lambda state: state)
+    decode = getattr(problem, 'decodeState', lambda data: data)
+    start = problem.getStartState()
+    if problem.isGoalState(start):
+        return []
+
+    inboxes = [context.Queue() for _ in range(workers)]
+    reports = context.Queue()
+    processes = [context.Process(target=runWorker,
+                                 args=(index, problem, heuristic, inboxes, reports, batchSize))
+                 for index in range(workers)]
+    for process in processes:
+        process.daemon = True
+        process.start()
+
+    try:
+        inboxes[hash(start) % workers].put(('nodes', [(encode(start), 0, None, None)]))
+        goal, expanded = coordinate(inboxes, reports, processes)
+        actions = []
+        if goal is not None:
+            actions = rebuildPath(decode(goal), start, encode, decode, inboxes, reports, processes)
+    except BaseException:
+        # the stop messages below may never be read
+        for process in processes:
+            process.terminate()
+        for inbox in inboxes:
+            inbox.cancel_join_thread()
+        raise
+    finally:
+        for inbox in inboxes:
+            inbox.put(('stop',))
+        for process in processes:
+            process.join()
+
+    if hasattr(problem, '_expanded'):
+        problem._expanded = expanded
+    return actions
+
+
+def coordinate(inboxes, reports, processes):
+    """
+    Runs status rounds until the incumbent is proven optimal, or until the
+    search runs out of states.  Returns (encoded goal or None, expanded).
+    """
+    workers = len(processes)
+    incumbent, goal = float('inf'), None
+    sent = 1  # the start node sent by the main process
+    previous = None
+    round = 0
+    while True:
+        round += 1
+        for inbox in inboxes:
+            inbox.put(('status', round))
+        statuses = {}
+        while len(statuses) < workers:
+            try:
+                report = reports.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                checkWorkers(processes)
+                continue
+            if report[0] == 'goal':
+                _, cost, state = report
+                if cost < incumbent:
+                    incumbent, goal = cost, state
+                    for inbox in inboxes:
+                        inbox.put(('incumbent', incumbent))
+            elif report[0] == 'status' and report[1] == round:
+                statuses[report[2]] = report[3:]
+
+        totalSent = sent + sum(status[0] for status in statuses.values())
+        totalReceived = sum(status[1] for status in statuses.values())
+        lowestF = min(status[2] for status in statuses.values())
+        expanded = sum(status[3] for status in statuses.values())
+        current = (totalSent, totalReceived)
+        idle = totalSent == totalReceived and lowestF >= incumbent
+        if idle and current == previous:
+            return goal, expanded
+        previous = current if idle else None
+
+
+def rebuildPath(goal, start, encode, decode, inboxes, reports, processes):
+    """
+    Walks back from goal to start by asking each state's owner for its parent.
+    """
+    workers = len(processes)
+    actions = []
+    state = goal
+    while state != start:
+        inboxes[hash(state) % workers].put(('parent', encode(state)))
+        while True:
+            try:
+                report = reports.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                checkWorkers(processes)
+                continue
+            if report[0] == 'parent':
+                break
+        _, parent, action = report
+        actions.append(action)
+        state = decode(parent)
+    actions.reverse()
+    return actions
+
+
+def checkWorkers(processes):
+    """
+    Raises an Exception if a worker process has exited.  Workers only stop
+    when told to, so one that exited died, and its states are lost.
+    """
+    for index, process in enumerate(processes):
+        if not process.is_alive():
+            raise Exception('parallelAStarSearch: worker %d exited with code %s' % (index, process.exitcode))
+
+
+def runWorker(index, problem, heuristic, inboxes, reports, batchSize):
+    """
+    The loop of one worker process: it owns the states that hash to index.
+    """
+    workers = len(inboxes)
+    encode = getattr(problem, 'encodeState', lambda state: state)
+    decode = getattr(problem, 'decodeState', lambda data: data)
+    inbox = inboxes[index]
+
+    fringe = []             # (f, count, g, state) entries, deleted lazily
+    costs, parents = {}, {}  # parents maps a state to (encoded parent, action)
+    counter = itertools.count()
+    incumbent = float('inf')
+    sent = received = expanded = 0
+    batches = [[] for _ in range(workers)]
+
+    def addNode(state, cost, parent, action):
+        # keep a node only if it is the cheapest path to its state so far
+        if state in costs and costs[state] <= cost:
+            return
+        costs[state] = cost
+        parents[state] = (parent, action)
+        heapq.heappush(fringe, (cost + heuristic(state, problem), next(counter), cost, state))
+
+    def flushAll():
+        for owner in range(workers):
+            if batches[owner]:
+                inboxes[owner].put(('nodes', batches[owner]))
+                batches[owner] = []
+
+    def handleMessages(block):
+        # handles every waiting message, blocking briefly for the first one
+        # when block is set; returns False once the worker must stop
+        nonlocal incumbent, received
+        while True:
+            try:
+                message = inbox.get(timeout=POLL_INTERVAL) if block else inbox.get_nowait()
+            except queue.Empty:
+                return True
+            block = False
+            kind = message[0]
+            if kind == 'nodes':
+                for data, cost, parent, action in message[1]:
+                    received += 1
+                    addNode(decode(data), cost, parent, action)
+            elif kind == 'incumbent':
+                incumbent = min(incumbent, message[1])
+            elif kind == 'status':
+                flushAll()
+                while fringe and fringe[0][2] > costs[fringe[0][3]]:
+                    heapq.heappop(fringe)
+                lowestF = fringe[0][0] if fringe else float('inf')
+                reports.put(('status', message[1], index, sent, received, lowestF, expanded))
+            elif kind == 'parent':
+                parent, action = parents[decode(message[1])]
+                reports.put(('parent', parent, action))
+            elif kind == 'stop':
+                # batches for workers that already stopped are dropped
+                for otherInbox in inboxes:
+                    otherInbox.cancel_join_thread()
+                reports.cancel_join_thread()
+                return False
+
+    sinceChecked = 0
+    while True:
+        # looking at the queue takes a lock, so a busy worker only does it
+        # every CHECK_INTERVAL expansions
+        idle = not fringe or fringe[0][0] >= incumbent
+        if idle or sinceChecked >= CHECK_INTERVAL:
+            sinceChecked = 0
+            if not handleMessages(idle):
+                return
+        sinceChecked += 1
+
+        # expand the best open state unless it cannot beat the incumbent
+        if not fringe or fringe[0][0] >= incumbent:
+            flushAll()
+            continue
+        f, _, cost, state = heapq.heappop(fringe)
+        if cost > costs[state]:
+            continue
+        if problem.isGoalState(state):
+            incumbent = cost
+            reports.put(('goal', cost, encode(state)))
+            continue
+
+        expanded += 1
+        encodedState = encode(state)
+        for successorState, successorAction, successorCost in problem.getSuccessors(state):
+            owner = hash(successorState) % workers
+            if owner == index:
+                addNode(successorState, cost + successorCost, encodedState, successorAction)
+                continue
+            batches[owner].append((encode(successorState), cost + successorCost, encodedState, successorAction))
+            sent += 1
+            if len(batches[owner]) >= batchSize:
+                inboxes[owner].put(('nodes', batches[owner]))
+                batches[owner] = []
+
+
+def runPortfolio(problem, heuristic=search.nullHeuristic, *, strategies=None, require_optimal=False, processes=None):
+    """
+    Runs the search functions named in strategies (names or abbreviations from
+    search.py) in separate processes and returns the path of the first one to
+    finish with an acceptable answer, terminating the others.  A strategy
+    that raises, or whose process dies (killed for running out of memory,
+    say), gives no answer; its error is printed.
+
+    With require_optimal only OPTIMAL_STRATEGIES are run.  An Exception
+    listing the errors is raised if none of the strategies run gives an
+    answer.
+
+    processes bounds how many strategies run at once (all of them by
+    default); the others wait in order of their past wins on this layout.
+    The winner is printed and counted in PORTFOLIO_STATS_PATH.
+    """
+    if not callable(heuristic):
+        raise Exception('portfolioSearch: the heuristic %r is not callable (strategies are keyword only)' % (heuristic,))
+    names = [getattr(search, strategy).__name__ for strategy in strategies or PORTFOLIO_STRATEGIES]
+    if require_optimal:
+        names = [name for name in names if name in OPTIMAL_STRATEGIES]
+        if not names:
+            raise Exception('require_optimal needs one of the strategies ' + ', '.join(sorted(OPTIMAL_STRATEGIES)))
+    stats = loadPortfolioStats()
+    key = portfolioKey(problem)
+    wins = stats.get(key, {})
+    names.sort(key=lambda name: -wins.get(name, 0))
+
+    def isAcceptable(name, actions):
+        return actions is not None and (not require_optimal or name in OPTIMAL_STRATEGIES)
+
+    results = []
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        # no cheap way to share the problem: try the strategies in turn
+        for name in names:
+            results.append(runStrategy(name, problem, heuristic))
+            reportError(results[-1])
+            if isAcceptable(*results[-1][:2]):
+                break
+    else:
+        context = multiprocessing.get_context('fork')
+        reports = context.Queue()
+        pending, running = list(names), {}
+        limit = int(processes or len(names))
+        try:
+            while pending or running:
+                while pending and len(running) < limit:
+                    name = pending.pop(0)
+                    running[name] = context.Process(target=reportStrategy,
+                                                    args=(name, problem, heuristic, reports))
+                    running[name].daemon = True
+                    running[name].start()
+                try:
+                    result = reports.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    result = deadStrategy(running, reports)
+                    if result is None:
+                        continue
+                results.append(result)
+                reportError(result)
+                running.pop(result[0]).join()
+                if isAcceptable(*result[:2]):
+                    break
+        finally:
+            for process in running.values():
+                process.terminate()
+                process.join()
+
+    answers = [result for result in results if result[1] is not None]
+    if not answers:
+        errors = ['%s: %s' % (result[0], result[4]) for result in results]
+        raise Exception('portfolioSearch: no %sstrategy finished (%s)'
+                        % ('optimal ' if require_optimal else '', '; '.join(errors)))
+    name, actions, expanded, seconds, _ = answers[0]
+    print('[portfolioSearch] %s won in %.3f seconds' % (name, seconds))
+
+    wins[name] = wins.get(name, 0) + 1
+    stats[key] = wins
+    savePortfolioStats(stats)
+    if expanded is not None and hasattr(problem, '_expanded'):
+        problem._expanded = expanded
+    return actions
+
+
+def runStrategy(name, problem, heuristic):
+    """
+    Runs one search function; returns (name, actions or None if it failed,
+    expanded, seconds, error or None).
+    """
+    function = getattr(search, name)
+    startTime = time.time()
+    error = None
+    try:
+        if 'heuristic' in function.__code__.co_varnames:
+            actions = function(problem, heuristic=heuristic)
+        else:
+            actions = function(problem)
+    except Exception as exception:
+        actions = None
+        error = '%s: %s' % (type(exception).__name__, exception)
+    return name, actions, getattr(problem, '_expanded', None), time.time() - startTime, error
+
+
+def deadStrategy(running, reports):
+    """
+    Returns a failed result, (name, None, None, None, error), for a strategy
+    whose process has exited without reporting, or None if every one is
+    alive.  A process that exits has already written its report, so one last
+    look at reports tells a dead strategy from a finished one.
+    """
+    for name, process in running.items():
+        if not process.is_alive():
+            try:
+                return reports.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                return name, None, None, None, 'exited with code %s' % process.exitcode
+    return None
+
+
+def reportError(result):
+    "Prints the error of a strategy that failed."
+    if result[4] is not None:
+        print('[portfolioSearch] %s failed: %s' % (result[0], result[4]))
+
+
+def reportStrategy(name, problem, heuristic, reports):
+    "Process target for runPortfolio: runs a strategy and reports the result."
+    reports.put(runStrategy(name, problem, heuristic))
+
+
+def portfolioKey(problem):
+    """
+    Returns the key the wins on this problem are stored under: the problem
+    type and a hash of its walls, so every problem of that type on the same
+    layout shares its statistics.
+    """
+    walls = getattr(problem, 'walls', None)
+    if walls is None:
+        return type(problem).__name__
+    return '%s:%s' % (type(problem).__name__, hashlib.sha1(str(walls).encode('utf-8')).hexdigest())
+
+
+def loadPortfolioStats():
+    """
+    Returns the saved {key: {strategy: wins}} dictionary, or an empty one.
+    """
+    try:
+        with open(PORTFOLIO_STATS_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def savePortfolioStats(stats):
+    """
+    Writes the statistics.  They only decide the start order, so failing to
+    write them is not an error.
+    """
+    try:
+        temporaryPath = '%s.%d.tmp' % (PORTFOLIO_STATS_PATH, os.getpid())
+        with open(temporaryPath, 'w') as f:
+            json.dump(stats, f, indent=1, sort_keys=True)
+        os.replace(temporaryPath, PORTFOLIO_STATS_PATH)
+    except OSError:
+        pass
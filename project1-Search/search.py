@@ -53,6 +53,18 @@ class SearchProblem:
         """
         util.raiseNotDefined()
 
+    def getPredecessors(self, state):
+        """
+          state: Search state
+
+        Returns a list of triples, (predecessor, action, stepCost), where
+        taking 'action' in 'predecessor' leads to state for 'stepCost'.  It is
+        only needed by the bidirectional searches, which search backwards from
+        the goal.  The default is right for symmetric problems, where every
+        move can be undone at the same cost, and simply returns the successors.
+        """
+        return self.getSuccessors(state)
+
     def getCostOfActions(self, actions):
         """
          actions: A list of actions to take
@@ -74,6 +86,80 @@ def tinyMazeSearch(problem):
     return [s, s, w, s, w, w, s, w]
 
 
+class SearchNode:
+    """
+    A node in the search tree.  Each node only holds the state it reaches, a
+    reference to the node it was generated from, the action taken from that
+    parent and the path cost so far.  The list of actions is rebuilt once, by
+    path(), when a goal is found instead of being copied for every successor.
+    """
+    __slots__ = ('state', 'parent', 'action', 'cost')
+
+    def __init__(self, state, parent=None, action=None, cost=0):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.cost = cost
+
+    def child(self, successorState, successorAction, successorCost):
+        """
+        Returns the node reached by taking successorAction from this node.
+        """
+        return SearchNode(successorState, self, successorAction, self.cost + successorCost)
+
+    def path(self):
+        """
+        Returns the list of actions that leads from the root to this node.
+        """
+        actions = []
+        node = self
+        while node.parent is not None:
+            actions.append(node.action)
+            node = node.parent
+        actions.reverse()
+        return actions
+
+
+def graphSearch(problem, fringe, reopen=False):
+    """
+    Shared graph search engine used by dfs, bfs and ucs.
+
+    fringe: a util.Stack, util.Queue or util.PriorityQueueWithFunction holding
+            SearchNodes; the order in which it pops nodes defines the algorithm.
+    reopen: when True a closed state is expanded again if it is reached with a
+            strictly lower path cost (needed by uniform cost search).
+
+    A state is closed when it is popped, and the goal test is done on pop.
+    """
+    stats = getattr(problem, 'searchStats', None)
+    # previously expanded states mapped to the cost they were expanded with
+    closedStates = {}
+
+    node = SearchNode(problem.getStartState())
+    fringe.push(node)
+
+    while not fringe.isEmpty():
+        node = fringe.pop()
+        state = node.state
+
+        # Validate we don't expand an already visited node
+        if state in closedStates and not (reopen and node.cost < closedStates[state]):
+            if stats is not None:
+                stats.duplicatesPruned += 1
+            continue
+        closedStates[state] = node.cost
+        if stats is not None:
+            stats.observe(len(fringe), len(closedStates))
+
+        if problem.isGoalState(state):
+            return node.path()
+
+        for successorState, successorAction, successorCost in problem.getSuccessors(state):
+            fringe.push(node.child(successorState, successorAction, successorCost))
+
+    return node.path()
+
+
 def depthFirstSearch(problem):
     """
     Search the deepest nodes in the search tree first.
@@ -87,177 +173,644 @@ def depthFirstSearch(problem):
     print("Is the start a goal?", problem.isGoalState(problem.getStartState()))
     print("Start's successors:", problem.getSuccessors(problem.getStartState()))
   """
+    # Using a stack of nodes based on LIFO.
+    return graphSearch(problem, util.Stack())
 
-    # Using a stack of tuples to track the (location, actions) based on LIFO.
-    fringe = util.Stack()
-
-    # previously visited location (nodes) in a list. Holds the location/state
-    visitedNodes = []
 
-    # define start state and tracking node
-    startState = problem.getStartState()
-    startNode = (startState, [])
+def breadthFirstSearch(problem):
+    """Search the shallowest nodes in the search tree first."""
+    # Using a queue since we are working FIFO.
+    return graphSearch(problem, util.Queue())
 
-    # Push the tuples into our start Node for the coordinates and action taken
-    fringe.push(startNode)
 
-    while not fringe.isEmpty():
-        # check the most recently pushed node in fringe to find the location and action (path)
-        state, actions = fringe.pop()
+def uniformCostSearch(problem):
+    """Search the node of least total cost first."""
+    # Using a priority queue ordered by path cost; a closed state is reopened
+    # when a cheaper path to it is popped.
+    fringe = util.PriorityQueueWithFunction(lambda node: node.cost)
+    return graphSearch(problem, fringe, reopen=True)
 
-        # Validate we don't expand an already visited node
-        if state not in visitedNodes:
-            # move the node to a visited node list
-            visitedNodes.append(state)
-            # print("The state is: " + str(state))
 
-            if problem.isGoalState(state):
-                return actions
-            else:
-                # pull the list of potential successor node
-                successors = problem.getSuccessors(state)
-                # print("My next move is: " + str(successors))
-
-                # push each successor to fringe
-                for successorState, successorAction, successorCost in successors:
-                    newAction = actions + [successorAction]
-                    newNode = (successorState, newAction)
-                    fringe.push(newNode)
-    return actions
+def nullHeuristic(state, problem=None):
+    """
+    A heuristic function estimates the cost from the current state to the nearest
+    goal in the provided SearchProblem.  This heuristic is trivial.
+    """
+    return 0
 
 
-def breadthFirstSearch(problem):
-    """Search the shallowest nodes in the search tree first."""
-    # Using a queue since we are working FIFO. Stored as (state, action, cost)
-    fringe = util.Queue()
+def aStarSearch(problem, heuristic=nullHeuristic, reopen=True):
+    """
+    Search the node that has the lowest combined cost and heuristic first.
 
-    # previously visited location (nodes) in a list
-    visitedNodes = []
+    reopen: when True a state that was already expanded is pushed and expanded
+            again if a strictly cheaper path to it is found, which keeps A*
+            optimal with admissible but inconsistent heuristics.  When False
+            expanded states are closed for good, which is enough for consistent
+            heuristics and skips the extra bookkeeping.
+    """
+    stats = getattr(problem, 'searchStats', None)
+    # Using a priority queue ordered by cost + heuristic.
+    fringe = util.PriorityQueue()
 
-    startState = problem.getStartState()
-    startNode = (startState, [], 0)
+    # cheapest path cost found so far for every generated state, and the set
+    # of states that have already been expanded
+    bestCosts = {}
+    closedStates = set()
 
-    fringe.push(startNode)
+    node = SearchNode(problem.getStartState())
+    bestCosts[node.state] = 0
+    fringe.push(node, 0)
 
     while not fringe.isEmpty():
-        # check the first or earliest-pushed node in fringe
-        state, actions, cost = fringe.pop()
+        # explore the cheapest node in fringe first (cost + heuristic)
+        node = fringe.pop()
+        state = node.state
+
+        # Lazy deletion: a cheaper path to this state was pushed after this
+        # entry, so this entry is stale and is dropped instead of expanded.
+        if node.cost > bestCosts[state]:
+            if stats is not None:
+                stats.duplicatesPruned += 1
+            continue
+        closedStates.add(state)
+        if stats is not None:
+            stats.observe(len(fringe), len(closedStates))
+
+        if problem.isGoalState(state):
+            return node.path()
+
+        # check each successor, accumulating g from the step costs
+        for successorState, successorAction, successorCost in problem.getSuccessors(state):
+            newCost = node.cost + successorCost
+
+            # only keep the successor if it improves on the best known path
+            if (successorState in bestCosts and newCost >= bestCosts[successorState] or
+                    not reopen and successorState in closedStates):
+                if stats is not None:
+                    stats.duplicatesPruned += 1
+                continue
+
+            bestCosts[successorState] = newCost
+            childNode = SearchNode(successorState, node, successorAction, newCost)
+            fringe.push(childNode, newCost + heuristic(successorState, problem))
+    return node.path()
+
+
+def greedySearch(problem, heuristic=nullHeuristic):
+    """
+    Greedy best first search: expands the state with the lowest heuristic
+    first and ignores path costs, so it is fast but not optimal.
+    """
+    fringe = util.PriorityQueueWithFunction(lambda node: heuristic(node.state, problem))
+    return graphSearch(problem, fringe)
 
-        # Validate we don't expand an already visited node
-        if state not in visitedNodes:
-            # add popped node state into visited list
-            visitedNodes.append(state)
-            # print("My location is: " + str(location))
 
-            if problem.isGoalState(state):
-                return actions
+def portfolioSearch(problem, heuristic=nullHeuristic, *, strategies=None, require_optimal=False, processes=None):
+    """
+    Races several of the search functions in this module on problem, each in
+    its own process, and returns the first acceptable path; see
+    parallelSearch.runPortfolio.  Strategies that won on the same layout
+    before are started first.  processes bounds how many run at once.
+    """
+    import parallelSearch
+    return parallelSearch.runPortfolio(problem, heuristic, strategies=strategies,
+                                       require_optimal=require_optimal, processes=processes)
+
+
+def isUnitCostGridProblem(problem):
+    """
+    Returns True for single-goal position problems (PositionSearchProblem and
+    friends) whose walls form a 4-connected grid and where every step costs 1.
+    """
+    for attribute in ('walls', 'goal', 'costFn'):
+        if not hasattr(problem, attribute):
+            return False
+    start = problem.getStartState()
+    if not (isinstance(start, tuple) and len(start) == 2 and isinstance(problem.goal, tuple)):
+        return False
+    walls = problem.walls
+    return all(problem.costFn((x, y)) == 1
+               for x in range(walls.width) for y in range(walls.height) if not walls[x][y])
+
+
+def jumpPointSearch(problem, heuristic=nullHeuristic):
+    """
+    Jump point search: A* that only pushes jump points onto the fringe.
+
+    It works on unit cost 4-connected grids (see isUnitCostGridProblem) and
+    only follows canonical paths, in which a vertical run may turn horizontal
+    only at a forced neighbor (the side cell is open but the one behind it is
+    a wall) while a horizontal run may turn vertical anywhere.  Every optimal
+    path can be reordered into such a path, so the straight runs between
+    jump points can be skipped without losing optimality.  The returned path
+    is a list of primitive actions.
+
+    Any other problem, e.g. a PositionSearchProblem with a non-uniform costFn
+    as used by StayEastSearchAgent, is solved with aStarSearch instead.
+    """
+    if not isUnitCostGridProblem(problem):
+        return aStarSearch(problem, heuristic)
+
+    from game import Directions
+    directionNames = {(0, 1): Directions.NORTH, (0, -1): Directions.SOUTH,
+                      (1, 0): Directions.EAST, (-1, 0): Directions.WEST}
+    walls, goal = problem.walls, problem.goal
+    width, height = walls.width, walls.height
+
+    def isOpen(x, y):
+        return 0 <= x < width and 0 <= y < height and not walls[x][y]
+
+    def isForced(x, y, sx, dy):
+        # the side cell (x + sx, y) can only be reached optimally by turning here
+        return isOpen(x + sx, y) and not isOpen(x + sx, y - dy)
+
+    def jumpVertical(x, y, dy):
+        while True:
+            y += dy
+            if not isOpen(x, y):
+                return None
+            if (x, y) == goal or isForced(x, y, 1, dy) or isForced(x, y, -1, dy):
+                return (x, y)
+
+    def jumpHorizontal(x, y, dx):
+        while True:
+            x += dx
+            if not isOpen(x, y):
+                return None
+            if (x, y) == goal or jumpVertical(x, y, 1) or jumpVertical(x, y, -1):
+                return (x, y)
+
+    def directionsFrom(state, direction):
+        x, y = state
+        if direction is None:
+            return [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        dx, dy = direction
+        if dy == 0:
+            return [direction, (0, 1), (0, -1)]
+        return [direction] + [(sx, 0) for sx in (1, -1) if isForced(x, y, sx, dy)]
+
+    # A* over jump points; node actions are (direction, number of steps).
+    # The moves allowed out of a jump point depend on the direction it was
+    # reached from, so best costs are kept per (jump point, direction).
+    stats = getattr(problem, 'searchStats', None)
+    fringe = util.PriorityQueue()
+    bestCosts = {}
+    node = SearchNode(problem.getStartState())
+    bestCosts[(node.state, None)] = 0
+    fringe.push(node, 0)
+
+    while not fringe.isEmpty():
+        node = fringe.pop()
+        state = node.state
+        direction = node.action[0] if node.action is not None else None
+        if node.cost > bestCosts[(state, direction)]:
+            if stats is not None:
+                stats.duplicatesPruned += 1
+            continue
+
+        if problem.isGoalState(state):
+            actions = []
+            for direction, steps in node.path():
+                actions.extend([directionNames[direction]] * steps)
+            return actions
+
+        if hasattr(problem, '_expanded'):
+            problem._expanded += 1
+        if stats is not None:
+            stats.expanded += 1
+            stats.observe(len(fringe), len(bestCosts))
+        for dx, dy in directionsFrom(state, direction):
+            if dy == 0:
+                jumpPoint = jumpHorizontal(state[0], state[1], dx)
             else:
-                # list the successor, action and stepCost
-                successors = problem.getSuccessors(state)
-                # print("My next move is: " + str(successors))
+                jumpPoint = jumpVertical(state[0], state[1], dy)
+            if jumpPoint is None:
+                continue
+            steps = abs(jumpPoint[0] - state[0]) + abs(jumpPoint[1] - state[1])
+            newCost = node.cost + steps
+            key = (jumpPoint, (dx, dy))
+            if stats is not None:
+                stats.generated += 1
+            if key in bestCosts and newCost >= bestCosts[key]:
+                if stats is not None:
+                    stats.duplicatesPruned += 1
+                continue
+            bestCosts[key] = newCost
+            childNode = SearchNode(jumpPoint, node, ((dx, dy), steps), newCost)
+            fringe.push(childNode, newCost + heuristic(jumpPoint, problem))
+    return []
+
+
+class ReverseSearchProblem(SearchProblem):
+    """
+    The backward half of a bidirectional search: the search starts at the goal
+    of problem, moves along problem.getPredecessors and ends at its start.
 
-                for successorState, successorAction, successorCost in successors:
-                    newAction = actions + [successorAction]
-                    newCost = cost + successorCost
-                    newNode = (successorState, newAction, newCost)
-                    fringe.push(newNode)
+    Other attributes (walls, heuristicInfo, ...) are read from problem, so a
+    heuristic written for problem, like manhattanHeuristic, estimates the
+    distance back to the start when it is called with this problem.
+    """
 
-    return actions
+    def __init__(self, problem):
+        self.problem = problem
+        self.goal = problem.getStartState()
+        self.startState = getGoalState(problem)
 
+    def __getattr__(self, name):
+        return getattr(self.problem, name)
 
-def uniformCostSearch(problem):
-    """Search the node of least total cost first."""
-    # Using a priority queue for UCS. We are working FIFO. Stored as (item, cost)
-    fringe = util.PriorityQueue()
+    def getStartState(self):
+        return self.startState
 
-    # previously expanded nodes in a dictionary for cycle checking. Tuple = (state:cost)
-    visitedNodes = {}
+    def isGoalState(self, state):
+        return state == self.goal
 
-    startState = problem.getStartState()
-    startNode = (startState, [], 0)  # (state, action, cost)
+    def getSuccessors(self, state):
+        return self.problem.getPredecessors(state)
 
-    fringe.push(startNode, 0)
+    def getPredecessors(self, state):
+        return self.problem.getSuccessors(state)
 
-    while not fringe.isEmpty():
-        # explore the first node in fringe, which should be the cheapest cost
-        state, actions, cost = fringe.pop()
 
-        if (state not in visitedNodes) or (cost < visitedNodes[state]):
-            # place the popped location (state) into our visited list
-            visitedNodes[state] = cost
+def getGoalState(problem):
+    """
+    Returns the single goal state of problem, which bidirectional search
+    starts its backward half from.
+    """
+    if not hasattr(problem, 'goal'):
+        raise Exception('Bidirectional search needs a problem with a single goal state')
+    return problem.goal
 
-            if problem.isGoalState(state):
-                return actions
-            else:
-                successors = problem.getSuccessors(state)
 
-                for successorLocation, successorAction, successorCost in successors:
-                    newAction = actions + [successorAction]
-                    newCost = cost + successorCost
-                    newNode = (successorLocation, newAction, newCost)
-                    fringe.update(newNode, newCost)
+def joinPaths(problem, forwardParents, backwardParents, meeting):
+    """
+    Returns the actions from the start to the goal through the meeting state.
 
+    forwardParents maps each state reached from the start to (parent, action).
+    backwardParents maps each state reached from the goal to the next state
+    towards the goal.  The forward actions of that second half are looked up
+    with getSuccessors, taking the cheapest move when several lead to the same
+    state; those lookups are not counted as expansions.
+    """
+    actions = []
+    state = meeting
+    while forwardParents[state] is not None:
+        state, action = forwardParents[state]
+        actions.append(action)
+    actions.reverse()
+
+    expanded = getattr(problem, '_expanded', None)
+    stats = getattr(problem, 'searchStats', None)
+    if stats is not None:
+        counts = (stats.expanded, stats.generated)
+    state = meeting
+    while backwardParents[state] is not None:
+        nextState = backwardParents[state]
+        moves = [(successorCost, successorAction)
+                 for successorState, successorAction, successorCost in problem.getSuccessors(state)
+                 if successorState == nextState]
+        actions.append(min(moves, key=lambda move: move[0])[1])
+        state = nextState
+    if expanded is not None:
+        problem._expanded = expanded
+    if stats is not None:
+        stats.expanded, stats.generated = counts
     return actions
 
 
-def nullHeuristic(state, problem=None):
+def bidirectionalSearch(problem):
     """
-    A heuristic function estimates the cost from the current state to the nearest
-    goal in the provided SearchProblem.  This heuristic is trivial.
+    Breadth first search from the start and, along getPredecessors, from the
+    goal at the same time; it returns a path with the fewest actions.
+
+    Each round expands one whole layer of the smaller frontier.  Once a layer
+    reaches a state the other side has seen, the shortest path through any
+    of the meeting states of that layer is a shortest path overall.  Both
+    frontiers only grow to about half the depth of the solution, which for a
+    maze or the eight puzzle is far fewer states than breadthFirstSearch
+    visits.  Returns [] when the goal cannot be reached.
     """
-    return 0
+    start = problem.getStartState()
+    if problem.isGoalState(start):
+        return []
+    goal = getGoalState(problem)
+
+    # state -> (parent, action) from the start, state -> next state from the goal
+    forwardParents, backwardParents = {start: None}, {goal: None}
+    forwardDepths, backwardDepths = {start: 0}, {goal: 0}
+    forwardFrontier, backwardFrontier = [start], [goal]
+    stats = getattr(problem, 'searchStats', None)
+
+    while forwardFrontier and backwardFrontier:
+        if stats is not None:
+            stats.observe(len(forwardFrontier) + len(backwardFrontier), len(forwardDepths) + len(backwardDepths))
+        forward = len(forwardFrontier) <= len(backwardFrontier)
+        if forward:
+            frontier, depths, otherDepths = forwardFrontier, forwardDepths, backwardDepths
+        else:
+            frontier, depths, otherDepths = backwardFrontier, backwardDepths, forwardDepths
+
+        meeting, bestLength = None, None
+        nextFrontier = []
+        for state in frontier:
+            depth = depths[state] + 1
+            neighbors = problem.getSuccessors(state) if forward else problem.getPredecessors(state)
+            for nextState, action, stepCost in neighbors:
+                if nextState in depths:
+                    if stats is not None:
+                        stats.duplicatesPruned += 1
+                    continue
+                depths[nextState] = depth
+                if forward:
+                    forwardParents[nextState] = (state, action)
+                else:
+                    backwardParents[nextState] = state
+                nextFrontier.append(nextState)
+                if nextState in otherDepths:
+                    length = depth + otherDepths[nextState]
+                    if bestLength is None or length < bestLength:
+                        meeting, bestLength = nextState, length
+
+        if meeting is not None:
+            return joinPaths(problem, forwardParents, backwardParents, meeting)
+        if forward:
+            forwardFrontier = nextFrontier
+        else:
+            backwardFrontier = nextFrontier
+    return []
 
 
-def aStarSearch(problem, heuristic=nullHeuristic):
-    """Search the node that has the lowest combined cost and heuristic first."""
-    # Using a priority queue for UCS. We are working FIFO. Stored as (item, cost+heauristic)
-    fringe = util.PriorityQueue()
+def bidirectionalAStarSearch(problem, heuristic=nullHeuristic):
+    """
+    Front-to-end bidirectional A*: one A* runs from the start towards the
+    goal and one from the goal, along getPredecessors, towards the start.  The
+    backward half calls heuristic with a ReverseSearchProblem, whose goal is
+    the start state.
+
+    The cheapest complete path found so far, where the two searches meet,
+    costs bestCost.  Every path that has not been found yet costs at least
+    the lowest f in either fringe (the heuristics are admissible) and at least
+    the sum of the lowest g in both fringes (it leaves one fringe and enters
+    the other), so the search stops as soon as bestCost is no larger than the
+    highest of those bounds.  Each step expands a state from the smaller
+    fringe.  Returns [] when the goal cannot be reached.
+    """
+    import heapq
+
+    def lowestCost(costHeap, fringe, costs):
+        # costHeap holds (g, count, state) entries, dropped lazily once the
+        # state has left the fringe or was pushed again with a lower g
+        while costHeap and (costHeap[0][2] not in fringe or costHeap[0][0] > costs[costHeap[0][2]]):
+            heapq.heappop(costHeap)
+        return costHeap[0][0]
+
+    start = problem.getStartState()
+    if problem.isGoalState(start):
+        return []
+    reverseProblem = ReverseSearchProblem(problem)
+    goal = reverseProblem.getStartState()
+
+    forwardParents, backwardParents = {start: None}, {goal: None}
+    forwardCosts, backwardCosts = {start: 0}, {goal: 0}
+    forwardFringe = util.IndexedPriorityQueue([(start, heuristic(start, problem))])
+    backwardFringe = util.IndexedPriorityQueue([(goal, heuristic(goal, reverseProblem))])
+    forwardCostHeap, backwardCostHeap = [(0, 0, start)], [(0, 1, goal)]
+    count = 2
+
+    stats = getattr(problem, 'searchStats', None)
+    meeting, bestCost = None, float('inf')
+    while not forwardFringe.isEmpty() and not backwardFringe.isEmpty():
+        if stats is not None:
+            stats.observe(len(forwardFringe) + len(backwardFringe), len(forwardCosts) + len(backwardCosts))
+        lowerBound = max(forwardFringe.getPriority(forwardFringe.peek()),
+                         backwardFringe.getPriority(backwardFringe.peek()),
+                         lowestCost(forwardCostHeap, forwardFringe, forwardCosts) +
+                         lowestCost(backwardCostHeap, backwardFringe, backwardCosts))
+        if bestCost <= lowerBound:
+            break
+
+        forward = len(forwardFringe) <= len(backwardFringe)
+        if forward:
+            fringe, costs, otherCosts, costHeap = forwardFringe, forwardCosts, backwardCosts, forwardCostHeap
+            neighbors, heuristicProblem = problem.getSuccessors, problem
+        else:
+            fringe, costs, otherCosts, costHeap = backwardFringe, backwardCosts, forwardCosts, backwardCostHeap
+            neighbors, heuristicProblem = problem.getPredecessors, reverseProblem
+
+        state = fringe.pop()
+        for nextState, action, stepCost in neighbors(state):
+            newCost = costs[state] + stepCost
+            if nextState in costs and newCost >= costs[nextState]:
+                if stats is not None:
+                    stats.duplicatesPruned += 1
+                continue
+            # a cheaper path reopens the state, like aStarSearch with reopen
+            costs[nextState] = newCost
+            if forward:
+                forwardParents[nextState] = (state, action)
+            else:
+                backwardParents[nextState] = state
+            fringe.push(nextState, newCost + heuristic(nextState, heuristicProblem))
+            heapq.heappush(costHeap, (newCost, count, nextState))
+            count += 1
 
-    # store previously visited locations (nodes) in a list of tuples (location, cost)
-    visitedNodes = []
+            if nextState in otherCosts and newCost + otherCosts[nextState] < bestCost:
+                meeting, bestCost = nextState, newCost + otherCosts[nextState]
 
-    # pull the initial starting location and store this in a node variable
-    # holding (location, action, cost)
-    startLocation = problem.getStartState()
-    startNode = (startLocation, [], 0)
+    if meeting is None:
+        return []
+    return joinPaths(problem, forwardParents, backwardParents, meeting)
 
-    fringe.push(startNode, 0)
 
-    while not fringe.isEmpty():
-        # explore the cheapest node in fringe first (cost + heauristic)
-        location, actions, cost = fringe.pop()
+def iterativeDeepeningAStar(problem, heuristic=nullHeuristic, tableSize=None, callback=None):
+    """
+    Iterative deepening A* (IDA*): repeated depth first searches that only
+    follow paths whose f = g + heuristic stays within a threshold.  The first
+    threshold is the heuristic of the start state and each next one is the
+    lowest f that went over it, so with an admissible heuristic the first path
+    found is optimal.  Only the current path is kept in memory.
+
+    tableSize: when set, a transposition table of at most tableSize states
+               (least recently used states are evicted first) remembers the
+               lowest g each state was reached with in this iteration, and a
+               state reached again with no lower g is not searched twice.
+    callback:  when set, it is called with (threshold, expanded) after each
+               iteration that did not find the goal, and once more for the
+               iteration that did.
+
+    Returns [] when no path reaches the goal.
+    """
+    import collections
+
+    start = problem.getStartState()
+    if problem.isGoalState(start):
+        return []
+    stats = getattr(problem, 'searchStats', None)
+    table = collections.OrderedDict() if tableSize else None
+    threshold = heuristic(start, problem)
+    iteration = 0
+
+    while True:
+        iteration += 1
+        expanded = 1
+        nextThreshold = float('inf')
+
+        # depth first search over (state, g, remaining successors) frames;
+        # actions[i] leads from stack[i] to stack[i + 1]
+        stack = [(start, 0, iter(problem.getSuccessors(start)))]
+        onPath = set([start])
+        actions = []
+        while stack:
+            state, cost, successors = stack[-1]
+            successor = next(successors, None)
+            if successor is None:
+                stack.pop()
+                onPath.discard(state)
+                if actions:
+                    actions.pop()
+                continue
+
+            successorState, successorAction, successorCost = successor
+            if successorState in onPath:
+                if stats is not None:
+                    stats.duplicatesPruned += 1
+                continue
+            newCost = cost + successorCost
+            f = newCost + heuristic(successorState, problem)
+            if f > threshold:
+                nextThreshold = min(nextThreshold, f)
+                continue
+
+            if table is not None:
+                entry = table.get(successorState)
+                if entry is not None and entry[0] == iteration and entry[1] <= newCost:
+                    table.move_to_end(successorState)
+                    if stats is not None:
+                        stats.duplicatesPruned += 1
+                    continue
+                table[successorState] = (iteration, newCost)
+                table.move_to_end(successorState)
+                if len(table) > tableSize:
+                    table.popitem(last=False)
+
+            actions.append(successorAction)
+            if problem.isGoalState(successorState):
+                if callback is not None:
+                    callback(threshold, expanded)
+                return actions
+
+            expanded += 1
+            onPath.add(successorState)
+            stack.append((successorState, newCost, iter(problem.getSuccessors(successorState))))
+            if stats is not None:
+                stats.observe(len(stack), len(table) if table is not None else len(onPath))
 
-        # add location and cost to the visitedNodes list
-        visitedNodes.append((location, cost))
+        if callback is not None:
+            callback(threshold, expanded)
+        if nextThreshold == float('inf'):
+            return []
+        threshold = nextThreshold
 
-        if problem.isGoalState(location):
+
+def anytimeAStar(problem, heuristic=nullHeuristic, budget_seconds=None, weight=3.0, weightStep=0.5,
+                 callback=None):
+    """
+    Anytime repairing A* (ARA*): a weighted A*, ordered by g + weight * h,
+    finds a first path quickly, then the weight is lowered by weightStep and
+    the search is repaired, reusing the costs found so far, until weight
+    reaches 1 and the path is optimal (for a consistent heuristic).
+
+    budget_seconds: when set, the search returns the best path found once this
+                    many seconds have passed.  The first path is always
+                    finished, so the budget may be exceeded when even weighted
+                    A* needs longer than that.
+    callback:       when set, it is called with (actions, cost, bound) after
+                    each round, where bound is how far the cost can be from
+                    optimal: cost <= bound * optimal cost.
+
+    Returns [] when no path reaches a goal.
+    """
+    import time
+
+    deadline = None
+    if budget_seconds is not None:
+        deadline = time.time() + float(budget_seconds)
+
+    heuristics = {}  # heuristic values are reused every time the weight drops
+
+    def estimate(state):
+        if state not in heuristics:
+            heuristics[state] = heuristic(state, problem)
+        return heuristics[state]
+
+    def path(state):
+        actions = []
+        while parents[state] is not None:
+            state, action = parents[state]
+            actions.append(action)
+        actions.reverse()
+        return actions
+
+    stats = getattr(problem, 'searchStats', None)
+    start = problem.getStartState()
+    costs, parents = {start: 0}, {start: None}
+    fringe = util.IndexedPriorityQueue([(start, weight * estimate(start))])
+    closedStates, inconsistentStates = set(), set()
+    goal, goalCost = None, float('inf')
+    if problem.isGoalState(start):
+        goal, goalCost = start, 0
+    actions = []
+
+    while True:
+        # improve the path: weighted A* until no state in the fringe can lead
+        # to a cheaper goal under the current weight
+        while not fringe.isEmpty() and goalCost > fringe.getPriority(fringe.peek()):
+            if goal is not None and deadline is not None and time.time() > deadline:
+                return path(goal)  # the best path so far, also in the first round
+            state = fringe.pop()
+            closedStates.add(state)
+            if stats is not None:
+                stats.observe(len(fringe), len(closedStates))
+            for successorState, successorAction, successorCost in problem.getSuccessors(state):
+                newCost = costs[state] + successorCost
+                if successorState in costs and newCost >= costs[successorState]:
+                    if stats is not None:
+                        stats.duplicatesPruned += 1
+                    continue
+                costs[successorState] = newCost
+                parents[successorState] = (state, successorAction)
+                if newCost < goalCost and problem.isGoalState(successorState):
+                    goal, goalCost = successorState, newCost
+                # states expanded in this round wait for the next one
+                if successorState in closedStates:
+                    inconsistentStates.add(successorState)
+                else:
+                    fringe.push(successorState, newCost + weight * estimate(successorState))
+
+        if goal is None:
+            return []
+        actions = path(goal)
+
+        # every cheaper path goes through a state in the fringe or one of the
+        # inconsistent states, so their lowest g + h bounds the optimal cost
+        lowerBound = min([costs[state] + estimate(state) for state in fringe.index] +
+                         [costs[state] + estimate(state) for state in inconsistentStates] + [goalCost])
+        bound = weight
+        if lowerBound > 0:
+            bound = min(weight, goalCost / float(lowerBound))
+        if callback is not None:
+            callback(actions, goalCost, bound)
+
+        if weight <= 1 or bound <= 1 or (deadline is not None and time.time() > deadline):
             return actions
-        else:
-            # create a list to hold the successor, action and stepCost
-            successors = problem.getSuccessors(location)
-
-            # check each successor
-            for successorLocation, successorAction, successorCost in successors:
-                newAction = actions + [successorAction]
-                newCost = problem.getCostOfActions(newAction)
-                # print("True cost is = " + str(newCost))
-                newNode = (successorLocation, newAction, newCost)
-
-                # verify if the successor has already been visited
-                prevVisited = False
-                for visited in visitedNodes:
-                    # check each visited node tuple
-                    prevLocation, prevCost = visited
-
-                    # if successor is previously visited, update bool value of prevVisited
-                    if (successorLocation == prevLocation) and (newCost >= prevCost):
-                        prevVisited = True
-
-                # if successor is not previously visited, add it to fringe and visited list
-                if not prevVisited:
-                    fringe.push(newNode, newCost + heuristic(successorLocation, problem))
-                    visitedNodes.append((successorLocation, newCost))
-    return actions
+
+        # lower the weight and repair: reopen the inconsistent states and
+        # reorder the fringe under the new weight
+        weight = max(1.0, weight - weightStep)
+        openStates = list(fringe.index) + list(inconsistentStates)
+        fringe.heapify([(state, costs[state] + weight * estimate(state)) for state in openStates])
+        closedStates, inconsistentStates = set(), set()
 
 
 # Abbreviations
@@ -265,3 +818,9 @@ bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
 ucs = uniformCostSearch
+jps = jumpPointSearch
+bibfs = bidirectionalSearch
+biastar = bidirectionalAStarSearch
+idastar = iterativeDeepeningAStar
+arastar = anytimeAStar
+greedy = greedySearch
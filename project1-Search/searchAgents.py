@@ -37,10 +37,17 @@ Good luck and happy searching!
 from game import Directions
 from game import Agent
 from game import Actions
+from game import Grid
 import util
 import time
+import array
+import functools
 import search
 import math
+import distanceOracle
+import searchStats
+from foodHeuristics import mstFoodHeuristic
+from landmarks import landmarkHeuristic
 
 
 class GoWestAgent(Agent):
@@ -71,19 +78,28 @@ class SearchAgent(Agent):
     Options for fn include:
       depthFirstSearch or dfs
       breadthFirstSearch or bfs
+      anytimeAStar or arastar, which also takes budget (seconds)
 
 
     Note: You should NOT change any code in SearchAgent
     """
 
-    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic'):
+    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic', budget=None):
         # Warning: some advanced Python magic is employed below to find the right functions and problems
 
         # Get the search function from the name and heuristic
         if fn not in dir(search):
             raise AttributeError(fn + ' is not a search function in search.py.')
         func = getattr(search, fn)
-        if 'heuristic' not in func.__code__.co_varnames:
+
+        # Anytime searches take a time budget in seconds, e.g. -a fn=anytimeAStar,budget=2
+        if budget != None:
+            if 'budget_seconds' not in func.__code__.co_varnames:
+                raise AttributeError(fn + ' does not take a time budget.')
+            print('[SearchAgent] using a budget of %s seconds' % budget)
+            func = functools.partial(func, budget_seconds=float(budget))
+
+        if 'heuristic' not in getattr(func, 'func', func).__code__.co_varnames:
             print('[SearchAgent] using function ' + fn)
             self.searchFunction = func
         else:
@@ -94,6 +110,8 @@ class SearchAgent(Agent):
             else:
                 raise AttributeError(heuristic + ' is not a function in searchAgents.py or search.py.')
             print('[SearchAgent] using function %s and heuristic %s' % (fn, heuristic))
+            if searchStats.isEnabled():
+                heur = searchStats.timedHeuristic(heur)
             # Note: this bit of Python trickery combines the search algorithm and the heuristic
             self.searchFunction = lambda x: func(x, heuristic=heur)
 
@@ -102,6 +120,7 @@ class SearchAgent(Agent):
             raise AttributeError(prob + ' is not a search problem type in SearchAgents.py.')
         self.searchType = globals()[prob]
         print('[SearchAgent] using problem type ' + prob)
+        self.searchLabels = {'fn': fn, 'heuristic': heuristic}
 
     def registerInitialState(self, state):
         """
@@ -115,10 +134,17 @@ class SearchAgent(Agent):
         if self.searchFunction == None: raise Exception("No search function provided for SearchAgent")
         starttime = time.time()
         problem = self.searchType(state)  # Makes a new search problem
-        self.actions = self.searchFunction(problem)  # Find a path
+        if searchStats.isEnabled():
+            self.actions, stats = searchStats.collect(self.searchFunction, problem)
+        else:
+            self.actions = self.searchFunction(problem)  # Find a path
+        if 'expandActions' in dir(problem): self.actions = problem.expandActions(self.actions)
         totalCost = problem.getCostOfActions(self.actions)
         print('Path found with total cost of %d in %.1f seconds' % (totalCost, time.time() - starttime))
         if '_expanded' in dir(problem): print('Search nodes expanded: %d' % problem._expanded)
+        if searchStats.isEnabled():
+            labels = dict(getattr(self, 'searchLabels', {}), agent=type(self).__name__, prob=type(problem).__name__)
+            searchStats.write(stats, cost=totalCost, **labels)
 
     def getAction(self, state):
         """
@@ -157,6 +183,8 @@ class PositionSearchProblem(search.SearchProblem):
         goal: A position in the gameState
         """
         self.walls = gameState.getWalls()
+        self.layout = gameState.data.layout
+        self.moves = self.layout.getSuccessorTable().byPosition
         self.startState = gameState.getPacmanPosition()
         if start != None: self.startState = start
         self.goal = goal
@@ -194,17 +222,12 @@ class PositionSearchProblem(search.SearchProblem):
          successor to the current state, 'action' is the action
          required to get there, and 'stepCost' is the incremental
          cost of expanding to that successor
+
+        The legal moves come from the layout's precomputed SuccessorTable.
         """
 
-        successors = []
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x, y = state
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextState = (nextx, nexty)
-                cost = self.costFn(nextState)
-                successors.append((nextState, action, cost))
+        costFn = self.costFn
+        successors = [(nextState, action, costFn(nextState)) for nextState, action in self.moves[state]]
 
         # Bookkeeping for display purposes
         self._expanded += 1  # DO NOT CHANGE
@@ -214,6 +237,24 @@ class PositionSearchProblem(search.SearchProblem):
 
         return successors
 
+    def getPredecessors(self, state):
+        """
+        Returns the (predecessor, action, stepCost) triples of a state.  Moves
+        can be undone, so the predecessors are the neighbors, but the cost of
+        entering state is costFn(state) whichever neighbor it is entered from.
+        """
+        stepCost = self.costFn(state)
+        predecessors = [(previousState, Directions.REVERSE[action], stepCost)
+                        for previousState, action in self.moves[state]]
+
+        # Bookkeeping for display purposes
+        self._expanded += 1  # DO NOT CHANGE
+        if state not in self._visited:
+            self._visited[state] = True
+            self._visitedlist.append(state)
+
+        return predecessors
+
     def getCostOfActions(self, actions):
         """
         Returns the cost of a particular sequence of actions. If those actions
@@ -231,6 +272,90 @@ class PositionSearchProblem(search.SearchProblem):
         return cost
 
 
+class CompressedPositionSearchProblem(PositionSearchProblem):
+    """
+    The PositionSearchProblem on the layout's CorridorGraph (layout.py): the
+    search only visits junctions, dead ends, the start and the goal, and each
+    successor follows a whole corridor run.
+
+    The action of a successor is a macro action: the tuple of primitive moves
+    along the corridor.  expandActions turns a path of macro actions back into
+    primitive moves; SearchAgent does that before following the path.  Step
+    costs are the sum of costFn over the cells entered, so ucs and astar still
+    find optimal paths.
+    """
+
+    def __init__(self, gameState, costFn=lambda x: 1, goal=(1, 1), start=None, warn=True, visualize=True):
+        PositionSearchProblem.__init__(self, gameState, costFn, goal, start, warn, visualize)
+        self.graph = gameState.data.layout.getCorridorGraph()
+        # the start and goal must be stops even when they are in a corridor
+        self.stops = set(position for position in (self.startState, self.goal) if not self.graph.isNode(position))
+        self.successorCache = {}
+
+    def getSuccessors(self, state):
+        """
+        Returns (nextStop, macroAction, cost) triples, one per move out of state.
+        """
+        if state not in self.successorCache:
+            self.successorCache[state] = self._computeSuccessors(state)
+
+        # Bookkeeping for display purposes
+        self._expanded += 1  # DO NOT CHANGE
+        if state not in self._visited:
+            self._visited[state] = True
+            self._visitedlist.append(state)
+
+        return self.successorCache[state]
+
+    def getPredecessors(self, state):
+        """
+        Returns (previousStop, macroAction, cost) triples: every corridor run
+        out of state, walked the other way.  The run now enters state instead
+        of previousStop, which changes its cost when costFn is not uniform.
+        """
+        costFn = self.costFn
+        return [(previousStop, tuple(Directions.REVERSE[action] for action in reversed(actions)),
+                 cost - costFn(previousStop) + costFn(state))
+                for previousStop, actions, cost in self.getSuccessors(state)]
+
+    def _computeSuccessors(self, state):
+        isStop = lambda position: position in self.stops
+        if self.graph.isNode(state):
+            edges = []
+            for nextNode, actions, cells in self.graph.edges[state]:
+                # cut the corridor at the start or goal if it lies inside it
+                for i in range(len(cells) - 1):
+                    if cells[i] in self.stops:
+                        nextNode, actions, cells = cells[i], actions[:i + 1], cells[:i + 1]
+                        break
+                edges.append((nextNode, actions, cells))
+        else:
+            edges = [self.graph.walk(state, nextPosition, action, isStop)
+                     for nextPosition, action in self.moves[state]]
+
+        costFn = self.costFn
+        return [(nextStop, actions, sum(costFn(cell) for cell in cells)) for nextStop, actions, cells in edges]
+
+    def expandActions(self, actions):
+        """
+        Flattens a list of macro actions into a list of primitive actions.
+        """
+        primitiveActions = []
+        for action in actions:
+            if isinstance(action, tuple):
+                primitiveActions.extend(action)
+            else:
+                primitiveActions.append(action)
+        return primitiveActions
+
+    def getCostOfActions(self, actions):
+        """
+        Returns the cost of a list of macro or primitive actions.
+        """
+        if actions == None: return 999999
+        return PositionSearchProblem.getCostOfActions(self, self.expandActions(actions))
+
+
 class StayEastSearchAgent(SearchAgent):
     """
     An agent for position search with a cost function that penalizes being in
@@ -289,6 +414,9 @@ class CornersProblem(search.SearchProblem):
         Stores the walls, pacman's starting position and corners.
         """
         self.walls = startingGameState.getWalls()
+        successorTable = startingGameState.data.layout.getSuccessorTable()
+        self.moves = successorTable.byPosition
+        self.cellIds = successorTable.cellIds
         self.startingPosition = startingGameState.getPacmanPosition()
         top, right = self.walls.height - 2, self.walls.width - 2
         self.corners = ((1, 1), (1, top), (right, 1), (right, top))
@@ -301,22 +429,18 @@ class CornersProblem(search.SearchProblem):
         # Please add any code here which you would like to use
         # in initializing the problem
 
-        self.gameState = startingGameState
-        visitedCorners = [False, False, False, False]
+        self.startingGameState = startingGameState
+        self.heuristicInfo = {}  # A dictionary for the heuristic to store information
 
-        # check to see if our starting position is in one of the four corners and
-        # change that bool to true if check is true
-        if self.startingPosition == self.corners[0]:
-            visitedCorners[0] = True
-        elif self.startingPosition == self.corners[1]:
-            visitedCorners[1] = True
-        elif self.startingPosition == self.corners[2]:
-            visitedCorners[2] = True
-        elif self.startingPosition == self.corners[3]:
-            visitedCorners[3] = True
+        # A state is (position, visitedMask), where bit i of the mask is set
+        # once corner i has been visited.  cornerBits maps a corner position
+        # to its bit (or bits, when a tiny layout has coinciding corners).
+        self.cornerBits = {}
+        for i, corner in enumerate(self.corners):
+            self.cornerBits[corner] = self.cornerBits.get(corner, 0) | (1 << i)
+        self.allCorners = (1 << len(self.corners)) - 1
 
-        # initialize the starting state to the position and state of the corners
-        self.startingState = (self.startingPosition, visitedCorners)
+        self.startingState = (self.startingPosition, self.cornerBits.get(self.startingPosition, 0))
 
     def getStartState(self):
         """
@@ -329,15 +453,8 @@ class CornersProblem(search.SearchProblem):
         """
         Returns whether this search state is a goal state of the problem.
         """
-        # set our visitedCorners variable to the state visitedCorners value
-        visitedCorners = state[1]
-
-        # if all corners are visited, mission accomplished
-        if visitedCorners[0] and visitedCorners[1] and visitedCorners[2] and visitedCorners[3]:
-            return True
-        # if all corners are not visited, keep going
-        else:
-            return False
+        # all four bits set: mission accomplished
+        return state[1] == self.allCorners
 
     def getSuccessors(self, state):
         """
@@ -350,36 +467,13 @@ class CornersProblem(search.SearchProblem):
             is the incremental cost of expanding to that successor
         """
 
-        successors = []
-        # Add a successor state to the successor list if the action is legal
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            # set (x,y) to our state position
-            x, y = state[0]
-            # Determine which direction we will move
-            dx, dy = Actions.directionToVector(action)
-            # set our next location based on above data
-            nextx, nexty = int(x + dx), int(y + dy)
-            hitsWall = self.walls[nextx][nexty]
-
-            # validate if we hit a wall from the variable we assigned the wall check value to
-            if not hitsWall:
-                nextLocation = (nextx, nexty)
-
-                # Create a new list of the corners for a deep copy so we return the correct values
-                # and don't change the original data
-                visitedCorners = list(state[1])
-
-                if nextLocation == self.corners[0]:
-                    visitedCorners[0] = True
-                elif nextLocation == self.corners[1]:
-                    visitedCorners[1] = True
-                elif nextLocation == self.corners[2]:
-                    visitedCorners[2] = True
-                elif nextLocation == self.corners[3]:
-                    visitedCorners[3] = True
-
-                cost = 1
-                successors.append(((nextLocation, visitedCorners), action, cost))
+        # Add a successor state for every legal move out of our position; the
+        # moves come from the layout's precomputed SuccessorTable and stepping
+        # onto a corner sets its bit in the visited mask
+        position, visitedMask = state
+        cornerBits = self.cornerBits
+        successors = [((nextLocation, visitedMask | cornerBits.get(nextLocation, 0)), action, 1)
+                      for nextLocation, action in self.moves[position]]
 
         self._expanded += 1  # DO NOT CHANGE
         return successors
@@ -410,33 +504,75 @@ def cornersHeuristic(state, problem):
     This function should always return a number that is a lower bound on the
     shortest path from the state to a goal of the problem; i.e.  it should be
     admissible (as well as consistent).
+
+    With exact maze distances from every cell to every corner and between the
+    corners, the cheapest order to visit the unvisited corners is the true
+    remaining cost, so this heuristic is exact.  The table is built once per
+    problem, see getCornerTable.
     """
-    # These are the corner coordinates
-    corners = problem.corners
-    # These are the walls of the maze, as a Grid (game.py)
-    walls = problem.walls
+    position, visitedMask = state
+    if visitedMask == problem.allCorners:
+        return 0
+    cellDistances, tours = getCornerTable(problem)
+    distances = cellDistances[problem.cellIds[position]]
+
+    # walk to an unvisited corner first, then follow the best tour from it
+    heuristic = float('inf')
+    for i in range(len(problem.corners)):
+        bit = 1 << i
+        if not visitedMask & bit:
+            heuristic = min(heuristic, distances[i] + tours[visitedMask | bit][i])
+    return heuristic
 
-    heuristic = -1  # initialize our starting heuristic
-    currentLocation, visitedCorners = state
-    unvisitedCorners = []  # List of corners we have visited
 
-    # Find all of the corners that we have not visited yet and add them to
-    # our list so we can traverse through them
-    for i in range(0, len(corners) - 1):
-        if not visitedCorners[i]:
-            unvisitedCorners.append(problem.corners[i])
+def getCornerTable(problem):
+    """
+    Returns (cellDistances, tours), built on first use and kept in
+    problem.heuristicInfo['cornerTable']:
 
-    # If we have visited all corners, return the heuristic value of 0
-    if len(unvisitedCorners) == 0:
-        return 0
+      cellDistances[cellId][i]: maze distance from the cell to corner i
+      tours[mask][i]:           length of the shortest walk that starts at
+                                corner i and visits every corner not in mask
 
-    # find the closest corner, assuming there are no walls using euclidean approach
-    for pos in unvisitedCorners:
-        estimatedDistance = mazeDistance(currentLocation, pos, problem.gameState)
-        if estimatedDistance > heuristic:
-            heuristic = estimatedDistance
-    # print("Heuristic value = " + str(heuristic))
-    return heuristic
+    One breadth first search runs from each corner, and the tours come from
+    a dynamic program over the 16 visited masks.
+    """
+    if 'cornerTable' in problem.heuristicInfo:
+        return problem.heuristicInfo['cornerTable']
+
+    successorTable = problem.startingGameState.data.layout.getSuccessorTable()
+    corners = problem.corners
+    numCorners = len(corners)
+
+    cornerDistances = []
+    for corner in corners:
+        distances = [float('inf')] * successorTable.numCells
+        source = successorTable.cellIds[corner]
+        distances[source] = 0
+        frontier = [source]
+        while frontier:
+            nextFrontier = []
+            for cell in frontier:
+                for neighbor in successorTable.getNeighborCells(cell):
+                    if distances[neighbor] == float('inf'):
+                        distances[neighbor] = distances[cell] + 1
+                        nextFrontier.append(neighbor)
+            frontier = nextFrontier
+        cornerDistances.append(distances)
+    cellDistances = list(zip(*cornerDistances))
+
+    # between[i][j]: maze distance from corner i to corner j
+    between = [[cellDistances[successorTable.cellIds[corner]][j] for j in range(numCorners)]
+               for corner in corners]
+    allCorners = (1 << numCorners) - 1
+    tours = [[0] * numCorners for mask in range(allCorners + 1)]
+    for mask in reversed(range(allCorners)):
+        for i in range(numCorners):
+            tours[mask][i] = min(between[i][j] + tours[mask | (1 << j)][j]
+                                 for j in range(numCorners) if not mask & (1 << j))
+
+    problem.heuristicInfo['cornerTable'] = (cellDistances, tours)
+    return cellDistances, tours
 
 
 class AStarCornersAgent(SearchAgent):
@@ -447,41 +583,143 @@ class AStarCornersAgent(SearchAgent):
         self.searchType = CornersProblem
 
 
+# Number of set bits in an int; int.bit_count only exists from Python 3.10
+if hasattr(int, 'bit_count'):
+    popcount = int.bit_count
+else:
+    popcount = lambda bits: bin(bits).count('1')
+
+
+class FoodBitset:
+    """
+    An immutable set of food positions packed into a single Python int: bit i
+    is set when the open cell with id i (see FoodSearchProblem) has food.
+    Removing a pellet, hashing, equality and count() are all integer
+    operations, and successors share the cell tables instead of copying a Grid.
+
+    It keeps the read-only part of the game.Grid interface that heuristics
+    use: count(), asList() and foodGrid[x][y].  asGrid() builds a real Grid.
+    """
+    __slots__ = ('bits', 'cellIds', 'cellPositions', 'width', 'height')
+
+    def __init__(self, bits, cellIds, cellPositions, width, height):
+        self.bits = bits
+        self.cellIds = cellIds
+        self.cellPositions = cellPositions
+        self.width = width
+        self.height = height
+
+    def without(self, position):
+        """
+        Returns the bitset with the pellet at position removed.
+        """
+        cellId = self.cellIds.get(position)
+        if cellId is None or not (self.bits >> cellId) & 1:
+            return self
+        return FoodBitset(self.bits & ~(1 << cellId), self.cellIds, self.cellPositions, self.width, self.height)
+
+    def count(self, item=True):
+        if item:
+            return popcount(self.bits)
+        return self.width * self.height - popcount(self.bits)
+
+    def asList(self, key=True):
+        """
+        Returns the food positions in the same x-major order as Grid.asList.
+        """
+        if not key:
+            return self.asGrid().asList(False)
+        positions = []
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            positions.append(self.cellPositions[lowest.bit_length() - 1])
+            bits ^= lowest
+        return positions
+
+    def asGrid(self):
+        """
+        Returns a game.Grid holding the same food.
+        """
+        grid = Grid(self.width, self.height, False)
+        for x, y in self.asList():
+            grid[x][y] = True
+        return grid
+
+    def __contains__(self, position):
+        cellId = self.cellIds.get(position)
+        return cellId is not None and (self.bits >> cellId) & 1 == 1
+
+    def __getitem__(self, x):
+        return [(x, y) in self for y in range(self.height)]
+
+    def __eq__(self, other):
+        return isinstance(other, FoodBitset) and self.bits == other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def __str__(self):
+        return str(self.asGrid())
+
+
 class FoodSearchProblem:
     """
     A search problem associated with finding the a path that collects all of the
     food (dots) in a Pacman game.
 
-    A search state in this problem is a tuple ( pacmanPosition, foodGrid ) where
+    A search state in this problem is a tuple ( pacmanPosition, foodBitset ) where
       pacmanPosition: a tuple (x,y) of integers specifying Pacman's position
-      foodGrid:       a Grid (see game.py) of either True or False, specifying remaining food
+      foodBitset:     a FoodBitset of the remaining food; it answers count() and
+                      asList() like the food Grid it replaces
+
+    Food bits are indexed by the cell ids of the layout's SuccessorTable
+    (layout.py), which distanceOracle.DistanceOracle uses as well.
     """
 
     def __init__(self, startingGameState):
-        self.start = (startingGameState.getPacmanPosition(), startingGameState.getFood())
         self.walls = startingGameState.getWalls()
         self.startingGameState = startingGameState
         self._expanded = 0  # DO NOT CHANGE
         self.heuristicInfo = {}  # A dictionary for the heuristic to store information
 
+        walls = self.walls
+        successorTable = startingGameState.data.layout.getSuccessorTable()
+        self.moves = successorTable.byPosition
+        self.cellPositions = successorTable.cellPositions
+        self.cellIds = successorTable.cellIds
+
+        foodBits = 0
+        for position in startingGameState.getFood().asList():
+            if position in self.cellIds:
+                foodBits |= 1 << self.cellIds[position]
+        food = FoodBitset(foodBits, self.cellIds, self.cellPositions, walls.width, walls.height)
+        self.start = (startingGameState.getPacmanPosition(), food)
+
     def getStartState(self):
         return self.start
 
     def isGoalState(self, state):
-        return state[1].count() == 0
+        return state[1].bits == 0
+
+    def encodeState(self, state):
+        """
+        Returns a compact, picklable form of state: (position, food bits).
+        parallelSearch sends states between processes in this form.
+        """
+        return state[0], state[1].bits
+
+    def decodeState(self, data):
+        "Rebuilds a state from encodeState's output."
+        position, foodBits = data
+        return position, FoodBitset(foodBits, self.cellIds, self.cellPositions, self.walls.width, self.walls.height)
 
     def getSuccessors(self, state):
         "Returns successor states, the actions they require, and a cost of 1."
         successors = []
         self._expanded += 1  # DO NOT CHANGE
-        for direction in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x, y = state[0]
-            dx, dy = Actions.directionToVector(direction)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextFood = state[1].copy()
-                nextFood[nextx][nexty] = False
-                successors.append((((nextx, nexty), nextFood), direction, 1))
+        for nextPosition, direction in self.moves[state[0]]:
+            successors.append(((nextPosition, state[1].without(nextPosition)), direction, 1))
         return successors
 
     def getCostOfActions(self, actions):
@@ -520,9 +758,9 @@ def foodHeuristic(state, problem):
     other hand, inadmissible or inconsistent heuristics may find optimal
     solutions, so be careful.
 
-    The state is a tuple ( pacmanPosition, foodGrid ) where foodGrid is a Grid
-    (see game.py) of either True or False. You can call foodGrid.asList() to get
-    a list of food coordinates instead.
+    The state is a tuple ( pacmanPosition, foodGrid ) where foodGrid is a
+    FoodBitset (see above) of the remaining food. You can call foodGrid.asList()
+    to get a list of food coordinates, just like with a food Grid.
 
     If you want access to info like walls, capsules, etc., you can query the
     problem.  For example, problem.walls gives you a Grid of where the walls
@@ -535,41 +773,22 @@ def foodHeuristic(state, problem):
     Subsequent calls to this heuristic can access
     problem.heuristicInfo['wallCount']
     """
-    position, foodGrid = state
-    heuristic = -1  # initialize our heuristic, which will not return a negative number. If so, we did something wrong
-    maxDistance = 0  # initialize maximum distance, which will always be greater than 0
-    food = foodGrid.asList()
-
-    # Check there is food to eat for our problem, otherwise we return 0
-    if len(food) == 0:
-        return 0
-
-    # Find the farthest distance using mazeDistance(). This will ensure we visit more food along the way, thus
-    # optimizing our path as we go. Since we are calling mazeDistance, this solution is optimal in node expansion
-    # but not for time efficiency
-    for pellets in food:
-        maxDistance = mazeDistance(position, pellets, problem.startingGameState)
-        if maxDistance > heuristic:
-            heuristic = maxDistance
-
-    return heuristic
+    # Nearest pellet plus a minimum spanning tree over the remaining pellets,
+    # both with exact maze distances; see foodHeuristics.py
+    return mstFoodHeuristic(state, problem)
 
 
 class ClosestDotSearchAgent(SearchAgent):
     "Search for all food using a sequence of searches"
 
     def registerInitialState(self, state):
-        self.actions = []
-        currentState = state
-        while (currentState.getFood().count() > 0):
-            nextPathSegment = self.findPathToClosestDot(currentState)  # The missing piece
-            self.actions += nextPathSegment
-            for action in nextPathSegment:
-                legal = currentState.getLegalActions()
-                if action not in legal:
-                    t = (str(action), str(currentState))
-                    raise Exception('findPathToClosestDot returned an illegal move: %s!\n%s' % t)
-                currentState = currentState.generateSuccessor(0, action)
+        # One ClosestDotWorkspace serves every query on the layout, so the
+        # whole greedy tour is planned without building GameStates or problems
+        layout = state.data.layout
+        if getattr(self, 'workspace', None) is None or self.workspace.layout is not layout:
+            self.workspace = ClosestDotWorkspace(layout)
+        foodBits = self.workspace.getFoodBits(state.getFood())
+        self.actions = self.workspace.greedyTour(state.getPacmanPosition(), foodBits)
         self.actionIndex = 0
         print('Path found with cost %d.' % len(self.actions))
 
@@ -578,37 +797,102 @@ class ClosestDotSearchAgent(SearchAgent):
         Returns a path (a list of actions) to the closest dot, starting from
         gameState.
         """
-        # Here are some useful elements of the startState
-        startPosition = gameState.getPacmanPosition()
-        food = gameState.getFood()
-        walls = gameState.getWalls()
+        # Breadth first search stops at the first food it reaches, which is
+        # the closest dot
         problem = AnyFoodSearchProblem(gameState)
+        return search.breadthFirstSearch(problem)
 
-        """
-        Skipped this section, as it was optional for my homework. Greedy search is suboptimal and is looking for the
-        closest pellet/dot, which is pretty straight forward. Code copied over from another source for reference.
-        Not guaranteed to work!
-        ****************************************************************************************
-        # Perform a BFS to find the closest dot.
-        fringe = util.Queue()
-        visited = []        # List of already visited nodes
-        action_list = []    # List of actions taken to get to the current node
-        total_cost = 0      # Cost to get to the current node
-        initial = problem.getStartState()   # Starting state of the problem
 
-        fringe.push((initial, action_list))
+class ClosestDotWorkspace:
+    """
+    A breadth first search workspace that answers repeated closest dot
+    queries on one layout.
+
+    The arrays are indexed by the cell ids of the layout's SuccessorTable and
+    allocated once.  Instead of clearing them before each query, every query
+    gets a new generation number and a cell counts as visited only when its
+    stamp equals the current generation, so a query only touches the cells it
+    visits.  Food is an int bitmask over the same cell ids.
+    """
 
-        while fringe: 
-            node, actions = fringe.pop() 
-            if not node in visited:
-                visited.append(node)
-                if problem.isGoalState(node):
-                    return actions
-                successors = problem.getSuccessors(node)
-                for successor in successors:
-                    coordinate, direction, cost = successor
-                    fringe.push((coordinate, actions + [direction]))
+    def __init__(self, layout):
+        self.layout = layout
+        self.table = layout.getSuccessorTable()
+        numCells = self.table.numCells
+        self.stamps = array.array('i', [0]) * numCells
+        self.parents = array.array('i', [0]) * numCells    # cell the search came from
+        self.moves = array.array('i', [0]) * numCells      # index of that move in the table
+        self.queue = array.array('i', [0]) * numCells
+        self.generation = 0
+
+    def getFoodBits(self, food):
+        """
+        Returns the food Grid as an int bitmask over cell ids.
+        """
+        cellIds = self.table.cellIds
+        foodBits = 0
+        for position in food.asList():
+            if position in cellIds:
+                foodBits |= 1 << cellIds[position]
+        return foodBits
+
+    def findClosestDot(self, startCell, foodBits):
+        """
+        Returns the id of the closest cell with food to startCell, or -1 if no
+        food can be reached.  pathTo then gives the moves to it.
         """
+        self.generation += 1
+        generation = self.generation
+        stamps, parents, moves, queue = self.stamps, self.parents, self.moves, self.queue
+        offsets, neighborCells = self.table.offsets, self.table.neighborCells
+
+        stamps[startCell] = generation
+        parents[startCell] = -1
+        if (foodBits >> startCell) & 1:
+            return startCell
+        queue[0] = startCell
+        head, tail = 0, 1
+        while head < tail:
+            cell = queue[head]
+            head += 1
+            for move in range(offsets[cell], offsets[cell + 1]):
+                nextCell = neighborCells[move]
+                if stamps[nextCell] != generation:
+                    stamps[nextCell] = generation
+                    parents[nextCell] = cell
+                    moves[nextCell] = move
+                    if (foodBits >> nextCell) & 1:
+                        return nextCell
+                    queue[tail] = nextCell
+                    tail += 1
+        return -1
+
+    def pathTo(self, cell):
+        """
+        Returns the actions from the start of the last query to cell.
+        """
+        actions, actionCodes = self.table.ACTIONS, self.table.actionCodes
+        path = []
+        while self.parents[cell] != -1:
+            path.append(actions[actionCodes[self.moves[cell]]])
+            cell = self.parents[cell]
+        path.reverse()
+        return path
+
+    def greedyTour(self, position, foodBits):
+        """
+        Returns the actions of the greedy tour from position that always walks
+        to the closest remaining dot, until no food can be reached.
+        """
+        tour = []
+        cell = self.table.cellIds[position]
+        while foodBits:
+            cell = self.findClosestDot(cell, foodBits)
+            if cell == -1:
+                break
+            tour.extend(self.pathTo(cell))
+            foodBits &= ~(1 << cell)
+        return tour
 
 
 class AnyFoodSearchProblem(PositionSearchProblem):
@@ -633,6 +917,8 @@ class AnyFoodSearchProblem(PositionSearchProblem):
 
         # Store info for the PositionSearchProblem (no need to change this)
         self.walls = gameState.getWalls()
+        self.layout = gameState.data.layout
+        self.moves = self.layout.getSuccessorTable().byPosition
         self.startState = gameState.getPacmanPosition()
         self.costFn = lambda x: 1
         self._visited, self._visitedlist, self._expanded = {}, [], 0  # DO NOT CHANGE
@@ -643,9 +929,7 @@ class AnyFoodSearchProblem(PositionSearchProblem):
         complete the problem definition.
         """
         x, y = state
-
-        # Todo: Your code here
-        util.raiseNotDefined()
+        return self.food[x][y]
 
 
 def mazeDistance(point1, point2, gameState):
@@ -657,11 +941,14 @@ def mazeDistance(point1, point2, gameState):
     Example usage: mazeDistance( (2,4), (5,6), gameState)
 
     This might be a useful helper function for your ApproximateSearchAgent.
+
+    The distances come from the layout's DistanceOracle (distanceOracle.py),
+    which runs one BFS per open cell the first time a layout is used and
+    answers every later call with a table lookup.
     """
     x1, y1 = point1
     x2, y2 = point2
     walls = gameState.getWalls()
     assert not walls[x1][y1], 'point1 is a wall: ' + str(point1)
     assert not walls[x2][y2], 'point2 is a wall: ' + str(point2)
-    prob = PositionSearchProblem(gameState, start=point1, goal=point2, warn=False, visualize=False)
-    return len(search.bfs(prob))
+    return distanceOracle.getDistanceOracle(gameState.data.layout).distance(point1, point2)
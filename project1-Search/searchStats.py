@@ -0,0 +1,201 @@
+# searchStats.py
+# --------------
+# Instrumentation of the search functions in search.py.
+
+
+"""
+A SearchStats object counts what one run of a search function did:
+
+    generated          successors returned by getSuccessors/getPredecessors
+    expanded           calls to getSuccessors/getPredecessors (jump points for
+                       jumpPointSearch)
+    duplicatesPruned   generated or popped nodes dropped because their state
+                       was already reached at no higher cost
+    peakFrontier       most states waiting in the fringe(s) at once
+    peakClosed         most states in the closed set(s) / cost tables at once
+    heuristicCalls     calls to the heuristic, and heuristicSeconds in them
+    successorSeconds   time spent inside getSuccessors/getPredecessors
+    peakMemory         tracemalloc peak in bytes above the start of the search
+    seconds            wall time of the whole search
+
+collect(searchFunction, problem) runs a search with the problem instrumented
+and returns (actions, stats).  While it runs, problem.searchStats is the
+SearchStats and getSuccessors/getPredecessors are timed wrappers set on the
+problem instance; heuristics are only timed when wrapped with timedHeuristic.
+The search functions in search.py read problem.searchStats once and report
+fringe sizes and pruned duplicates to it.  Without collect there is no
+wrapper and no tracemalloc, and the only cost left in the searches is one
+None test per expanded node.
+
+pacman.py --searchStats json (or text) enables the statistics for every
+SearchAgent run; they are printed, or appended to --searchStatsFile.
+
+Example usage:
+    actions, stats = searchStats.collect(search.bfs, problem)
+    print(stats.expanded, stats.peakFrontier)
+    python pacman.py -l bigMaze -p SearchAgent -a fn=astar,heuristic=manhattanHeuristic -q --searchStats json
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+
+import search
+
+# Output format ('text' or 'json') and file set by enable; None means disabled
+OUTPUT_FORMAT = None
+OUTPUT_PATH = None
+
+COUNTERS = ['generated', 'expanded', 'duplicatesPruned', 'peakFrontier', 'peakClosed', 'heuristicCalls']
+TIMERS = ['heuristicSeconds', 'successorSeconds', 'seconds']
+
+
+class SearchStats:
+    """
+    Counters of one search run, see the module documentation.
+    """
+
+    def __init__(self):
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        for name in TIMERS:
+            setattr(self, name, 0.0)
+        self.peakMemory = None
+
+    def observe(self, frontierSize, closedSize):
+        """
+        Records the current fringe and closed set sizes; called by the search
+        functions once per expanded node.
+        """
+        if frontierSize > self.peakFrontier:
+            self.peakFrontier = frontierSize
+        if closedSize > self.peakClosed:
+            self.peakClosed = closedSize
+
+    def expansionsPerSecond(self):
+        if self.seconds <= 0:
+            return 0.0
+        return self.expanded / self.seconds
+
+    def asDict(self):
+        """
+        Returns the statistics as a dictionary of plain numbers.
+        """
+        record = dict((name, getattr(self, name)) for name in COUNTERS + TIMERS)
+        record['peakMemory'] = self.peakMemory
+        record['expansionsPerSecond'] = self.expansionsPerSecond()
+        return record
+
+    def __str__(self):
+        lines = ['%s: %d' % (name, getattr(self, name)) for name in COUNTERS]
+        lines += ['%s: %.4f' % (name, getattr(self, name)) for name in TIMERS]
+        lines.append('expansionsPerSecond: %.1f' % self.expansionsPerSecond())
+        if self.peakMemory is not None:
+            lines.append('peakMemory: %d' % self.peakMemory)
+        return '\n'.join(lines)
+
+
+def enable(outputFormat, outputPath=None):
+    """
+    Turns the statistics on for every SearchAgent created afterwards.
+
+    outputFormat: 'text' or 'json' (one object per line)
+    outputPath:   file the records are appended to; standard output if None
+    """
+    global OUTPUT_FORMAT, OUTPUT_PATH
+    if outputFormat not in ('text', 'json'):
+        raise ValueError('Unknown search statistics format: %s' % outputFormat)
+    OUTPUT_FORMAT, OUTPUT_PATH = outputFormat, outputPath
+
+
+def isEnabled():
+    return OUTPUT_FORMAT is not None
+
+
+def timedHeuristic(heuristic):
+    """
+    Returns heuristic wrapped so that its calls and time are added to the
+    searchStats of the problem it is called with, if there is one.
+    """
+    def timed(state, problem=None):
+        stats = getattr(problem, 'searchStats', None)
+        if stats is None:
+            return heuristic(state, problem)
+        startTime = time.perf_counter()
+        value = heuristic(state, problem)
+        stats.heuristicSeconds += time.perf_counter() - startTime
+        stats.heuristicCalls += 1
+        return value
+    timed.__name__ = heuristic.__name__
+    return timed
+
+
+def timedSuccessors(getSuccessors, stats):
+    """
+    Returns getSuccessors (or getPredecessors) wrapped to count expansions,
+    generated successors and their time in stats.
+    """
+    def timed(state):
+        startTime = time.perf_counter()
+        successors = getSuccessors(state)
+        stats.successorSeconds += time.perf_counter() - startTime
+        stats.expanded += 1
+        stats.generated += len(successors)
+        return successors
+    return timed
+
+
+def collect(searchFunction, problem, traceMemory=True):
+    """
+    Runs searchFunction(problem) with problem instrumented and returns
+    (actions, stats).  traceMemory=False skips tracemalloc, which slows
+    allocation heavy searches down severalfold; peakMemory is then None.
+    """
+    stats = SearchStats()
+    methods = ['getSuccessors']
+    # the default getPredecessors calls getSuccessors, which is already timed
+    if getattr(type(problem), 'getPredecessors', None) not in (None, search.SearchProblem.getPredecessors):
+        methods.append('getPredecessors')
+    for name in methods:
+        setattr(problem, name, timedSuccessors(getattr(problem, name), stats))
+    problem.searchStats = stats
+
+    startedTracing = traceMemory and not tracemalloc.is_tracing()
+    if startedTracing:
+        tracemalloc.start()
+    if traceMemory:
+        tracemalloc.reset_peak()
+        baseMemory = tracemalloc.get_traced_memory()[0]
+    startTime = time.perf_counter()
+    try:
+        actions = searchFunction(problem)
+    finally:
+        stats.seconds = time.perf_counter() - startTime
+        if traceMemory:
+            stats.peakMemory = tracemalloc.get_traced_memory()[1] - baseMemory
+        if startedTracing:
+            tracemalloc.stop()
+        for name in methods:
+            delattr(problem, name)
+        del problem.searchStats
+    return actions, stats
+
+
+def write(stats, **labels):
+    """
+    Writes stats in the format chosen with enable, together with labels such
+    as the search function and problem names.
+    """
+    record = stats.asDict()
+    record.update(labels)
+    if OUTPUT_FORMAT == 'json':
+        text = json.dumps(record, sort_keys=True) + '\n'
+    else:
+        header = ' '.join('%s=%s' % (key, labels[key]) for key in sorted(labels))
+        text = '[SearchStats] %s\n%s\n' % (header, str(stats))
+    if OUTPUT_PATH is None:
+        sys.stdout.write(text)
+    else:
+        with open(OUTPUT_PATH, 'a') as f:
+            f.write(text)
@@ -0,0 +1,76 @@
+# benchmarks/__init__.py
+# ----------------------
+# Helpers shared by the multi-agent benchmarks.  Run the benchmarks from the
+# project2-MultiagentSearch directory so the project modules and layouts are
+# found, e.g.
+#
+# > python -m benchmarks.compactGrid
+
+import time
+import tracemalloc
+
+import layout
+import pacman
+
+
+def loadGameState(layoutName, numGhosts=None, gridClass=None):
+    """
+    Returns the starting GameState for a shipped layout name, with every
+    ghost of the layout unless numGhosts is given.
+    """
+    lay = layout.getLayout(layoutName)
+    if lay == None:
+        raise Exception("The layout " + layoutName + " cannot be found")
+    if gridClass is not None:
+        lay = layout.Layout(lay.layoutText, gridClass)
+    if numGhosts is None:
+        numGhosts = lay.getNumGhosts()
+    state = pacman.GameState()
+    state.initialize(lay, numGhosts)
+    return state
+
+
+def timeCall(function, *args):
+    """
+    Calls function(*args) and returns (result, elapsed seconds).
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def bestTime(repeat, function, *args):
+    """
+    Calls function(*args) repeat times and returns (last result, fastest
+    elapsed seconds).
+    """
+    best = None
+    for _ in range(repeat):
+        result, seconds = timeCall(function, *args)
+        best = seconds if best is None else min(best, seconds)
+    return result, best
+
+
+def peakMemory(function, *args):
+    """
+    Calls function(*args) under tracemalloc and returns (result, peak bytes).
+    """
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def printTable(header, rows):
+    """
+    Prints rows (lists of values) as left aligned columns under header.
+    """
+    rows = [[str(value) for value in row] for row in rows]
+    widths = [max(len(str(h)), *[len(row[i]) for row in rows]) if rows else len(str(h))
+              for i, h in enumerate(header)]
+    print('  '.join(str(h).ljust(w) for h, w in zip(header, widths)))
+    for row in rows:
+        print('  '.join(value.ljust(w) for value, w in zip(row, widths)))
@@ -0,0 +1,88 @@
+# benchmarks/agentStates.py
+# -------------------------
+# Nodes per second and memory of the multi-agent searches, which create a
+# GameState, and used to create an AgentState and Configuration per agent,
+# for every node:
+#
+#   nodes       generateSuccessor calls made by one getAction from the start
+#               of the layout (counted in a separate run)
+#   nodes/s     nodes divided by the time of an untraced getAction
+#   retained    memory still allocated after getAction (tracemalloc);
+#               GameState.explored keeps every generated state
+#   peak        the most memory allocated at once during getAction
+#
+# The script only uses the game API, so the same file can be run against
+# older versions of the code to compare.
+#
+# > python -m benchmarks.agentStates
+# > python -m benchmarks.agentStates --depth 2 --agents AlphaBetaAgent mediumClassic
+# > python -m benchmarks.agentStates originalClassic     (about 6 s per agent)
+
+import random
+import sys
+import tracemalloc
+from optparse import OptionParser
+
+import multiAgents
+import pacman
+from benchmarks import loadGameState, timeCall, printTable
+
+LAYOUTS = ['smallClassic', 'mediumClassic']
+AGENTS = ['MinimaxAgent', 'ExpectimaxAgent', 'AlphaBetaAgent']
+
+
+def decide(agentName, depth, state):
+    random.seed(0)
+    pacman.GameState.getAndResetExplored()
+    agent = getattr(multiAgents, agentName)(depth=str(depth))
+    return agent.getAction(state)
+
+
+def countNodes(agentName, depth, state):
+    """
+    Returns the number of generateSuccessor calls getAction makes.
+    """
+    generateSuccessor = pacman.GameState.generateSuccessor
+    calls = [0]
+
+    def counted(self, agentIndex, action):
+        calls[0] += 1
+        return generateSuccessor(self, agentIndex, action)
+    pacman.GameState.generateSuccessor = counted
+    try:
+        decide(agentName, depth, state)
+    finally:
+        pacman.GameState.generateSuccessor = generateSuccessor
+    return calls[0]
+
+
+def benchmark(layoutName, agentName, depth, repeat):
+    state = loadGameState(layoutName)
+    nodes = countNodes(agentName, depth, state)
+    seconds = min(timeCall(decide, agentName, depth, state)[1] for _ in range(repeat))
+
+    tracemalloc.start()
+    try:
+        decide(agentName, depth, state)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    pacman.GameState.getAndResetExplored()
+    return [layoutName, agentName, depth, nodes, '%.3f' % seconds, '%.0f' % (nodes / seconds),
+            retained, peak, '%.0f' % (float(retained) / nodes)]
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.agentStates [options] [layouts]')
+    parser.add_option('--depth', dest='depth', type='int', default=4,
+                      help='Search depth [Default: %default]')
+    parser.add_option('--agents', dest='agents', default=','.join(AGENTS),
+                      help='Comma separated multiAgents classes [Default: %default]')
+    parser.add_option('--repeat', dest='repeat', type='int', default=3,
+                      help='Timed runs; the fastest is kept [Default: %default]')
+    options, names = parser.parse_args(sys.argv[1:])
+
+    rows = [benchmark(name, agentName, options.depth, options.repeat)
+            for name in (names or LAYOUTS) for agentName in options.agents.split(',')]
+    printTable(['layout', 'agent', 'depth', 'nodes', 'seconds', 'nodes/s', 'retained B', 'peak B',
+                'retained B/node'], rows)
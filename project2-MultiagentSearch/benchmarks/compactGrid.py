@@ -0,0 +1,133 @@
+# benchmarks/compactGrid.py
+# -------------------------
+# Grid against CompactGrid on the food grids of the shipped layouts (and a
+# tiled copy of originalClassic for a large grid):
+#
+#   count      food.count()
+#   asList     food.asList()
+#   copy       food.copy(), as done for every generated successor
+#   hash       hash(food), as done by GameStateData.__hash__
+#   read       every cell read once through food[x][y]
+#   distSum    sum of the Manhattan distances from Pacman to every pellet
+#   nearest    Manhattan distance from Pacman to the closest pellet
+#   memory     tracemalloc peak while building the Layout from its text, after
+#              the position index CompactGrid shares between all grids of
+#              one size (game.compactGridIndex) has been built
+#
+# For Grid, distSum and nearest loop over asList() like the evaluation
+# functions in multiAgents.py do; for CompactGrid they are distanceSum and
+# nearestDistance.  Times are the fastest of --repeat runs of --number calls.
+#
+# > python -m benchmarks.compactGrid
+# > python -m benchmarks.compactGrid --number 200 mediumClassic
+
+import sys
+from optparse import OptionParser
+
+import layout
+from benchmarks import bestTime, peakMemory, printTable
+from game import Grid, CompactGrid, compactGridIndex
+from util import manhattanDistance
+
+LAYOUTS = ['testClassic', 'smallClassic', 'mediumClassic', 'originalClassic', 'trickyClassic']
+OPERATIONS = ['count', 'asList', 'copy', 'hash', 'read', 'distSum', 'nearest']
+
+
+def tiledLayoutText(layoutName, times):
+    """
+    Returns the text of a layout repeated times times in both directions.
+    """
+    rows = layout.getLayout(layoutName).layoutText
+    return [row * times for row in rows] * times
+
+
+def readAll(grid):
+    width, height = grid.width, grid.height
+    total = 0
+    for x in range(width):
+        column = grid[x]
+        for y in range(height):
+            if column[y]:
+                total += 1
+    return total
+
+
+def gridOperations(pacman):
+    """
+    Returns name -> function(grid) for a Grid.
+    """
+    return {
+        'count': lambda grid: grid.count(),
+        'asList': lambda grid: grid.asList(),
+        'copy': lambda grid: grid.copy(),
+        'hash': lambda grid: hash(grid),
+        'read': readAll,
+        'distSum': lambda grid: sum(manhattanDistance(pacman, food) for food in grid.asList()),
+        'nearest': lambda grid: min([manhattanDistance(pacman, food) for food in grid.asList()] or [None]),
+    }
+
+
+def compactOperations(pacman):
+    """
+    Returns name -> function(grid) for a CompactGrid.
+    """
+    operations = gridOperations(pacman)
+    operations['distSum'] = lambda grid: grid.distanceSum(pacman)
+    operations['nearest'] = lambda grid: grid.nearestDistance(pacman)
+    return operations
+
+
+def repeatCall(number, function, grid):
+    for _ in range(number):
+        result = function(grid)
+    return result
+
+
+def benchmarkLayout(name, layoutText, number, repeat):
+    """
+    Returns table rows comparing both grids on one layout, and checks that
+    they give the same answers.
+    """
+    layouts = {}
+    memory = {}
+    compactGridIndex(len(layoutText[0]), len(layoutText))
+    for gridClass in (Grid, CompactGrid):
+        layouts[gridClass], memory[gridClass] = peakMemory(layout.Layout, layoutText, gridClass)
+    pacman = [position for isPacman, position in layouts[Grid].agentPositions if isPacman][0]
+    functions = {Grid: gridOperations(pacman), CompactGrid: compactOperations(pacman)}
+
+    rows = []
+    for operation in OPERATIONS:
+        results, seconds = {}, {}
+        for gridClass in (Grid, CompactGrid):
+            food = layouts[gridClass].food
+            results[gridClass], seconds[gridClass] = bestTime(repeat, repeatCall, number,
+                                                              functions[gridClass][operation], food)
+        if operation not in ('copy', 'hash') and results[Grid] != results[CompactGrid]:
+            raise Exception('%s differs on %s: %s != %s' % (operation, name, results[Grid], results[CompactGrid]))
+        rows.append([name, operation, '%.6f' % (seconds[Grid] / number), '%.6f' % (seconds[CompactGrid] / number),
+                     '%.1fx' % (seconds[Grid] / max(seconds[CompactGrid], 1e-9))])
+    rows.append([name, 'memory', memory[Grid], memory[CompactGrid],
+                 '%.1fx' % (float(memory[Grid]) / memory[CompactGrid])])
+    return rows
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.compactGrid [options] [layouts]')
+    parser.add_option('--number', dest='number', type='int', default=50,
+                      help='Calls per timing [Default: %default]')
+    parser.add_option('--repeat', dest='repeat', type='int', default=5,
+                      help='Timings per operation; the fastest is kept [Default: %default]')
+    parser.add_option('--tile', dest='tile', type='int', default=8,
+                      help='Times originalClassic is tiled in each direction for the large grid, 0 for none '
+                           '[Default: %default]')
+    options, names = parser.parse_args(sys.argv[1:])
+
+    cases = [(name, layout.getLayout(name).layoutText) for name in (names or LAYOUTS)]
+    if options.tile and not names:
+        cases.append(('originalClassic x%d' % options.tile, tiledLayoutText('originalClassic', options.tile)))
+    rows = []
+    for name, layoutText in cases:
+        rows += benchmarkLayout(name, layoutText, options.number, options.repeat)
+    printTable(['layout', 'operation', 'Grid s', 'CompactGrid s', 'speedup'], rows)
+    print('memory rows are peak bytes while building the layout, walls and food included')
@@ -0,0 +1,163 @@
+# benchmarks/foodSharing.py
+# -------------------------
+# Memory and time of the copies game states make of their food and layout:
+#
+#   minimax   one MinimaxAgent / ExpectimaxAgent decision from the start of
+#             a layout.  GameState.explored keeps every generated state, so
+#             the retained bytes are what the search leaves behind.
+#   game      a whole game of GreedyAgent against RandomGhosts, where
+#             Game.run deep copies the state for every move
+#   deepCopy  GameState.deepCopy of the starting state
+#
+# First it checks that observations are copies: writing to the food, walls
+# and capsules of a deep copy must leave the state it came from, and the
+# states sharing food columns with it, unchanged, and a game whose Pacman
+# scribbles over every observation must play out like one whose Pacman does
+# not.
+#
+# "retained" is the memory still allocated at the end (tracemalloc), "peak"
+# the most allocated at once.  Times are measured in a separate run
+# without tracemalloc.  The script only uses the game API, so the same file
+# can be run against older versions of the code to compare.
+#
+# > python -m benchmarks.foodSharing
+# > python -m benchmarks.foodSharing --depth 3 mediumClassic
+
+import random
+import sys
+import tracemalloc
+from optparse import OptionParser
+
+import multiAgents
+import pacman
+import textDisplay
+from benchmarks import loadGameState, timeCall, printTable
+from ghostAgents import RandomGhost
+from pacmanAgents import GreedyAgent
+
+LAYOUTS = ['smallClassic', 'mediumClassic', 'originalClassic']
+DEEP_COPIES = 200
+
+
+def scribble(state):
+    """
+    Clears the food, walls and capsules of state in place.
+    """
+    food, walls = state.getFood(), state.getWalls()
+    for x in range(food.width):
+        for y in range(food.height):
+            food[x][y] = False
+            walls[x][y] = False
+    del state.getCapsules()[:]
+
+
+class ScribblingAgent(GreedyAgent):
+    "A GreedyAgent that clears its observation after choosing its action."
+
+    def getAction(self, state):
+        action = GreedyAgent.getAction(self, state)
+        scribble(state)
+        return action
+
+
+def playRecorded(layoutName, agent):
+    random.seed(0)
+    state = loadGameState(layoutName)
+    lay = state.data.layout
+    ghosts = [RandomGhost(i + 1) for i in range(lay.getNumGhosts())]
+    game = pacman.ClassicGameRules().newGame(lay, agent, ghosts, textDisplay.NullGraphics(), quiet=True)
+    game.run()
+    return game.moveHistory, game.state.getScore()
+
+
+def checkObservations(layoutName, moves=40):
+    """
+    Raises an Exception if writing to an observation changes a game state.
+    """
+    rng = random.Random(0)
+    states = [loadGameState(layoutName)]
+    for move in range(moves):
+        state = states[-1]
+        if state.isWin() or state.isLose():
+            break
+        agentIndex = move % state.getNumAgents()
+        states.append(state.generateSuccessor(agentIndex, rng.choice(state.getLegalActions(agentIndex))))
+    before = [str(state) for state in states]
+    for state in states:
+        scribble(state.deepCopy())
+    if [str(state) for state in states] != before:
+        raise Exception('Writing to an observation changed a game state on ' + layoutName)
+    if playRecorded(layoutName, GreedyAgent()) != playRecorded(layoutName, ScribblingAgent()):
+        raise Exception('Writing to observations changed a game on ' + layoutName)
+    pacman.GameState.getAndResetExplored()
+
+
+def measured(function, *args):
+    """
+    Calls function(*args), which returns (count, objects to keep alive),
+    twice and returns (count, seconds, retained bytes, peak bytes): the time
+    of a plain run and the memory of a traced one.
+    """
+    random.seed(0)
+    pacman.GameState.getAndResetExplored()
+    _, seconds = timeCall(function, *args)
+    random.seed(0)
+    pacman.GameState.getAndResetExplored()
+    tracemalloc.start()
+    try:
+        count, kept = function(*args)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return count, seconds, retained, peak
+
+
+def searchDecision(agentClass, state, depth):
+    agent = agentClass(depth=str(depth))
+    agent.getAction(state)
+    return len(pacman.GameState.explored), None
+
+
+def playGame(layoutName):
+    state = loadGameState(layoutName)
+    lay = state.data.layout
+    ghosts = [RandomGhost(i + 1) for i in range(lay.getNumGhosts())]
+    rules = pacman.ClassicGameRules()
+    game = rules.newGame(lay, GreedyAgent(), ghosts, textDisplay.NullGraphics(), quiet=True)
+    game.run()
+    return len(game.moveHistory), None
+
+
+def deepCopies(state):
+    copies = [state.deepCopy() for _ in range(DEEP_COPIES)]
+    return len(copies), copies
+
+
+def benchmarkLayout(name, depth):
+    state = loadGameState(name)
+    cases = [('minimax', 'states', searchDecision, multiAgents.MinimaxAgent, state, depth),
+             ('expectimax', 'states', searchDecision, multiAgents.ExpectimaxAgent, state, depth),
+             ('game', 'moves', playGame, name),
+             ('deepCopy', 'copies', deepCopies, state)]
+    rows = []
+    for case in cases:
+        label, unit, function, args = case[0], case[1], case[2], case[3:]
+        count, seconds, retained, peak = measured(function, *args)
+        rows.append([name, label, '%d %s' % (count, unit), '%.3f' % seconds, retained, peak,
+                     '%.0f' % (float(retained) / max(count, 1))])
+    return rows
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.foodSharing [options] [layouts]')
+    parser.add_option('--depth', dest='depth', type='int', default=3,
+                      help='Search depth of the minimax and expectimax decisions [Default: %default]')
+    options, names = parser.parse_args(sys.argv[1:])
+
+    for name in (names or LAYOUTS):
+        checkObservations(name)
+    print('Writing to observations leaves the game states unchanged')
+    rows = []
+    for name in (names or LAYOUTS):
+        rows += benchmarkLayout(name, options.depth)
+    printTable(['layout', 'case', 'size', 'seconds', 'retained B', 'peak B', 'retained B each'], rows)
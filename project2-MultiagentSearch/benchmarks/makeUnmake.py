@@ -0,0 +1,139 @@
+# benchmarks/makeUnmake.py
+# ------------------------
+# GameState.applyMove / undoMove against generateSuccessor.
+#
+# First a property check on random playouts (fixed seeds) over layouts with
+# capsules and several ghosts: at every visited state, for every agent's
+# every legal action,
+#
+#   - applyMove must give a state equal in every field to generateSuccessor:
+#     agents (position, direction, scared timer), food, capsules, score,
+#     score change, win and lose flags, eaten ghosts and the Zobrist hash
+#   - a random line of further applyMoves, undone in reverse order, must
+#     leave that state exactly as it was, and so must the undoMove
+#
+# Then MinimaxAgent, AlphaBetaAgent and ExpectimaxAgent decide from the start
+# of each layout with and without inPlace=True; both must pick the same
+# action, and the table shows the time of each.
+#
+# > python -m benchmarks.makeUnmake
+# > python -m benchmarks.makeUnmake --games 50 --depth 3 mediumClassic
+
+import random
+import sys
+from optparse import OptionParser
+
+import multiAgents
+import pacman
+from benchmarks import loadGameState, bestTime, printTable
+
+CHECK_LAYOUTS = ['capsuleClassic', 'mediumClassic', 'trickyClassic', 'smallClassic']
+TIME_LAYOUTS = ['smallClassic', 'mediumClassic']
+AGENTS = ['MinimaxAgent', 'AlphaBetaAgent', 'ExpectimaxAgent']
+
+
+def fields(state):
+    """
+    Returns everything a move can change in a state, as comparable values.
+    """
+    data = state.data
+    agents = [(agent.configuration.pos, agent.configuration.direction, agent.scaredTimer, agent.isPacman,
+               agent.start.pos) for agent in data.agentStates]
+    return (agents, str(data.food), list(data.capsules), data.score, data.scoreChange, data._win, data._lose,
+            list(data._eaten), data._foodEaten, data._capsuleEaten, data._agentMoved, data.zobristHash(),
+            data.computeZobrist())
+
+
+def checkState(state, rng, line):
+    """
+    Checks every legal move of every agent from state; returns the number
+    of moves checked.
+    """
+    before = fields(state)
+    checked = 0
+    for agentIndex in range(state.getNumAgents()):
+        for action in state.getLegalActions(agentIndex):
+            successor = state.generateSuccessor(agentIndex, action)
+            token = state.applyMove(agentIndex, action)
+            if fields(state) != fields(successor) or state != successor or hash(state) != hash(successor):
+                raise Exception('applyMove(%d, %s) differs from generateSuccessor:\n%s\n%s' %
+                                (agentIndex, action, state, successor))
+            applyRandomLine(state, rng, line)
+            state.undoMove(token)
+            if fields(state) != before:
+                raise Exception('undoMove(%d, %s) did not restore:\n%s' % (agentIndex, action, state))
+            checked += 1
+    return checked
+
+
+def applyRandomLine(state, rng, length):
+    """
+    Applies up to length random moves, with agents taking turns, and undoes
+    them in reverse order, checking that each undo restores the state.
+    """
+    if length == 0 or state.isWin() or state.isLose():
+        return
+    agentIndex = rng.randrange(state.getNumAgents())
+    actions = state.getLegalActions(agentIndex)
+    if not actions:
+        return
+    before = fields(state)
+    token = state.applyMove(agentIndex, rng.choice(actions))
+    applyRandomLine(state, rng, length - 1)
+    state.undoMove(token)
+    if fields(state) != before:
+        raise Exception('undoMove did not restore:\n%s' % state)
+
+
+def checkLayout(name, games, moves, line, seed):
+    rng = random.Random(seed)
+    start = loadGameState(name)
+    checked = 0
+    for _ in range(games):
+        state = start
+        for move in range(moves):
+            if state.isWin() or state.isLose():
+                break
+            checked += checkState(state, rng, line)
+            agentIndex = move % state.getNumAgents()
+            state = state.generateSuccessor(agentIndex, rng.choice(state.getLegalActions(agentIndex)))
+    pacman.GameState.getAndResetExplored()
+    return checked
+
+
+def timeAgents(name, depth, repeat):
+    state = loadGameState(name)
+    rows = []
+    for agentName in AGENTS:
+        agentClass = getattr(multiAgents, agentName)
+        copying, copySeconds = bestTime(repeat, agentClass(depth=str(depth)).getAction, state)
+        pacman.GameState.getAndResetExplored()
+        inPlace, inPlaceSeconds = bestTime(repeat, agentClass(depth=str(depth), inPlace='True').getAction, state)
+        if copying != inPlace:
+            raise Exception('%s chose %s in place and %s otherwise' % (agentName, inPlace, copying))
+        rows.append([name, agentName, depth, copying, '%.3f' % copySeconds, '%.3f' % inPlaceSeconds,
+                     '%.2fx' % (copySeconds / inPlaceSeconds)])
+    return rows
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.makeUnmake [options] [layouts]')
+    parser.add_option('--games', dest='games', type='int', default=10,
+                      help='Random playouts checked per layout [Default: %default]')
+    parser.add_option('--moves', dest='moves', type='int', default=150,
+                      help='Most agent moves per playout [Default: %default]')
+    parser.add_option('--line', dest='line', type='int', default=4,
+                      help='Length of the random lines applied and undone under each move [Default: %default]')
+    parser.add_option('--depth', dest='depth', type='int', default=4,
+                      help='Search depth of the timed agents [Default: %default]')
+    parser.add_option('--repeat', dest='repeat', type='int', default=3,
+                      help='Timed decisions; the fastest is kept [Default: %default]')
+    options, names = parser.parse_args(sys.argv[1:])
+
+    for name in (names or CHECK_LAYOUTS):
+        checked = checkLayout(name, options.games, options.moves, options.line, seed=0)
+        print('%s: %d moves match generateSuccessor and undo exactly' % (name, checked))
+    rows = []
+    for name in (names or TIME_LAYOUTS):
+        rows += timeAgents(name, options.depth, options.repeat)
+    printTable(['layout', 'agent', 'depth', 'action', 'copying s', 'inPlace s', 'speedup'], rows)
@@ -0,0 +1,108 @@
+# benchmarks/zobrist.py
+# ---------------------
+# Hashing GameStates: the Zobrist hash kept up to date by the rules against
+# the hash GameStateData used before, which hashed every agent state, the
+# whole food Grid and the capsules on every call.
+#
+# States come from random playouts (fixed seed) on each layout, with every
+# agent moving in turn.  For each state the incremental hash is checked
+# against computeZobrist, a recomputation from scratch, and equal states
+# must hash equally.  Columns are microseconds per state:
+#
+#   legacy     the old GameStateData.__hash__
+#   zobrist    hash(state) now
+#   recompute  computeZobrist(), what the hash would cost without the rules
+#              updating it
+#   successor  generateSuccessor, which now also updates the hash and adds
+#              both states to GameState.explored
+#
+# > python -m benchmarks.zobrist
+# > python -m benchmarks.zobrist --games 5 originalClassic
+
+import random
+import sys
+from optparse import OptionParser
+
+import pacman
+from benchmarks import loadGameState, bestTime, printTable
+
+LAYOUTS = ['smallClassic', 'mediumClassic', 'capsuleClassic', 'originalClassic']
+
+
+def legacyHash(data):
+    """
+    The GameStateData.__hash__ replaced by the Zobrist hash.
+    """
+    return int((hash(tuple(data.agentStates)) + 13 * hash(data.food) + 113 * hash(tuple(data.capsules)) +
+                7 * hash(data.score)) % 1048575)
+
+
+def playouts(start, games, moves, seed):
+    """
+    Returns (state, agent, action) triples visited by random playouts.
+    """
+    rng = random.Random(seed)
+    visited = []
+    for _ in range(games):
+        state = start
+        for move in range(moves):
+            if state.isWin() or state.isLose():
+                break
+            agent = move % state.getNumAgents()
+            action = rng.choice(state.getLegalActions(agent))
+            visited.append((state, agent, action))
+            state = state.generateSuccessor(agent, action)
+    return visited
+
+
+def verify(visited):
+    """
+    Raises an Exception if an incremental hash differs from a recomputed one
+    or equal states hash differently.
+    """
+    byHash = {}
+    for state, agent, action in visited:
+        if state.data.zobristHash() != state.data.computeZobrist():
+            raise Exception('Stale Zobrist hash after %s:\n%s' % (action, state))
+        copy = state.deepCopy()
+        if copy != state or hash(copy) != hash(state):
+            raise Exception('Equal states hash differently:\n%s' % state)
+        byHash.setdefault(hash(state), set()).add(state)
+    return len(visited), sum(len(states) for states in byHash.values())
+
+
+def timeEach(function, visited):
+    for state, agent, action in visited:
+        function(state, agent, action)
+
+
+def benchmarkLayout(name, games, moves, repeat):
+    visited = playouts(loadGameState(name), games, moves, seed=0)
+    states, distinct = verify(visited)
+
+    operations = [
+        ('legacy', lambda state, agent, action: legacyHash(state.data)),
+        ('zobrist', lambda state, agent, action: hash(state)),
+        ('recompute', lambda state, agent, action: state.data.computeZobrist()),
+        ('successor', lambda state, agent, action: state.generateSuccessor(agent, action)),
+    ]
+    row = [name, states, distinct]
+    for operation, function in operations:
+        _, seconds = bestTime(repeat, timeEach, function, visited)
+        row.append('%.2f' % (1e6 * seconds / states))
+    pacman.GameState.getAndResetExplored()
+    return row
+
+
+if __name__ == '__main__':
+    parser = OptionParser('python -m benchmarks.zobrist [options] [layouts]')
+    parser.add_option('--games', dest='games', type='int', default=20,
+                      help='Random playouts per layout [Default: %default]')
+    parser.add_option('--moves', dest='moves', type='int', default=300,
+                      help='Most agent moves per playout [Default: %default]')
+    parser.add_option('--repeat', dest='repeat', type='int', default=3,
+                      help='Timings per operation; the fastest is kept [Default: %default]')
+    options, names = parser.parse_args(sys.argv[1:])
+
+    rows = [benchmarkLayout(name, options.games, options.moves, options.repeat) for name in (names or LAYOUTS)]
+    printTable(['layout', 'states', 'distinct', 'legacy us', 'zobrist us', 'recompute us', 'successor us'], rows)
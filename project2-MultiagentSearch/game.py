@@ -25,6 +25,9 @@ import time
 import os
 import traceback
 import sys
+import array
+import itertools
+import random
 
 #######################
 # Parts worth reading #
@@ -79,12 +82,25 @@ class Configuration:
 
     The convention for positions, like a graph, is that (0,0) is the lower left corner, x increases
     horizontally and y increases vertically.  Therefore, north is the direction of increasing y, or (0,1).
+
+    Configurations have __slots__ instead of a __dict__, and the positions of
+    the configurations generateSuccessor makes are interned, so every state
+    that has an agent on a cell shares one tuple for it.
     """
+    __slots__ = ('pos', 'direction')
 
     def __init__(self, pos, direction):
         self.pos = pos
         self.direction = direction
 
+    def __getstate__(self):
+        # a dictionary, like the instances had before __slots__
+        return {'pos': self.pos, 'direction': self.direction}
+
+    def __setstate__(self, state):
+        self.pos = state['pos']
+        self.direction = state['direction']
+
     def getPosition(self):
         return (self.pos)
 
@@ -121,13 +137,30 @@ class Configuration:
         direction = Actions.vectorToDirection(vector)
         if direction == Directions.STOP:
             direction = self.direction  # There is no stop direction
-        return Configuration((x + dx, y+dy), direction)
+        return Configuration(internPosition((x + dx, y+dy)), direction)
+
+
+# position -> the one tuple for it shared by the Configurations, see internPosition
+INTERNED_POSITIONS = {}
+
+
+def internPosition(position):
+    """
+    Returns the canonical tuple equal to position.  Equal positions such as
+    (1, 2) and (1.0, 2.0) share one tuple, whichever was interned first.
+    """
+    return INTERNED_POSITIONS.setdefault(position, position)
 
 
 class AgentState:
     """
     AgentStates hold the state of an agent (configuration, speed, scared, etc).
+
+    A successor GameState shares the AgentStates of the agents its move did
+    not change with its parent (see GameStateData.ownAgentState), so an
+    AgentState taken from a GameState must not be changed.
     """
+    __slots__ = ('start', 'configuration', 'isPacman', 'scaredTimer', 'numCarrying', 'numReturned')
 
     def __init__(self, startConfiguration, isPacman):
         self.start = startConfiguration
@@ -152,6 +185,14 @@ class AgentState:
     def __hash__(self):
         return hash(hash(self.configuration) + 13 * hash(self.scaredTimer))
 
+    def __getstate__(self):
+        # a dictionary, like the instances had before __slots__
+        return dict((name, getattr(self, name)) for name in AgentState.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def copy(self):
         state = AgentState(self.start, self.isPacman)
         state.configuration = self.configuration
@@ -219,7 +260,7 @@ class Grid:
         return hash(h)
 
     def copy(self):
-        g = Grid(self.width, self.height)
+        g = self._emptyCopy()
         g.data = [x[:] for x in self.data]
         return g
 
@@ -227,10 +268,32 @@ class Grid:
         return self.copy()
 
     def shallowCopy(self):
-        g = Grid(self.width, self.height)
+        g = self._emptyCopy()
         g.data = self.data
         return g
 
+    def withCell(self, x, y, value):
+        """
+        Returns a grid equal to this one except that (x, y) holds value.  Only
+        column x is copied; the new grid shares every other column with this
+        one, so neither may be written to in place afterwards.  Game states
+        use this for their food, which is never written to in place.
+        """
+        g = self._emptyCopy()
+        g.data = self.data[:]
+        g.data[x] = self.data[x][:]
+        g.data[x][y] = value
+        return g
+
+    def _emptyCopy(self):
+        """
+        Returns a grid of the same size with no data yet, without building
+        the cells Grid() would fill in.
+        """
+        g = Grid.__new__(Grid)
+        g.__dict__.update(self.__dict__)
+        return g
+
     def count(self, item=True):
         return sum([x.count(item) for x in self.data])
 
@@ -299,6 +362,268 @@ def reconstituteGrid(bitRep):
     width, height = bitRep[:2]
     return Grid(width, height, bitRepresentation=bitRep[2:])
 
+
+class CompactGrid:
+    """
+    A boolean Grid backed by one bytearray instead of a list of lists, with
+    the same grid[x][y] indexing, copy/shallowCopy/deepCopy, count, asList and
+    packBits interface.
+
+    Cell (x, y) is byte x * height + y, the column by column order Grid and
+    packBits use.  grid[x] returns a CompactGridColumn that reads and writes
+    that slice, so every cell access goes through a Python method; in return:
+
+      - count() is O(1): the number of True cells is kept up to date by
+        every write (and shared with shallow copies, which share the bytes)
+      - asList() and positionsArray() select the positions with
+        itertools.compress instead of testing every cell in Python
+      - copy() copies the bytearray in one call
+      - distanceSum and nearestDistance answer Manhattan distance queries
+        over all True cells from per row and per column counts and scans
+
+    Layouts build their walls and food as CompactGrids when created with
+    gridClass=CompactGrid (pacman.py --compactGrid).
+    """
+
+    def __init__(self, width, height, initialValue=False, bitRepresentation=None):
+        if initialValue not in [False, True]:
+            raise Exception('Grids can only contain booleans')
+        self.CELLS_PER_INT = 30
+
+        self.width = width
+        self.height = height
+        self.cells = bytearray([1 if initialValue else 0]) * (width * height)
+        # one element list so shallow copies, which share cells, share it too
+        self._count = [width * height if initialValue else 0]
+        self._columns = None
+        if bitRepresentation:
+            self._unpackBits(bitRepresentation)
+
+    def __getitem__(self, x):
+        columns = self._columns
+        if columns is None:
+            columns = self._columns = [CompactGridColumn(self, column) for column in range(self.width)]
+        return columns[x]
+
+    def __setitem__(self, x, column):
+        for y, value in enumerate(column):
+            self[x][y] = value
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_columns'] = None
+        return state
+
+    def __str__(self):
+        out = [bytes(self.cells[y::self.height]).translate(COMPACT_GRID_LETTERS).decode('ascii')
+               for y in range(self.height)]
+        out.reverse()
+        return '\n'.join(out)
+
+    def __eq__(self, other):
+        if other == None:
+            return False
+        if isinstance(other, CompactGrid):
+            return self.height == other.height and self.cells == other.cells
+        return self.data == other.data
+
+    def __hash__(self):
+        return hash(bytes(self.cells))
+
+    @property
+    def data(self):
+        """
+        The cells as a list of columns of booleans, like Grid.data.  It is a
+        copy: writing to it does not change the grid.
+        """
+        height = self.height
+        return [[value == 1 for value in self.cells[x * height:(x + 1) * height]] for x in range(self.width)]
+
+    def copy(self):
+        g = CompactGrid.__new__(CompactGrid)
+        g.__dict__.update(self.__dict__)
+        g.cells = bytearray(self.cells)
+        g._count = [self._count[0]]
+        g._columns = None
+        return g
+
+    def deepCopy(self):
+        return self.copy()
+
+    def shallowCopy(self):
+        g = CompactGrid.__new__(CompactGrid)
+        g.__dict__.update(self.__dict__)
+        return g
+
+    def withCell(self, x, y, value):
+        """
+        Returns a copy with (x, y) set to value, like Grid.withCell.  The cells
+        are one bytearray, so this copies all of them in one call.
+        """
+        g = self.copy()
+        g[x][y] = value
+        return g
+
+    def count(self, item=True):
+        if item is True or item == 1:
+            return self._count[0]
+        if item is False or item == 0:
+            return self.width * self.height - self._count[0]
+        return 0
+
+    def _selector(self, key):
+        """
+        Returns bytes that are 1 exactly where a cell equals key.
+        """
+        if key is True or key == 1:
+            return self.cells
+        if key is False or key == 0:
+            return self.cells.translate(COMPACT_GRID_NEGATION)
+        return bytes(len(self.cells))
+
+    def asList(self, key=True):
+        positions, xs, ys = compactGridIndex(self.width, self.height)
+        return list(itertools.compress(positions, self._selector(key)))
+
+    def positionsArray(self, key=True):
+        """
+        Returns two array('i')s with the x and the y coordinates of the cells
+        equal to key, in asList order.
+        """
+        positions, xs, ys = compactGridIndex(self.width, self.height)
+        selector = self._selector(key)
+        return array.array('i', itertools.compress(xs, selector)), array.array('i', itertools.compress(ys, selector))
+
+    def columnCounts(self):
+        "Returns the number of True cells in every column."
+        height = self.height
+        return [self.cells.count(1, x * height, (x + 1) * height) for x in range(self.width)]
+
+    def rowCounts(self):
+        "Returns the number of True cells in every row."
+        return [self.cells[y::self.height].count(1) for y in range(self.height)]
+
+    def distanceSum(self, position):
+        """
+        Returns the sum of the Manhattan distances from position to every True
+        cell, from the row and column counts in O(width + height) steps.
+        """
+        px, py = position
+        return (sum(count * abs(x - px) for x, count in enumerate(self.columnCounts()) if count) +
+                sum(count * abs(y - py) for y, count in enumerate(self.rowCounts()) if count))
+
+    def nearestDistance(self, position):
+        """
+        Returns the Manhattan distance from the (integer) position to the
+        closest True cell, or None if there is none.  Each row is searched with bytes.find, and
+        rows are visited outwards from position, so the scan stops as soon as
+        the rows left are farther away than the best cell found.
+        """
+        if self._count[0] == 0:
+            return None
+        px, py = position
+        best = None
+        for dy in range(self.height):
+            if best is not None and dy >= best:
+                break
+            for y in set([py - dy, py + dy]):
+                if not 0 <= y < self.height:
+                    continue
+                row = self.cells[y::self.height]
+                right = row.find(1, max(px, 0))
+                left = row.rfind(1, 0, min(px, self.width - 1) + 1)
+                for x in (left, right):
+                    if x != -1 and (best is None or abs(x - px) + dy < best):
+                        best = abs(x - px) + dy
+        return best
+
+    def packBits(self):
+        """
+        Returns the same (width, height, bitPackedInts...) representation as
+        Grid.packBits.
+        """
+        bits = [self.width, self.height]
+        size = self.CELLS_PER_INT
+        letters = self.cells.translate(COMPACT_GRID_DIGITS)
+        for start in range(0, len(letters), size):
+            chunk = letters[start:start + size]
+            if len(chunk) == size:
+                bits.append(int(chunk, 2))
+            else:
+                bits.append(int(chunk.ljust(size, b'0'), 2))
+        if len(letters) % size == 0:
+            bits.append(0)
+        return tuple(bits)
+
+    def _unpackBits(self, bits):
+        """
+        Fills in data from a bit-level representation
+        """
+        size = self.CELLS_PER_INT
+        digits = b''.join(format(packed, '0%db' % size).encode('ascii') for packed in bits)
+        cells = bytearray(digits[:len(self.cells)].translate(COMPACT_GRID_FROM_DIGITS))
+        self.cells[:len(cells)] = cells
+        self._count[0] = self.cells.count(1)
+
+
+class CompactGridColumn:
+    """
+    Column x of a CompactGrid: column[y] reads and writes cell (x, y).
+    """
+    __slots__ = ('grid', 'cells', 'offset', 'height')
+
+    def __init__(self, grid, x):
+        self.grid = grid
+        self.cells = grid.cells
+        self.offset = x * grid.height
+        self.height = grid.height
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError('grid index out of range')
+        return self.cells[self.offset + y] == 1
+
+    def __setitem__(self, y, value):
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError('grid index out of range')
+        index = self.offset + y
+        new = 1 if value else 0
+        old = self.cells[index]
+        if new != old:
+            self.cells[index] = new
+            self.grid._count[0] += new - old
+
+    def __len__(self):
+        return self.height
+
+    def __iter__(self):
+        return (value == 1 for value in self.cells[self.offset:self.offset + self.height])
+
+
+# byte translations used by CompactGrid
+COMPACT_GRID_LETTERS = bytes.maketrans(b'\x00\x01', b'FT')
+COMPACT_GRID_NEGATION = bytes.maketrans(b'\x00\x01', b'\x01\x00')
+COMPACT_GRID_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+COMPACT_GRID_FROM_DIGITS = bytes.maketrans(b'01', b'\x00\x01')
+
+# (width, height) -> (positions, xs, ys) in cell order, shared by every
+# CompactGrid of that size
+COMPACT_GRID_INDEX_CACHE = {}
+
+
+def compactGridIndex(width, height):
+    key = (width, height)
+    if key not in COMPACT_GRID_INDEX_CACHE:
+        positions = [(x, y) for x in range(width) for y in range(height)]
+        xs = array.array('i', [x for x, y in positions])
+        ys = array.array('i', [y for x, y in positions])
+        COMPACT_GRID_INDEX_CACHE[key] = (positions, xs, ys)
+    return COMPACT_GRID_INDEX_CACHE[key]
+
 ####################################
 # Parts you shouldn't have to read #
 ####################################
@@ -393,6 +718,25 @@ class Actions:
     getSuccessor = staticmethod(getSuccessor)
 
 
+# Zobrist keys: a random 64-bit key per feature of a game state, such as
+# ('food', x, y) or ('agent', index, position, direction), drawn the first
+# time the feature is seen.  The keys come from their own seeded generator
+# so drawing them does not disturb the game's random module.
+ZOBRIST_RANDOM = random.Random(0)
+ZOBRIST_KEYS = {}
+
+
+# _ownedAgents value of a state that owns all its AgentStates (every bit set)
+ALL_AGENTS = -1
+
+
+def zobristKey(feature):
+    key = ZOBRIST_KEYS.get(feature)
+    if key is None:
+        key = ZOBRIST_KEYS[feature] = ZOBRIST_RANDOM.getrandbits(64)
+    return key
+
+
 class GameStateData:
 
     def __init__(self, prevState=None):
@@ -400,12 +744,18 @@ class GameStateData:
         Generates a new data packet by copying information from its predecessor.
         """
         if prevState != None:
-            self.food = prevState.food.shallowCopy()
+            # shared: PacmanRules.consume replaces it instead of writing to it
+            self.food = prevState.food
             self.capsules = prevState.capsules[:]
-            self.agentStates = self.copyAgentStates(prevState.agentStates)
+            # shared until the rules change them, see ownAgentState
+            self.agentStates = prevState.agentStates[:]
+            self._ownedAgents = 0
             self.layout = prevState.layout
             self._eaten = prevState._eaten
             self.score = prevState.score
+            self._zobrist = prevState.zobristHash()
+        else:
+            self._zobrist = None
 
         self._foodEaten = None
         self._foodAdded = None
@@ -416,9 +766,17 @@ class GameStateData:
         self.scoreChange = 0
 
     def deepCopy(self):
+        """
+        Returns a copy with its own agent states, food grid and layout.  Game
+        uses it for the observations it hands to agents, so an agent that
+        writes to what it observes cannot change the game.  Successors
+        share these instead (see __init__).
+        """
         state = GameStateData(self)
         state.food = self.food.deepCopy()
         state.layout = self.layout.deepCopy()
+        state.agentStates = self.copyAgentStates(self.agentStates)
+        state._ownedAgents = ALL_AGENTS
         state._agentMoved = self._agentMoved
         state._foodEaten = self._foodEaten
         state._foodAdded = self._foodAdded
@@ -431,6 +789,18 @@ class GameStateData:
             copiedStates.append(agentState.copy())
         return copiedStates
 
+    def ownAgentState(self, index):
+        """
+        Returns agent index's AgentState for the rules to change.  A new
+        state shares every AgentState with its parent, so the first call for
+        an agent replaces it with a copy; _ownedAgents has bit index set once
+        the state has its own copy.
+        """
+        if not self._ownedAgents >> index & 1:
+            self.agentStates[index] = self.agentStates[index].copy()
+            self._ownedAgents |= 1 << index
+        return self.agentStates[index]
+
     def __eq__(self, other):
         """
         Allows two states to be compared.
@@ -450,15 +820,67 @@ class GameStateData:
 
     def __hash__(self):
         """
-        Allows states to be keys of dictionaries.
+        Allows states to be keys of dictionaries.  The Zobrist hash covers
+        everything __eq__ compares except the score, so this is O(1).
+        """
+        return self.zobristHash() ^ hash(self.score)
+
+    def __getstate__(self):
+        # the keys are drawn per process, so an unpickled state recomputes
+        state = self.__dict__.copy()
+        state['_zobrist'] = None
+        return state
+
+    def zobristHash(self):
+        """
+        Returns the XOR of the Zobrist keys of the food, capsules and agents,
+        computing it on first use.  The rules in pacman.py keep it up to
+        date in O(changes) as they edit a successor, through toggleZobrist
+        and toggleAgentZobrist.
+        """
+        if getattr(self, '_zobrist', None) is None:
+            self._zobrist = self.computeZobrist()
+        return self._zobrist
+
+    def computeZobrist(self):
+        """
+        Computes the Zobrist hash from scratch.
+        """
+        key = 0
+        for x, y in reconstituteGrid(self.food).asList():
+            key ^= zobristKey(('food', x, y))
+        for x, y in self.capsules:
+            key ^= zobristKey(('capsule', x, y))
+        for index in range(len(self.agentStates)):
+            key ^= self.agentZobrist(index)
+        return key
+
+    def agentZobrist(self, index):
+        """
+        Returns the Zobrist key of agent index's position, direction and
+        scared timer.
+        """
+        agentState = self.agentStates[index]
+        configuration = agentState.configuration
+        if configuration == None:
+            key = zobristKey(('agent', index, None, None))
+        else:
+            key = zobristKey(('agent', index, configuration.pos, configuration.direction))
+        return key ^ zobristKey(('scared', index, agentState.scaredTimer))
+
+    def toggleZobrist(self, feature):
+        """
+        Adds a feature such as ('food', x, y) or ('capsule', x, y) to the
+        hash, or removes it if it is there.
+        """
+        self._zobrist = self.zobristHash() ^ zobristKey(feature)
+
+    def toggleAgentZobrist(self, index):
+        """
+        Removes agent index's key from the hash, or adds it back; call it
+        before and after changing the agent's configuration or scared timer.
         """
-        for i, state in enumerate(self.agentStates):
-            try:
-                int(hash(state))
-            except TypeError as e:
-                print(e)
-                # hash(state)
-        return int((hash(tuple(self.agentStates)) + 13*hash(self.food) + 113 * hash(tuple(self.capsules)) + 7 * hash(self.score)) % 1048575)
+        self._zobrist = self.zobristHash() ^ self.agentZobrist(index)
 
     def __str__(self):
         width, height = self.layout.width, self.layout.height
@@ -536,6 +958,8 @@ class GameStateData:
             self.agentStates.append(AgentState(
                 Configuration(pos, Directions.STOP), isPacman))
         self._eaten = [False for a in self.agentStates]
+        self._ownedAgents = ALL_AGENTS
+        self._zobrist = None
 
 
 try:
@@ -26,11 +26,16 @@ class Layout:
     A Layout manages the static information about the game board.
     """
 
-    def __init__(self, layoutText):
+    def __init__(self, layoutText, gridClass=Grid):
+        """
+        gridClass: the class of the walls and food grids, game.Grid or
+                   game.CompactGrid
+        """
         self.width = len(layoutText[0])
         self.height = len(layoutText)
-        self.walls = Grid(self.width, self.height, False)
-        self.food = Grid(self.width, self.height, False)
+        self.gridClass = gridClass
+        self.walls = gridClass(self.width, self.height, False)
+        self.food = gridClass(self.width, self.height, False)
         self.capsules = []
         self.agentPositions = []
         self.numGhosts = 0
@@ -97,7 +102,18 @@ class Layout:
         return "\n".join(self.layoutText)
 
     def deepCopy(self):
-        return Layout(self.layoutText[:])
+        """
+        Returns a copy with its own grids and lists, made without processing
+        the layout text again.
+        """
+        lay = Layout.__new__(Layout)
+        lay.__dict__.update(self.__dict__)
+        lay.walls = self.walls.copy()
+        lay.food = self.food.copy()
+        lay.capsules = self.capsules[:]
+        lay.agentPositions = self.agentPositions[:]
+        lay.layoutText = self.layoutText[:]
+        return lay
 
     def processLayoutText(self, layoutText):
         """
@@ -160,10 +160,30 @@ class MultiAgentSearchAgent(Agent):
     is another abstract class.
     """
 
-    def __init__(self, evalFn='scoreEvaluationFunction', depth='2'):
+    def __init__(self, evalFn='scoreEvaluationFunction', depth='2', inPlace='False'):
         self.index = 0  # Pacman is always agent index 0
         self.evaluationFunction = util.lookup(evalFn, globals())
         self.depth = int(depth)
+        # search by changing the state with applyMove / undoMove (-a inPlace=True)
+        self.inPlace = str(inPlace).lower() == 'true'
+
+    def successorValue(self, gameState, agentIndex, action, valueFunction, *args):
+        """
+        Returns valueFunction(successor, *args), where successor is the state
+        after the agent agentIndex takes action in gameState.
+
+        With inPlace the successor is gameState itself, changed with applyMove
+        and changed back with undoMove once valueFunction returns, so
+        valueFunction must not keep the state.  These searches then build no
+        new states and do not add them to GameState.explored.
+        """
+        if not self.inPlace:
+            return valueFunction(gameState.generateSuccessor(agentIndex, action), *args)
+        token = gameState.applyMove(agentIndex, action)
+        try:
+            return valueFunction(gameState, *args)
+        finally:
+            gameState.undoMove(token)
 
 
 class MinimaxAgent(MultiAgentSearchAgent):
@@ -200,7 +220,7 @@ class MinimaxAgent(MultiAgentSearchAgent):
         maxAction = None  # one to be returned at the end.
 
         for action in legalActions:  # get the max value from all of it's successors.
-            actionValue = self.minFunction(gameState.generateSuccessor(0, action), 0, 1)
+            actionValue = self.successorValue(gameState, 0, action, self.minFunction, 0, 1)
             if actionValue > maxValue:  # take the max of all the children.
                 maxValue = actionValue
                 maxAction = action
@@ -221,14 +241,14 @@ class MinimaxAgent(MultiAgentSearchAgent):
         # Check the ghost action values and return the smallest number for the min branch
         if agentIndex < ghostCount:
             for action in ghostLegalAction:
-                tempValue = self.minFunction(gameState.generateSuccessor(agentIndex, action), depth, agentIndex + 1)
+                tempValue = self.successorValue(gameState, agentIndex, action, self.minFunction, depth, agentIndex + 1)
                 if tempValue < minValue:
                     minValue = tempValue
             return minValue
         # check the last ghosts action values against max function and return min value
         else:
             for action in ghostLegalAction:
-                tempValue = self.maxFunction(gameState.generateSuccessor(agentIndex, action), depth + 1)
+                tempValue = self.successorValue(gameState, agentIndex, action, self.maxFunction, depth + 1)
                 if tempValue < minValue:
                     minValue = tempValue
             return minValue
@@ -245,7 +265,7 @@ class MinimaxAgent(MultiAgentSearchAgent):
 
         # Find the max value for pacmans action and return it
         for action in pacmanLegalAction:
-            tempValue = self.minFunction(gameState.generateSuccessor(0, action), depth, 1)
+            tempValue = self.successorValue(gameState, 0, action, self.minFunction, depth, 1)
             if tempValue > maxValue:
                 maxValue = tempValue
 
@@ -268,7 +288,7 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
         legalActions = gameState.getLegalActions(0)
 
         for action in legalActions:
-            actionValue = self.minFunction(gameState.generateSuccessor(0, action), 1, 0, alpha, beta)
+            actionValue = self.successorValue(gameState, 0, action, self.minFunction, 1, 0, alpha, beta)
             if alpha < actionValue:
                 alpha = actionValue
                 bestMove = action
@@ -290,9 +310,9 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
         # check each ghost agent for the minimum value when the index is less than the ghost count.
         for action in ghostLegalAction:
             if agentIndex < ghostCount:
-                minValue = min(minValue, self.minFunction(gameState.generateSuccessor(agentIndex, action), agentIndex + 1, depth, alpha, beta))
+                minValue = min(minValue, self.successorValue(gameState, agentIndex, action, self.minFunction, agentIndex + 1, depth, alpha, beta))
             else:  # the last ghost HERE
-                minValue = min(minValue, self.maxFunction(gameState.generateSuccessor(agentIndex, action), depth + 1, alpha, beta))
+                minValue = min(minValue, self.successorValue(gameState, agentIndex, action, self.maxFunction, depth + 1, alpha, beta))
 
             # Check if min value is less alpha. If yes, prune the tree by returning minValue
             if minValue < alpha:
@@ -315,7 +335,7 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
 
         # check pacman's best option by evaluating the max option from the min node.
         for action in pacmacLegalAction:
-            maxValue = max(maxValue, self.minFunction(gameState.generateSuccessor(0, action), 1, depth, alpha, beta))
+            maxValue = max(maxValue, self.successorValue(gameState, 0, action, self.minFunction, 1, depth, alpha, beta))
 
             # Check if max value is greater than beta. If yes, prune the tree by returning maxValue
             if maxValue > beta:
@@ -346,7 +366,7 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
 
         # Determine the best action to take from the expectimax algorithm
         for action in pacmanLegalAction:
-            actionValue = self.minFunction(gameState.generateSuccessor(0, action), 1, 0)
+            actionValue = self.successorValue(gameState, 0, action, self.minFunction, 1, 0)
             if actionValue > maxValue:
                 maxValue = actionValue
                 bestMove = action
@@ -369,11 +389,11 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
         # with the best probability for success
         if agentIndex < ghostCount:
             for action in ghostLegalActions:
-                sumOfActions += self.minFunction(gameState.generateSuccessor(agentIndex, action), agentIndex + 1, depth)
+                sumOfActions += self.successorValue(gameState, agentIndex, action, self.minFunction, agentIndex + 1, depth)
             return sumOfActions / float(numGhostActions)
         else:
             for action in ghostLegalActions:
-                sumOfActions += self.Max_Value(gameState.generateSuccessor(agentIndex, action), depth + 1)
+                sumOfActions += self.successorValue(gameState, agentIndex, action, self.Max_Value, depth + 1)
             return sumOfActions / float(numGhostActions)
 
     # This helper method will compute the maximum value in Expectimax algorithm for pacman
@@ -388,7 +408,7 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
 
         # Find the max value for pacmans action and return it
         for action in pacmanLegalAction:
-            tempValue = self.minFunction(gameState.generateSuccessor(0, action), 1, depth)
+            tempValue = self.successorValue(gameState, 0, action, self.minFunction, 1, depth)
             if tempValue > maxValue:
                 maxValue = tempValue
 
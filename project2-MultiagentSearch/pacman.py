@@ -43,6 +43,9 @@ from game import GameStateData
 from game import Game
 from game import Directions
 from game import Actions
+from game import Configuration
+from game import internPosition
+from game import CompactGrid
 from util import nearestPoint
 from util import manhattanDistance
 import util
@@ -109,29 +112,72 @@ class GameState:
 
         # Copy current state
         state = GameState(self)
+        state._move(agentIndex, action)
+        GameState.explored.add(self)
+        GameState.explored.add(state)
+        return state
+
+    def applyMove(self, agentIndex, action):
+        """
+        Changes this state into the successor after the specified agent takes
+        the action, and returns a token for undoMove, which changes it back
+        exactly.  Moves must be undone in the reverse order they were applied.
+
+        This is generateSuccessor without building a new state, for searches
+        that walk down the tree and back up.  Unlike generateSuccessor it does
+        not add the states to GameState.explored.
+        """
+        if self.isWin() or self.isLose():
+            raise Exception('Can\'t generate a successor of a terminal state.')
 
+        # The token is the data's attributes as they are.  The rules replace
+        # the food grid, the AgentStates and the eaten flags rather than
+        # change them, so new lists of the capsules and the agents are all
+        # the move must not share.
+        data = self.data
+        data.zobristHash()  # before the token, so undoing keeps it
+        token = data.__dict__.copy()
+        data.capsules = data.capsules[:]
+        data.agentStates = data.agentStates[:]
+        data._ownedAgents = 0
+        data._foodEaten = None
+        data._foodAdded = None
+        data._capsuleEaten = None
+        data.scoreChange = 0
+        self._move(agentIndex, action)
+        return token
+
+    def undoMove(self, token):
+        """
+        Undoes the applyMove that returned token.
+        """
+        self.data.__dict__ = token
+
+    def _move(self, agentIndex, action):
+        """
+        Applies the rules for the specified agent's action to this state.
+        """
         # Let agent's logic deal with its action's effects on the board
         if agentIndex == 0:  # Pacman is moving
-            state.data._eaten = [False for i in range(state.getNumAgents())]
-            PacmanRules.applyAction(state, action)
+            self.data._eaten = [False for i in range(self.getNumAgents())]
+            PacmanRules.applyAction(self, action)
         else:                # A ghost is moving
-            GhostRules.applyAction(state, action, agentIndex)
+            GhostRules.applyAction(self, action, agentIndex)
 
         # Time passes
         if agentIndex == 0:
-            state.data.scoreChange += -TIME_PENALTY  # Penalty for waiting around
+            self.data.scoreChange += -TIME_PENALTY  # Penalty for waiting around
         else:
-            GhostRules.decrementTimer(state.data.agentStates[agentIndex])
+            self.data.toggleAgentZobrist(agentIndex)
+            GhostRules.decrementTimer(self.data.ownAgentState(agentIndex))
+            self.data.toggleAgentZobrist(agentIndex)
 
         # Resolve multi-agent effects
-        GhostRules.checkDeath(state, agentIndex)
+        GhostRules.checkDeath(self, agentIndex)
 
         # Book keeping
-        state.data._agentMoved = agentIndex
-        state.data.score += state.data.scoreChange
-        GameState.explored.add(self)
-        GameState.explored.add(state)
-        return state
+        self.data._agentMoved = agentIndex
+        self.data.score += self.data.scoreChange
 
     def getLegalPacmanActions(self):
         return self.getLegalActions(0)
@@ -359,12 +405,14 @@ class PacmanRules:
         if action not in legal:
             raise Exception("Illegal action " + str(action))
 
-        pacmanState = state.data.agentStates[0]
+        pacmanState = state.data.ownAgentState(0)
 
         # Update Configuration
         vector = Actions.directionToVector(action, PacmanRules.PACMAN_SPEED)
+        state.data.toggleAgentZobrist(0)
         pacmanState.configuration = pacmanState.configuration.generateSuccessor(
             vector)
+        state.data.toggleAgentZobrist(0)
 
         # Eat
         next = pacmanState.configuration.getPosition()
@@ -379,8 +427,8 @@ class PacmanRules:
         # Eat food
         if state.data.food[x][y]:
             state.data.scoreChange += 10
-            state.data.food = state.data.food.copy()
-            state.data.food[x][y] = False
+            state.data.food = state.data.food.withCell(x, y, False)
+            state.data.toggleZobrist(('food', x, y))
             state.data._foodEaten = position
             # TODO: cache numFood?
             numFood = state.getNumFood()
@@ -390,10 +438,13 @@ class PacmanRules:
         # Eat capsule
         if(position in state.getCapsules()):
             state.data.capsules.remove(position)
+            state.data.toggleZobrist(('capsule', x, y))
             state.data._capsuleEaten = position
             # Reset all ghosts' scared timers
             for index in range(1, len(state.data.agentStates)):
-                state.data.agentStates[index].scaredTimer = SCARED_TIME
+                state.data.toggleAgentZobrist(index)
+                state.data.ownAgentState(index).scaredTimer = SCARED_TIME
+                state.data.toggleAgentZobrist(index)
     consume = staticmethod(consume)
 
 
@@ -425,20 +476,22 @@ class GhostRules:
         if action not in legal:
             raise Exception("Illegal ghost action " + str(action))
 
-        ghostState = state.data.agentStates[ghostIndex]
+        ghostState = state.data.ownAgentState(ghostIndex)
         speed = GhostRules.GHOST_SPEED
         if ghostState.scaredTimer > 0:
             speed /= 2.0
         vector = Actions.directionToVector(action, speed)
+        state.data.toggleAgentZobrist(ghostIndex)
         ghostState.configuration = ghostState.configuration.generateSuccessor(
             vector)
+        state.data.toggleAgentZobrist(ghostIndex)
     applyAction = staticmethod(applyAction)
 
     def decrementTimer(ghostState):
         timer = ghostState.scaredTimer
         if timer == 1:
-            ghostState.configuration.pos = nearestPoint(
-                ghostState.configuration.pos)
+            ghostState.configuration = Configuration(internPosition(nearestPoint(
+                ghostState.configuration.pos)), ghostState.configuration.direction)
         ghostState.scaredTimer = max(0, timer - 1)
     decrementTimer = staticmethod(decrementTimer)
 
@@ -460,9 +513,13 @@ class GhostRules:
     def collide(state, ghostState, agentIndex):
         if ghostState.scaredTimer > 0:
             state.data.scoreChange += 200
+            state.data.toggleAgentZobrist(agentIndex)
+            ghostState = state.data.ownAgentState(agentIndex)
             GhostRules.placeGhost(state, ghostState)
             ghostState.scaredTimer = 0
-            # Added for first-person
+            state.data.toggleAgentZobrist(agentIndex)
+            # Added for first-person; the list may be the parent state's
+            state.data._eaten = state.data._eaten[:]
             state.data._eaten[agentIndex] = True
         else:
             if not state.data._win:
@@ -554,6 +611,8 @@ def readCommand(argv):
                       help='Turns on exception handling and timeouts during games', default=False)
     parser.add_option('--timeout', dest='timeout', type='int',
                       help=default('Maximum length of time an agent can spend computing in a single game'), default=30)
+    parser.add_option('--compactGrid', action='store_true', dest='compactGrid',
+                      help='Store walls and food in bytearray backed game.CompactGrids', default=False)
 
     options, otherjunk = parser.parse_args(argv)
     if len(otherjunk) != 0:
@@ -568,6 +627,8 @@ def readCommand(argv):
     args['layout'] = layout.getLayout(options.layout)
     if args['layout'] == None:
         raise Exception("The layout " + options.layout + " cannot be found")
+    if options.compactGrid:
+        args['layout'] = layout.Layout(args['layout'].layoutText, CompactGrid)
 
     # Choose a Pacman agent
     noKeyboard = options.gameToReplay == None and (
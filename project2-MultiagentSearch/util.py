@@ -233,6 +233,135 @@ class PriorityQueueWithFunction(PriorityQueue):
         PriorityQueue.push(self, item, self.priorityFunction(item))
 
 
+class IndexedPriorityQueue:
+    """
+    A priority queue keyed by item: every item is queued at most once.  A
+    dictionary maps each item to the position of its entry in the binary heap,
+    so membership checks are O(1) and changing the priority of a queued item
+    (decrease-key or increase-key) is O(log n).  Items must be hashable.
+
+    It offers the same push/pop/update/isEmpty methods as PriorityQueue, so
+    callers that never queue the same item twice can switch between the two.
+    Items with equal priority are popped in the order they were first pushed.
+    """
+    def __init__(self, items=None):
+        "items: optional iterable of (item, priority) pairs, see heapify"
+        self.heap = []      # entries are [priority, count, item] lists
+        self.index = {}     # item -> position of its entry in self.heap
+        self.count = 0
+        if items is not None:
+            self.heapify(items)
+
+    def heapify(self, items):
+        """
+        Replaces the contents of the queue with the (item, priority) pairs in
+        items, building the heap bottom-up in O(n).  If an item appears more
+        than once its lowest priority is kept.
+        """
+        self.heap = []
+        self.index = {}
+        for item, priority in items:
+            if item in self.index:
+                entry = self.heap[self.index[item]]
+                entry[0] = min(entry[0], priority)
+                continue
+            self.index[item] = len(self.heap)
+            self.heap.append([priority, self.count, item])
+            self.count += 1
+        for position in reversed(range(len(self.heap) // 2)):
+            self._siftDown(position)
+
+    def push(self, item, priority):
+        "Adds item with priority, or sets its priority if it is already queued"
+        if item in self.index:
+            self.setPriority(item, priority)
+            return
+        self.index[item] = len(self.heap)
+        self.heap.append([priority, self.count, item])
+        self.count += 1
+        self._siftUp(len(self.heap) - 1)
+
+    def pop(self):
+        "Removes and returns the item with the lowest priority"
+        entry = self.heap[0]
+        last = self.heap.pop()
+        del self.index[entry[2]]
+        if self.heap:
+            self.heap[0] = last
+            self.index[last[2]] = 0
+            self._siftDown(0)
+        return entry[2]
+
+    def peek(self):
+        "Returns the item with the lowest priority without removing it"
+        return self.heap[0][2]
+
+    def isEmpty(self):
+        return len(self.heap) == 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def getPriority(self, item):
+        "Returns the priority of a queued item"
+        return self.heap[self.index[item]][0]
+
+    def update(self, item, priority):
+        # Same contract as PriorityQueue.update:
+        # If item already in priority queue with higher priority, update its priority.
+        # If item already in priority queue with equal or lower priority, do nothing.
+        # If item not in priority queue, do the same thing as self.push.
+        if item in self.index:
+            if self.heap[self.index[item]][0] > priority:
+                self.setPriority(item, priority)
+        else:
+            self.push(item, priority)
+
+    def setPriority(self, item, priority):
+        "Changes the priority of a queued item, up or down, in O(log n)"
+        position = self.index[item]
+        entry = self.heap[position]
+        oldPriority = entry[0]
+        entry[0] = priority
+        if priority < oldPriority:
+            self._siftUp(position)
+        elif priority > oldPriority:
+            self._siftDown(position)
+
+    def _siftUp(self, position):
+        heap, index = self.heap, self.index
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if not entry < heap[parent]:
+                break
+            heap[position] = heap[parent]
+            index[heap[position][2]] = position
+            position = parent
+        heap[position] = entry
+        index[entry[2]] = position
+
+    def _siftDown(self, position):
+        heap, index = self.heap, self.index
+        size = len(heap)
+        entry = heap[position]
+        child = 2 * position + 1
+        while child < size:
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < entry:
+                break
+            heap[position] = heap[child]
+            index[heap[position][2]] = position
+            position = child
+            child = 2 * position + 1
+        heap[position] = entry
+        index[entry[2]] = position
+
+
 def manhattanDistance(xy1, xy2):
     "Returns the Manhattan distance between points xy1 and xy2"
     return abs(xy1[0] - xy2[0]) + abs(xy1[1] - xy2[1])
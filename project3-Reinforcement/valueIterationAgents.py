@@ -193,7 +193,7 @@ class PrioritizedSweepingValueIterationAgent(AsynchronousValueIterationAgent):
         ValueIterationAgent.__init__(self, mdp, discount, iterations)
 
     def runValueIteration(self):
-        priorityQ = util.PriorityQueue()
+        priorityQ = util.IndexedPriorityQueue()
         predecessors = {}
         states = self.mdp.getStates()
 